@@ -2,49 +2,63 @@
 Lead Qualification Agent powered by Amazon Nova
 """
 
-import os
 import json
 from typing import Dict, Any, Optional, List
-from openai import OpenAI
-from pathlib import Path
-from dotenv import load_dotenv
 
 from .prompts import SYSTEM_PROMPT, QUALIFICATION_PROMPT, SCORING_PROMPT, SUMMARY_PROMPT
-
-env_path = Path(__file__).parent.parent.parent / '.env'
-load_dotenv(env_path)
+from ..monitoring.metrics import NOVA_REQUEST_DURATION, NOVA_ERRORS, NOVA_TOKENS, track
+from ..monitoring.tracing import span
+from ..config import Config
 
 
 class LeadQualifierAgent:
     """AI Agent for qualifying leads using Amazon Nova"""
     
     def __init__(self):
-        api_key = os.getenv('NOVA_API_KEY')
+        api_key = Config.NOVA_API_KEY
         if not api_key:
             raise ValueError("NOVA_API_KEY not configured")
         
+        # Imported here: the openai package alone is most of the API's import time
+        from openai import OpenAI
+        
         self.client = OpenAI(
             api_key=api_key,
-            base_url="https://api.nova.amazon.com/v1"
+            base_url=Config.NOVA_BASE_URL
         )
-        self.model = "nova-2-lite-v1"
-        self.model_pro = "nova-2-pro-v1"
+        self.model = Config.NOVA_MODEL
+        self.model_pro = Config.NOVA_MODEL_PRO
     
-    def _call_nova(self, messages: List[Dict], use_pro: bool = False) -> str:
+    def _call_nova(self, messages: List[Dict], use_pro: bool = False, prompt_type: str = "generic") -> str:
         """Call Amazon Nova API"""
         model = self.model_pro if use_pro else self.model
         
-        response = self.client.chat.completions.create(
-            model=model,
-            messages=messages,
-            temperature=0.7,
-            max_tokens=1000
-        )
+        with span("nova", model=model, prompt_type=prompt_type) as nova_span, \
+                track(NOVA_REQUEST_DURATION, NOVA_ERRORS, model=model, prompt_type=prompt_type):
+            response = self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=0.7,
+                max_tokens=1000
+            )
+        
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            if nova_span is not None:
+                nova_span.set(prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens)
+            if usage.prompt_tokens is not None:
+                NOVA_TOKENS.observe(usage.prompt_tokens, model=model, prompt_type=prompt_type, kind="prompt")
+            if usage.completion_tokens is not None:
+                NOVA_TOKENS.observe(usage.completion_tokens, model=model, prompt_type=prompt_type, kind="completion")
         
         return response.choices[0].message.content
     
     def _parse_json_response(self, response: str) -> Dict:
         """Parse JSON from Nova response"""
+        with span("parse"):
+            return self._extract_json(response)
+    
+    def _extract_json(self, response: str) -> Dict:
         # Try to extract JSON from response
         try:
             # Find JSON in response
@@ -78,24 +92,25 @@ class LeadQualifierAgent:
         if missing_info is None:
             missing_info = ["budget", "authority", "need", "timeline"]
         
-        prompt = QUALIFICATION_PROMPT.format(
-            lead_name=lead_name or "there",
-            lead_email=lead_email,
-            lead_company=lead_company,
-            lead_source=lead_source,
-            questions_asked=", ".join(questions_asked) if questions_asked else "None yet",
-            current_score=current_score,
-            missing_info=", ".join(missing_info),
-            conversation_history=conversation_history or "No previous conversation",
-            custom_questions=custom_questions or "Use standard BANT questions"
-        )
+        with span("prompt", prompt_type="qualification"):
+            prompt = QUALIFICATION_PROMPT.format(
+                lead_name=lead_name or "there",
+                lead_email=lead_email,
+                lead_company=lead_company,
+                lead_source=lead_source,
+                questions_asked=", ".join(questions_asked) if questions_asked else "None yet",
+                current_score=current_score,
+                missing_info=", ".join(missing_info),
+                conversation_history=conversation_history or "No previous conversation",
+                custom_questions=custom_questions or "Use standard BANT questions"
+            )
         
         messages = [
             {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": prompt}
         ]
         
-        response = self._call_nova(messages)
+        response = self._call_nova(messages, prompt_type="qualification")
         return self._parse_json_response(response)
     
     def analyze_response(
@@ -111,22 +126,23 @@ class LeadQualifierAgent:
                 "budget": 0, "authority": 0, "need": 0, "timeline": 0
             }
         
-        prompt = SCORING_PROMPT.format(
-            response=response_text,
-            budget_score=current_scores.get("budget", 0),
-            authority_score=current_scores.get("authority", 0),
-            need_score=current_scores.get("need", 0),
-            timeline_score=current_scores.get("timeline", 0),
-            total_score=sum(current_scores.values()),
-            previous_analysis=previous_analysis or "No previous analysis"
-        )
+        with span("prompt", prompt_type="scoring"):
+            prompt = SCORING_PROMPT.format(
+                response=response_text,
+                budget_score=current_scores.get("budget", 0),
+                authority_score=current_scores.get("authority", 0),
+                need_score=current_scores.get("need", 0),
+                timeline_score=current_scores.get("timeline", 0),
+                total_score=sum(current_scores.values()),
+                previous_analysis=previous_analysis or "No previous analysis"
+            )
         
         messages = [
             {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": prompt}
         ]
         
-        response = self._call_nova(messages, use_pro=True)  # Use pro for analysis
+        response = self._call_nova(messages, use_pro=True, prompt_type="scoring")  # Use pro for analysis
         return self._parse_json_response(response)
     
     def generate_summary(
@@ -140,19 +156,20 @@ class LeadQualifierAgent:
     ) -> str:
         """Generate a summary for the sales team"""
         
-        prompt = SUMMARY_PROMPT.format(
-            lead_name=lead_name,
-            lead_email=lead_email,
-            lead_company=lead_company,
-            score=score,
-            qualification_data=json.dumps(qualification_data, indent=2),
-            conversation_summary=conversation_summary
-        )
+        with span("prompt", prompt_type="summary"):
+            prompt = SUMMARY_PROMPT.format(
+                lead_name=lead_name,
+                lead_email=lead_email,
+                lead_company=lead_company,
+                score=score,
+                qualification_data=json.dumps(qualification_data, indent=2),
+                conversation_summary=conversation_summary
+            )
         
         messages = [
             {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": prompt}
         ]
         
-        return self._call_nova(messages)
+        return self._call_nova(messages, prompt_type="summary")
 
@@ -3,27 +3,127 @@ FastAPI Application for LeadQual AI
 Main API endpoints for lead qualification
 """
 
-import os
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends
+import hmac
+import json
+import uuid
+import asyncio
+import httpx
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, EmailStr
+from fastapi.responses import PlainTextResponse, FileResponse, StreamingResponse, JSONResponse
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, Dict, List, Any
-from pathlib import Path
-from dotenv import load_dotenv
-
-# Load env from project root
-env_path = Path(__file__).parent.parent / '.env'
-load_dotenv(env_path)
 
 from .agent.qualifier import LeadQualifierAgent
 from .integrations.zoho_crm import ZohoCRM
 from .integrations.zoho_mail import ZohoMail
+from .integrations.zoho_token import ZohoTokenManager, FileTokenStore
+from .integrations.http import build_client
+from .integrations.zoho_api import ZohoAPIError, ZohoAuthError, ZohoClientError
+from .integrations.zoho_tenants import PROVIDER as ZOHO_PROVIDER, ZohoClientRegistry, ZohoNotConnected, ZohoTenant
+from .config import Config
 from .auth import clerk_auth, ClerkUser
+from .monitoring import (
+    MetricsMiddleware, TracingMiddleware, ProfilerMiddleware,
+    get_profile_store, profiling_enabled, render as render_metrics,
+    start_loop_monitor, stop_loop_monitor
+)
+from .batch import stream_batch
+from .crm_sync import CRMSyncEngine
+from .outbound import get_email_outbox, start_email_outbox, stop_email_outbox
+from .ratelimit import enforce_rate_limit, get_rate_limiter, rate_limited_user, wait_for_rate_limit
+from .inbound import (
+    InboundParseError, MessageTooLarge, parse_mime_stream, parse_zoho_notification, build_reply,
+    get_reply_queue, start_reply_queue, stop_reply_queue, score_reply,
+    TOKEN_HEADER, webhook_token, verify_webhook_token
+)
+from .idempotency import IdempotencyError, fingerprint, get_idempotency_store
+from .responses import FastJSONResponse, SelectiveGZipMiddleware
+from .warmup import WarmUp
+from .auth.clerk import warm_jwks
+
+PRODUCTION = Config.SERVING_MODE == "production"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build, warm and close this worker's shared clients and background services"""
+    global http_clients, warmup
+    # Watchdog for blocking calls inside async handlers
+    await start_loop_monitor()
+    # Long-lived keep-alive pools, one per Zoho service
+    http_clients = {
+        name: build_client(
+            name,
+            http2=Config.HTTP2_ENABLED,
+            max_connections=Config.HTTP_MAX_CONNECTIONS,
+            max_keepalive=Config.HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=Config.HTTP_KEEPALIVE_EXPIRY
+        )
+        for name in ("zoho_accounts", "zoho_crm", "zoho_mail")
+    }
+    warmup = WarmUp(
+        _warmup_steps() if Config.WARMUP_ENABLED else [],
+        concurrency=Config.WARMUP_CONCURRENCY,
+        step_timeout=Config.WARMUP_STEP_TIMEOUT
+    )
+    warming = asyncio.create_task(warmup.run())
+    # Hold traffic until warm; a slow dependency only delays /ready after the timeout
+    await asyncio.wait({warming}, timeout=Config.WARMUP_TIMEOUT_SECONDS)
+    # Throttled scoring of replies posted to the inbound webhook
+    start_reply_queue(
+        lambda reply: score_reply(reply, lambda: get_agent()),
+        workers=Config.INBOUND_WORKERS,
+        rate=Config.INBOUND_SCORES_PER_SECOND,
+        max_size=Config.INBOUND_QUEUE_MAX
+    )
+    # Per-user Zoho clients; refreshed tokens are written back in batches
+    registry = get_zoho_registry()
+    if registry is not None:
+        registry.start()
+    # Durable outbound email queue workers
+    if Config.DATABASE_URL and Config.EMAIL_WORKERS > 0:
+        start_email_outbox(
+            _mail_for_user,
+            workers=Config.EMAIL_WORKERS,
+            claim_batch=Config.EMAIL_CLAIM_BATCH,
+            poll_interval=Config.EMAIL_POLL_INTERVAL,
+            lease_seconds=Config.EMAIL_LEASE_SECONDS,
+            max_attempts=Config.EMAIL_MAX_ATTEMPTS,
+            retry_base=Config.EMAIL_RETRY_BASE_SECONDS,
+            retry_max=Config.EMAIL_RETRY_MAX_SECONDS,
+            sender_rate=Config.EMAIL_SENDER_RATE,
+            domain_rate=Config.EMAIL_DOMAIN_RATE
+        )
+    # Expired rows in Postgres-backed stores
+    purging = asyncio.create_task(_purge_expired_forever(Config.PURGE_INTERVAL_SECONDS)) if Config.DATABASE_URL else None
+    # Incremental CRM sync, when this deployment runs it in-process
+    syncing = None
+    if Config.CRM_SYNC_ENABLED and Config.DATABASE_URL:
+        engine = CRMSyncEngine(_crm_for_user, Config.CRM_SYNC_CONCURRENCY, Config.CRM_SYNC_BATCH_SIZE)
+        syncing = asyncio.create_task(engine.run_forever(Config.CRM_SYNC_INTERVAL))
+    try:
+        yield
+    finally:
+        for task in (warming, purging, syncing):
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        await stop_reply_queue()
+        await stop_email_outbox()
+        await _close_clients()
+        await stop_loop_monitor()
+
 
 app = FastAPI(
     title="LeadQual AI",
     description="AI-powered lead qualification with Amazon Nova",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse if PRODUCTION else JSONResponse
 )
 
 # CORS for frontend
@@ -35,9 +135,42 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize services
+# Per-route request metrics and tracing (Server-Timing header)
+app.add_middleware(TracingMiddleware)
+app.add_middleware(MetricsMiddleware)
+
+# Compress large list/export responses only; small JSON isn't worth the CPU
+if PRODUCTION:
+    app.add_middleware(
+        SelectiveGZipMiddleware,
+        prefixes=Config.GZIP_PATH_PREFIXES,
+        minimum_size=Config.GZIP_MIN_SIZE
+    )
+
+# Sampling profiler - not installed at all unless enabled
+if profiling_enabled():
+    app.add_middleware(ProfilerMiddleware)
+
+@app.exception_handler(ZohoNotConnected)
+async def zoho_not_connected_handler(request: Request, exc: ZohoNotConnected):
+    return JSONResponse({"detail": str(exc)}, status_code=409)
+
+
+@app.exception_handler(ZohoAPIError)
+async def zoho_error_handler(request: Request, exc: ZohoAPIError):
+    """Zoho outages and throttling become 503 + Retry-After; bad requests 502"""
+    if isinstance(exc, (ZohoClientError, ZohoAuthError)):
+        return JSONResponse({"detail": str(exc)}, status_code=502)
+    headers = {"Retry-After": str(int(exc.retry_after or 30) + 1)}
+    return JSONResponse({"detail": str(exc)}, status_code=503, headers=headers)
+
+
+# Shared clients, built by the lifespan warm-up (or lazily on first use)
 agent = None
 zoho = None
+http_clients: Dict[str, httpx.AsyncClient] = {}
+warmup: Optional[WarmUp] = None
+_db_pool_open = False
 
 
 def get_agent() -> LeadQualifierAgent:
@@ -50,19 +183,193 @@ def get_agent() -> LeadQualifierAgent:
 def get_zoho() -> ZohoCRM:
     global zoho
     if zoho is None:
-        zoho = ZohoCRM()
+        zoho = ZohoCRM(http=http_clients.get("zoho_crm"), tokens=get_zoho_tokens())
     return zoho
 
 
 mail_client = None
+zoho_tokens: Optional[ZohoTokenManager] = None
+
+
+def get_zoho_tokens() -> ZohoTokenManager:
+    """Access token shared by the CRM and Mail clients"""
+    global zoho_tokens
+    if zoho_tokens is None:
+        zoho_tokens = ZohoTokenManager.from_env(
+            http=http_clients.get("zoho_accounts"),
+            store=FileTokenStore(Config.ZOHO_TOKEN_FILE),
+            refresh_margin=Config.ZOHO_TOKEN_REFRESH_MARGIN
+        )
+    return zoho_tokens
 
 def get_mail() -> ZohoMail:
     global mail_client
     if mail_client is None:
-        mail_client = ZohoMail()
+        mail_client = ZohoMail(http=http_clients.get("zoho_mail"), tokens=get_zoho_tokens())
     return mail_client
 
 
+zoho_registry: Optional[ZohoClientRegistry] = None
+
+
+def get_zoho_registry() -> Optional[ZohoClientRegistry]:
+    """Per-user Zoho clients from the integrations table (needs the database)"""
+    global zoho_registry
+    if zoho_registry is None and Config.DATABASE_URL:
+        fallback = None
+        if Config.ZOHO_REFRESH_TOKEN:
+            # Users without their own grant keep using the account in .env
+            fallback = ZohoTenant(get_zoho_tokens(), get_zoho(), get_mail(), loaded_at=0.0)
+        zoho_registry = ZohoClientRegistry(
+            http_clients,
+            max_tenants=Config.ZOHO_TENANT_CACHE_SIZE,
+            ttl=Config.ZOHO_TENANT_TTL,
+            flush_interval=Config.ZOHO_TOKEN_FLUSH_SECONDS,
+            fallback=fallback
+        )
+    return zoho_registry
+
+
+async def _crm_for_user(user_id: Optional[str]) -> ZohoCRM:
+    """CRM client for a users.id"""
+    registry = get_zoho_registry()
+    return await registry.crm(user_id) if registry else get_zoho()
+
+
+async def _mail_for_user(user_id: Optional[str]) -> ZohoMail:
+    """Mail client for a users.id"""
+    registry = get_zoho_registry()
+    return await registry.mail(user_id) if registry else get_mail()
+
+
+async def _users_id(clerk_user_id: str) -> Optional[str]:
+    """users.id for a Clerk user id, through the registry's cache when there is one"""
+    registry = get_zoho_registry()
+    if registry is not None:
+        return await registry.clerk_user_id(clerk_user_id)
+    from .database.models import UserRepository
+    return await run_in_threadpool(UserRepository.get_id, clerk_user_id)
+
+
+async def _tenant_for(user: ClerkUser) -> ZohoTenant:
+    """Zoho clients of the authenticated user"""
+    registry = get_zoho_registry()
+    if registry is None:
+        return ZohoTenant(get_zoho_tokens(), get_zoho(), get_mail(), loaded_at=0.0)
+    return await registry.tenant(await registry.clerk_user_id(user.user_id))
+
+
+async def _warm_agent():
+    if not Config.NOVA_API_KEY:
+        return False
+    await run_in_threadpool(get_agent)
+
+
+async def _warm_zoho():
+    if not Config.ZOHO_REFRESH_TOKEN:
+        return False
+    tokens = get_zoho_tokens()
+    await tokens.get_token()
+    # Keep it fresh from here on so requests never wait on a refresh
+    tokens.start()
+
+
+async def _warm_mail():
+    if not Config.ZOHO_REFRESH_TOKEN:
+        return False
+    await get_mail().get_account_id()
+
+
+async def _warm_database():
+    global _db_pool_open
+    if not Config.DATABASE_URL:
+        return False
+    from .database.connection import init_pool
+    await run_in_threadpool(init_pool, Config.DB_POOL_MIN, Config.DB_POOL_MAX)
+    _db_pool_open = True
+
+
+def _warmup_steps():
+    return [
+        ("nova_agent", _warm_agent),
+        ("zoho_crm_token", _warm_zoho),
+        ("zoho_mail_account", _warm_mail),
+        ("clerk_jwks", warm_jwks),
+        ("database", _warm_database)
+    ]
+
+
+async def _close_clients():
+    """Close pooled HTTP and DB connections held by this worker"""
+    global agent, zoho, mail_client, zoho_tokens, zoho_registry, http_clients, _db_pool_open
+    if zoho_tokens is not None:
+        await zoho_tokens.stop()
+    if zoho_registry is not None:
+        try:
+            await zoho_registry.close()
+        except Exception as e:
+            print(f"⚠️ Writing Zoho tokens back failed: {e}")
+    for client in http_clients.values():
+        await client.aclose()
+    close = getattr(getattr(agent, "client", None), "close", None)
+    if close is not None:
+        await run_in_threadpool(close)
+    if _db_pool_open:
+        from .database.connection import close_pool
+        await run_in_threadpool(close_pool)
+        _db_pool_open = False
+    agent = zoho = mail_client = zoho_tokens = zoho_registry = None
+    http_clients = {}
+
+
+async def _purge_expired_forever(interval: float):
+    """Delete expired idempotency keys and rate-limit windows on a timer"""
+    while True:
+        await asyncio.sleep(interval)
+        for purge in (get_idempotency_store().purge, get_rate_limiter().purge):
+            try:
+                await purge()
+            except Exception as e:
+                print(f"⚠️ Purging expired rows failed: {e}")
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Dependency for admin-only endpoints"""
+    expected = Config.PROFILER_ADMIN_TOKEN
+    if not expected or not x_admin_token or not hmac.compare_digest(x_admin_token, expected):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+async def idempotent(
+    user: ClerkUser,
+    key: Optional[str],
+    route: str,
+    payload: Any,
+    call,
+    status_code: int = 200
+):
+    """Run call() once per Idempotency-Key, replaying the stored response (and status) for retries"""
+    if not key:
+        return await call()
+    if len(key) > 255:
+        raise HTTPException(status_code=400, detail="Idempotency-Key must be at most 255 characters")
+
+    async def call_with_status():
+        return {"status_code": status_code, "body": await call()}
+
+    try:
+        stored, replayed = await get_idempotency_store().run(
+            user.user_id, key, fingerprint(route, payload), call_with_status
+        )
+    except IdempotencyError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    if "body" not in stored:
+        stored = {"status_code": 200, "body": stored}  # stored before status codes were kept
+    if replayed:
+        return JSONResponse(stored["body"], status_code=stored["status_code"], headers={"Idempotent-Replayed": "true"})
+    return stored["body"]
+
+
 # Request/Response Models
 class LeadCreate(BaseModel):
     email: EmailStr
@@ -87,6 +394,14 @@ class GenerateEmailRequest(BaseModel):
     custom_questions: Optional[str] = ""
 
 
+class BatchGenerateEmailRequest(BaseModel):
+    leads: List[GenerateEmailRequest] = Field(..., min_length=1, max_length=Config.BATCH_MAX_ITEMS)
+
+
+class BatchAnalyzeResponseRequest(BaseModel):
+    responses: List[LeadResponse] = Field(..., min_length=1, max_length=Config.BATCH_MAX_ITEMS)
+
+
 class SendEmailRequest(BaseModel):
     to_address: EmailStr
     subject: str
@@ -107,22 +422,45 @@ async def health():
     return {"status": "healthy", "services": {"agent": agent is not None, "zoho": zoho is not None}}
 
 
+@app.get("/ready")
+async def ready():
+    """Readiness probe - 503 until this worker's warm-up has finished"""
+    status = warmup.status() if warmup is not None else {"ready": False, "steps": {}}
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/admin/profiles", dependencies=[Depends(require_admin)])
+async def list_profiles():
+    """List stored request profiles, newest first"""
+    return {"profiles": get_profile_store().list()}
+
+
+@app.get("/admin/profiles/{filename}", dependencies=[Depends(require_admin)])
+async def download_profile(filename: str):
+    """Download a gzipped folded-stack profile or flame graph"""
+    path = get_profile_store().path(filename)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if filename.endswith(".svg.gz"):
+        # Let browsers render the flame graph directly
+        return FileResponse(path, media_type="image/svg+xml", headers={"Content-Encoding": "gzip"})
+    return FileResponse(path, media_type="application/gzip", filename=filename)
+
+
 @app.post("/api/leads/generate-email")
 async def generate_qualification_email(
     request: GenerateEmailRequest,
-    user: ClerkUser = Depends(clerk_auth)
+    user: ClerkUser = Depends(rate_limited_user)
 ):
     """Generate a qualification email for a lead (requires authentication)"""
     try:
-        qualifier = get_agent()
-        result = qualifier.generate_qualification_email(
-            lead_name=request.lead_name,
-            lead_email=request.lead_email,
-            lead_company=request.company or "Unknown",
-            conversation_history=request.conversation_history,
-            current_score=request.current_score,
-            custom_questions=request.custom_questions
-        )
+        result = await run_in_threadpool(_generate_email, get_agent(), request)
         return {"success": True, "data": result, "user_id": user.user_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -131,44 +469,164 @@ async def generate_qualification_email(
 @app.post("/api/leads/analyze-response")
 async def analyze_lead_response(
     request: LeadResponse,
-    user: ClerkUser = Depends(clerk_auth)
+    user: ClerkUser = Depends(rate_limited_user)
 ):
     """Analyze a lead's email response (requires authentication)"""
     try:
         qualifier = get_agent()
-        result = qualifier.analyze_response(response_text=request.response_text)
+        result = await run_in_threadpool(qualifier.analyze_response, response_text=request.response_text)
         return {"success": True, "data": result, "user_id": user.user_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/api/leads/push-to-crm")
-async def push_lead_to_crm(
-    lead_data: Dict[str, Any],
+def _generate_email(qualifier: LeadQualifierAgent, request: GenerateEmailRequest) -> Dict[str, Any]:
+    return qualifier.generate_qualification_email(
+        lead_name=request.lead_name,
+        lead_email=request.lead_email,
+        lead_company=request.company or "Unknown",
+        conversation_history=request.conversation_history,
+        current_score=request.current_score,
+        custom_questions=request.custom_questions
+    )
+
+
+def _batch_pacer(user: ClerkUser):
+    """Charge each batch item after the first (paid up front) to the user's rate limit"""
+    async def admit(index: int):
+        if index > 0:
+            await wait_for_rate_limit(user)
+    return admit
+
+
+@app.post("/api/leads/batch/generate-email")
+async def batch_generate_qualification_emails(
+    request: BatchGenerateEmailRequest,
     user: ClerkUser = Depends(clerk_auth)
 ):
-    """Push a qualified lead to Zoho CRM (requires authentication)"""
+    """
+    Generate qualification emails for many leads, streamed as NDJSON (requires authentication).
+
+    Each lead is one Nova call and costs one request against the caller's rate
+    limit. The first lead is charged up front (429 when already out of budget);
+    the rest are paced to the tier's per-minute limit as the batch streams.
+    """
+    headers = await enforce_rate_limit(user)
     try:
-        crm = get_zoho()
-        result = await crm.create_lead(lead_data)
-        return {"success": True, "data": result, "user_id": user.user_id}
+        qualifier = get_agent()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    lines = stream_batch(
+        request.leads,
+        lambda lead: _generate_email(qualifier, lead),
+        Config.BATCH_CONCURRENCY,
+        describe=lambda lead: {"lead_email": lead.lead_email},
+        admit=_batch_pacer(user)
+    )
+    return StreamingResponse(lines, media_type="application/x-ndjson", headers=headers)
+
+
+@app.post("/api/leads/batch/analyze-response")
+async def batch_analyze_lead_responses(
+    request: BatchAnalyzeResponseRequest,
+    user: ClerkUser = Depends(clerk_auth)
+):
+    """
+    Analyze many lead responses, streamed as NDJSON (requires authentication).
+
+    Charged per response like batch generate-email: the first up front, the
+    rest paced to the caller's per-minute limit.
+    """
+    headers = await enforce_rate_limit(user)
+    try:
+        qualifier = get_agent()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    lines = stream_batch(
+        request.responses,
+        lambda item: qualifier.analyze_response(response_text=item.response_text),
+        Config.BATCH_CONCURRENCY,
+        describe=lambda item: {"lead_email": item.lead_email},
+        admit=_batch_pacer(user)
+    )
+    return StreamingResponse(lines, media_type="application/x-ndjson", headers=headers)
+
+
+@app.post("/api/leads/push-to-crm")
+async def push_lead_to_crm(
+    lead_data: Dict[str, Any],
+    user: ClerkUser = Depends(rate_limited_user),
+    idempotency_key: Optional[str] = Header(None)
+):
+    """Push a qualified lead to Zoho CRM (requires authentication)"""
+    async def push():
+        try:
+            crm = (await _tenant_for(user)).crm
+            result = await crm.create_lead(lead_data)
+            return {"success": True, "data": result, "user_id": user.user_id}
+        except (ZohoAPIError, ZohoNotConnected):
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    return await idempotent(user, idempotency_key, "/api/leads/push-to-crm", lead_data, push)
 
 
 @app.get("/api/zoho/test")
-async def test_zoho_connection(user: ClerkUser = Depends(clerk_auth)):
+async def test_zoho_connection(user: ClerkUser = Depends(rate_limited_user)):
     """Test Zoho CRM connection (requires authentication)"""
     try:
-        crm = get_zoho()
+        crm = (await _tenant_for(user)).crm
         connected = await crm.test_connection()
         return {"success": connected, "user_id": user.user_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+class ZohoConnectRequest(BaseModel):
+    code: str
+
+
+@app.post("/api/integrations/zoho")
+async def connect_zoho(request: ZohoConnectRequest, user: ClerkUser = Depends(rate_limited_user)):
+    """Connect the user's own Zoho account from an OAuth authorization code (requires authentication)"""
+    registry = get_zoho_registry()
+    if registry is None:
+        raise HTTPException(status_code=503, detail="Per-user Zoho accounts need the database")
+    from .integrations.zoho_oauth import ZohoOAuth
+    from .database.models import IntegrationRepository
+    try:
+        tokens = await run_in_threadpool(ZohoOAuth().exchange_code_for_tokens, request.code)
+    except (ValueError, httpx.HTTPError) as e:
+        raise HTTPException(status_code=400, detail=f"Zoho authorization failed: {e}")
+    if "refresh_token" not in tokens:
+        raise HTTPException(status_code=400, detail=f"Zoho returned no refresh token: {tokens.get('error', tokens)}")
+    
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=float(tokens.get("expires_in", 3600)))
+    user_id = await run_in_threadpool(
+        IntegrationRepository.connect,
+        user.user_id, ZOHO_PROVIDER, tokens["refresh_token"], tokens.get("access_token"), expires_at
+    )
+    if user_id is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    registry.forget(user_id)
+    return {"success": True, "provider": ZOHO_PROVIDER, "user_id": user.user_id}
+
+
+@app.get("/api/inbound/webhook")
+async def get_inbound_webhook(user: ClerkUser = Depends(rate_limited_user)):
+    """Webhook path and X-Webhook-Token for forwarding this user's lead replies (requires authentication)"""
+    if not Config.INBOUND_WEBHOOK_SECRET:
+        raise HTTPException(status_code=404, detail="Inbound webhook is not configured")
+    return {
+        "url": f"/webhooks/inbound-email/{user.user_id}",
+        "header": TOKEN_HEADER,
+        "token": webhook_token(user.user_id)
+    }
+
+
 @app.get("/api/me")
-async def get_current_user_info(user: ClerkUser = Depends(clerk_auth)):
+async def get_current_user_info(user: ClerkUser = Depends(rate_limited_user)):
     """Get current authenticated user info"""
     return {
         "user_id": user.user_id,
@@ -179,39 +637,125 @@ async def get_current_user_info(user: ClerkUser = Depends(clerk_auth)):
     }
 
 
-@app.post("/api/email/send")
+@app.post("/api/email/send", status_code=202)
 async def send_qualification_email(
     request: SendEmailRequest,
-    user: ClerkUser = Depends(clerk_auth)
+    user: ClerkUser = Depends(rate_limited_user),
+    idempotency_key: Optional[str] = Header(None)
+):
+    """Queue a qualification email for Zoho Mail (requires authentication)"""
+    async def send():
+        if Config.DATABASE_URL:
+            from .database.models import EmailLogRepository
+            # Never queue without an owner: it would go out through the fallback account
+            owner_id = await _users_id(user.user_id)
+            if owner_id is None:
+                raise HTTPException(status_code=404, detail="User not found")
+            row = await run_in_threadpool(
+                EmailLogRepository.enqueue,
+                owner_id,
+                request.to_address,
+                request.subject,
+                request.html_content,
+                request.from_address,
+                request.cc,
+                request.bcc
+            )
+            outbox = get_email_outbox()
+            if outbox is not None:
+                outbox.notify()
+            return {"success": True, "email_id": str(row["id"]), "status": row["status"], "user_id": user.user_id}
+        
+        # No database to queue in: send inline
+        try:
+            mail = (await _tenant_for(user)).mail
+            result = await mail.send_email(
+                to_address=request.to_address,
+                subject=request.subject,
+                html_content=request.html_content,
+                from_address=request.from_address,
+                cc=request.cc,
+                bcc=request.bcc
+            )
+            return {"success": True, "data": result, "user_id": user.user_id}
+        except (ZohoAPIError, ZohoNotConnected):
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    return await idempotent(user, idempotency_key, "/api/email/send", request.model_dump(), send, status_code=202)
+
+
+@app.post("/webhooks/inbound-email/{user_id}", status_code=202)
+async def inbound_email(
+    user_id: str,
+    request: Request,
+    x_webhook_token: Optional[str] = Header(None)
 ):
-    """Send a qualification email via Zoho Mail (requires authentication)"""
+    """Accept a lead reply (raw MIME or Zoho Mail notification) and queue it for scoring"""
+    # Header only: query-string secrets end up in access logs
+    if not verify_webhook_token(user_id, x_webhook_token):
+        raise HTTPException(status_code=403, detail="Invalid webhook token")
+    
+    # The path carries the Clerk id; leads are keyed by users.id
+    owner_id = user_id
+    if Config.DATABASE_URL:
+        owner_id = await _users_id(user_id)
+        if owner_id is None:
+            raise HTTPException(status_code=404, detail="User not found")
+    
+    queue = get_reply_queue()
+    if queue is None:
+        raise HTTPException(status_code=503, detail="Inbound queue not running")
+    
     try:
-        mail = get_mail()
-        result = await mail.send_email(
-            to_address=request.to_address,
-            subject=request.subject,
-            html_content=request.html_content,
-            from_address=request.from_address,
-            cc=request.cc,
-            bcc=request.bcc
-        )
-        return {"success": True, "data": result, "user_id": user.user_id}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        if request.headers.get("content-type", "").startswith("application/json"):
+            body = await request.body()
+            if len(body) > Config.INBOUND_MAX_BYTES:
+                raise MessageTooLarge("Notification is too large")
+            fields = parse_zoho_notification(json.loads(body))
+        else:
+            fields = await parse_mime_stream(request.stream(), Config.INBOUND_MAX_BYTES)
+        reply = build_reply(owner_id, fields)
+    except MessageTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except (InboundParseError, ValueError, AttributeError) as e:
+        raise HTTPException(status_code=400, detail=f"Unreadable message: {e}")
+    
+    outcome = queue.submit(reply)
+    if outcome == "rejected":
+        raise HTTPException(status_code=503, detail="Inbound queue is full", headers={"Retry-After": "30"})
+    return {"status": outcome, "message_id": reply.message_id}
 
 
 @app.get("/api/email/test")
-async def test_mail_connection(user: ClerkUser = Depends(clerk_auth)):
+async def test_mail_connection(user: ClerkUser = Depends(rate_limited_user)):
     """Test Zoho Mail connection (requires authentication)"""
     try:
-        mail = get_mail()
+        mail = (await _tenant_for(user)).mail
         connected = await mail.test_connection()
         return {"success": connected, "user_id": user.user_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/email/{email_id}")
+async def get_email_status(email_id: str, user: ClerkUser = Depends(rate_limited_user)):
+    """Delivery status of a queued email (requires authentication)"""
+    if not Config.DATABASE_URL:
+        raise HTTPException(status_code=404, detail="Email not found")
+    from .database.models import EmailLogRepository
+    try:
+        uuid.UUID(email_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Email not found")
+    row = await run_in_threadpool(EmailLogRepository.get, email_id, user.user_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Email not found")
+    return {**row, "id": str(row["id"])}
+
+
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    from .serve import serve
+    serve(Config.SERVING_MODE)
 
@@ -0,0 +1,28 @@
+"""
+ASGI entry point used by leadqual.serve
+
+Records the connecting peer before X-Forwarded-For is applied, so checks that
+must be about the proxy itself (trusted traceparent) never see a spoofable
+forwarded address. uvicorn's own proxy_headers is turned off in favour of this.
+"""
+
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+
+from .api import app as api_app
+from .config import Config
+from .monitoring.middleware import PEER_KEY
+
+
+class PeerMiddleware:
+    """Keep the socket peer in the scope under PEER_KEY"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket"):
+            scope[PEER_KEY] = scope.get("client")
+        await self.app(scope, receive, send)
+
+
+app = PeerMiddleware(ProxyHeadersMiddleware(api_app, trusted_hosts=Config.FORWARDED_ALLOW_IPS))
@@ -3,19 +3,24 @@ Clerk Authentication for FastAPI
 Validates JWT tokens from Clerk frontend SDK
 """
 
-import os
-from typing import Optional
-from pathlib import Path
+import time
+import base64
+import asyncio
+import hashlib
+import importlib.util
+from collections import OrderedDict
+from typing import Optional, Tuple
 from functools import lru_cache
 
+import httpx
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
-from dotenv import load_dotenv
 
-# Load environment
-env_path = Path(__file__).parent.parent.parent / '.env'
-load_dotenv(env_path)
+from ..config import Config
+from ..monitoring.metrics import AUTH_DURATION
+from ..monitoring.tracing import span
+from .jwks import get_jwks_cache
 
 
 class ClerkUser(BaseModel):
@@ -30,16 +35,72 @@ class ClerkUser(BaseModel):
 # Bearer token security scheme
 bearer_scheme = HTTPBearer(auto_error=False)
 
+# Metrics label for which verification path is in use
+_AUTH_METHOD = "sdk" if importlib.util.find_spec("clerk_backend_api") else "manual"
+
 
 @lru_cache()
 def get_clerk_secret_key() -> str:
     """Get Clerk secret key from environment"""
-    secret = os.getenv('CLERK_SECRET_KEY')
+    secret = Config.CLERK_SECRET_KEY
     if not secret:
         raise ValueError("CLERK_SECRET_KEY not configured in environment")
     return secret
 
 
+@lru_cache()
+def _clerk_client():
+    """One Clerk SDK client per process; it keeps its own HTTP pool and JWKS cache"""
+    from clerk_backend_api import Clerk
+    
+    return Clerk(bearer_auth=get_clerk_secret_key())
+
+
+@lru_cache()
+def _sdk_options():
+    from clerk_backend_api.security.types import AuthenticateRequestOptions
+    
+    return AuthenticateRequestOptions(authorized_parties=Config.CLERK_AUTHORIZED_PARTIES or None)
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of verified users keyed by token hash. An entry lives until
+    the token's own exp, so a hit is exactly as valid as re-verifying.
+    """
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, Tuple[ClerkUser, float]]" = OrderedDict()
+    
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()  # raw tokens are not kept in memory
+    
+    def get(self, token: str) -> Optional[ClerkUser]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+    
+    def put(self, token: str, user: ClerkUser, expires_at: Optional[float]):
+        if self.max_entries <= 0 or not expires_at or expires_at <= time.time():
+            return
+        key = self._key(token)
+        self._entries[key] = (user, float(expires_at))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+_token_cache = VerifiedTokenCache(Config.CLERK_TOKEN_CACHE_SIZE)
+
+
 def _extract_user_from_payload(payload: dict) -> ClerkUser:
     """Extract user info from Clerk JWT payload"""
     return ClerkUser(
@@ -71,35 +132,39 @@ async def clerk_auth(
         )
     
     token = credentials.credentials
+    start = time.perf_counter()
+    
+    user = _token_cache.get(token)
+    if user is not None:
+        AUTH_DURATION.observe(time.perf_counter() - start, method="cache", outcome="success")
+        return user
     
+    outcome = "failure"
     try:
-        # Import Clerk SDK (lazy import to handle optional dependency)
-        from clerk_backend_api import Clerk
-        from clerk_backend_api.security import authenticate_request
-        from clerk_backend_api.security.types import AuthenticateRequestOptions
-        import httpx
-        
-        # Build httpx request from FastAPI request
+        with span("auth", method=_AUTH_METHOD):
+            payload = await _verify_token(request, token)
+        user = _extract_user_from_payload(payload)
+        _token_cache.put(token, user, payload.get('exp'))
+        outcome = "success"
+        return user
+    finally:
+        AUTH_DURATION.observe(time.perf_counter() - start, method=_AUTH_METHOD, outcome=outcome)
+
+
+async def _verify_token(request: Request, token: str) -> dict:
+    """Verify a bearer token with the Clerk SDK (or manual JWT checks); returns its claims"""
+    if _AUTH_METHOD == "manual":
+        # clerk-backend-api not installed
+        return await _manual_jwt_verify(token)
+    
+    try:
+        # Only the bearer token matters to the SDK; don't copy every header
         httpx_request = httpx.Request(
             method=request.method,
             url=str(request.url),
-            headers=dict(request.headers)
-        )
-        
-        # Initialize Clerk SDK
-        clerk = Clerk(bearer_auth=get_clerk_secret_key())
-        
-        # Get authorized parties from env (comma-separated list)
-        authorized_parties = os.getenv('CLERK_AUTHORIZED_PARTIES', '').split(',')
-        authorized_parties = [p.strip() for p in authorized_parties if p.strip()]
-        
-        # Authenticate the request
-        request_state = clerk.authenticate_request(
-            httpx_request,
-            AuthenticateRequestOptions(
-                authorized_parties=authorized_parties if authorized_parties else None
-            )
+            headers={"Authorization": f"Bearer {token}"}
         )
+        request_state = _clerk_client().authenticate_request(httpx_request, _sdk_options())
         
         if not request_state.is_signed_in:
             raise HTTPException(
@@ -108,12 +173,8 @@ async def clerk_auth(
                 headers={"WWW-Authenticate": "Bearer"}
             )
         
-        # Extract user from payload
-        return _extract_user_from_payload(request_state.payload)
+        return request_state.payload
         
-    except ImportError:
-        # Fallback: Manual JWT verification if clerk-backend-api not installed
-        return await _manual_jwt_verify(token)
     except HTTPException:
         raise
     except Exception as e:
@@ -124,47 +185,37 @@ async def clerk_auth(
         )
 
 
-async def _manual_jwt_verify(token: str) -> ClerkUser:
+async def _manual_jwt_verify(token: str) -> dict:
     """Fallback JWT verification without Clerk SDK"""
     import jwt
-    import httpx
-    
-    # Get Clerk publishable key to determine JWKS URL
-    clerk_pub_key = os.getenv('CLERK_PUBLISHABLE_KEY', '')
     
-    # Extract frontend API from publishable key (pk_test_xxx or pk_live_xxx)
-    # The key contains the frontend API subdomain
-    if not clerk_pub_key:
+    cache = get_jwks_cache()
+    if not cache.issuers:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="CLERK_PUBLISHABLE_KEY not configured"
+            detail="CLERK_PUBLISHABLE_KEY (or CLERK_ISSUERS) not configured"
         )
     
     try:
-        # Decode without verification first to get issuer
-        unverified = jwt.decode(token, options={"verify_signature": False})
-        issuer = unverified.get('iss', '')
-        
-        # Fetch JWKS from Clerk
-        jwks_url = f"{issuer}/.well-known/jwks.json"
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(jwks_url)
-            jwks = resp.json()
-        
-        # Get the signing key
-        from jwt import PyJWKClient
-        jwk_client = PyJWKClient(jwks_url)
-        signing_key = jwk_client.get_signing_key_from_jwt(token)
+        # Unverified reads pick the key; only pinned issuers are ever fetched
+        issuer = jwt.decode(token, options={"verify_signature": False}).get('iss', '')
+        kid = jwt.get_unverified_header(token).get('kid')
+        signing_key = await cache.get_key(issuer, kid)
         
         # Verify and decode
         payload = jwt.decode(
             token,
             signing_key.key,
-            algorithms=["RS256"],
+            algorithms=[signing_key.algorithm_name],
+            issuer=issuer,
             options={"verify_aud": False}
         )
         
-        return _extract_user_from_payload(payload)
+        azp = payload.get('azp')
+        if azp and Config.CLERK_AUTHORIZED_PARTIES and azp not in Config.CLERK_AUTHORIZED_PARTIES:
+            raise jwt.InvalidTokenError(f"Unauthorized party: {azp}")
+        
+        return payload
         
     except jwt.InvalidTokenError as e:
         raise HTTPException(
@@ -172,6 +223,33 @@ async def _manual_jwt_verify(token: str) -> ClerkUser:
             detail=f"Invalid token: {str(e)}",
             headers={"WWW-Authenticate": "Bearer"}
         )
+    except (httpx.HTTPError, ValueError) as e:
+        # Cold cache or rotated key and Clerk's JWKS could not be fetched
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Could not load Clerk signing keys: {e}",
+            headers={"Retry-After": "5"}
+        )
+
+
+def issuer_from_publishable_key(publishable_key: str) -> Optional[str]:
+    """Frontend API URL encoded in a pk_test_/pk_live_ key, e.g. https://x.clerk.accounts.dev"""
+    try:
+        encoded = publishable_key.split("_", 2)[2]
+        encoded += "=" * (-len(encoded) % 4)
+        host = base64.b64decode(encoded).decode().rstrip("$")
+    except Exception:
+        return None
+    return f"https://{host}" if host else None
+
+
+async def warm_jwks() -> bool:
+    """Fetch the JWKS for the allowed Clerk issuers ahead of the first request"""
+    cache = get_jwks_cache()
+    if _AUTH_METHOD != "manual" or not cache.issuers:
+        return False
+    await asyncio.gather(*(cache.refresh(issuer, reason="cold") for issuer in cache.issuers))
+    return True
 
 
 # Convenience alias
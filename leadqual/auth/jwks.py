@@ -0,0 +1,171 @@
+"""
+Process-wide JWKS cache for Clerk token verification
+
+Signing keys are held per issuer and indexed by kid, so verifying a token
+needs no network call in steady state. Key sets older than the TTL are
+re-fetched in the background while the cached keys keep serving; an
+unknown kid (key rotation) forces a refresh at most once per
+min_refresh_interval. Only pinned issuers are ever fetched - the token's
+unverified `iss` never picks the URL on its own.
+"""
+
+import time
+import asyncio
+from typing import TYPE_CHECKING, Dict, Iterable, Optional
+
+import httpx
+
+from ..config import Config
+from ..monitoring.metrics import Counter
+
+if TYPE_CHECKING:
+    from jwt import PyJWK
+
+JWKS_FETCHES = Counter(
+    "leadqual_jwks_fetches_total",
+    "JWKS fetches from Clerk",
+    ("reason", "outcome")  # reason: cold, ttl, unknown_kid; outcome: ok, error
+)
+
+JWKS_LOOKUPS = Counter(
+    "leadqual_jwks_lookups_total",
+    "Signing key lookups by kid",
+    ("outcome",)  # hit, refreshed, unknown
+)
+
+
+class JWKSCache:
+    """Signing keys for the allowed issuers, indexed by kid"""
+
+    def __init__(
+        self,
+        issuers: Iterable[str],
+        ttl: float = 3600.0,
+        min_refresh_interval: float = 30.0,
+        timeout: float = 5.0
+    ):
+        self.issuers = {issuer.rstrip("/") for issuer in issuers if issuer}
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        self._keys: Dict[str, Dict[str, "PyJWK"]] = {}  # issuer -> kid -> key
+        self._fetched_at: Dict[str, float] = {}  # last successful fetch
+        self._attempted_at: Dict[str, float] = {}  # last fetch, successful or not
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._background: Dict[str, asyncio.Task] = {}
+
+    def allows(self, issuer: str) -> bool:
+        return bool(issuer) and issuer.rstrip("/") in self.issuers
+
+    async def get_key(self, issuer: str, kid: Optional[str]):
+        """The PyJWK for kid, refreshing the issuer's set when needed"""
+        import jwt
+
+        if not self.allows(issuer):
+            raise jwt.InvalidIssuerError(f"Untrusted token issuer: {issuer or 'missing'}")
+        if not kid:
+            raise jwt.InvalidTokenError("Token header has no kid")
+        issuer = issuer.rstrip("/")
+
+        keys = self._keys.get(issuer)
+        if keys is None:
+            await self.refresh(issuer, reason="cold")
+        elif kid in keys:
+            JWKS_LOOKUPS.inc(outcome="hit")
+            if time.monotonic() - self._fetched_at[issuer] > self.ttl:
+                self._refresh_in_background(issuer)
+            return keys[kid]
+        elif time.monotonic() - self._attempted_at.get(issuer, 0.0) >= self.min_refresh_interval:
+            await self.refresh(issuer, reason="unknown_kid")
+
+        key = self._keys.get(issuer, {}).get(kid)
+        if key is None:
+            JWKS_LOOKUPS.inc(outcome="unknown")
+            raise jwt.InvalidTokenError(f"Unknown signing key: {kid}")
+        JWKS_LOOKUPS.inc(outcome="refreshed")
+        return key
+
+    async def refresh(self, issuer: str, reason: str = "ttl"):
+        """Fetch the issuer's key set; concurrent callers share one fetch"""
+        pending = self._refreshing.get(issuer)
+        if pending is None:
+            # Its own task, so one caller's cancellation doesn't cancel the fetch for the others
+            pending = asyncio.get_running_loop().create_task(self._fetch(issuer, reason))
+            self._refreshing[issuer] = pending
+            pending.add_done_callback(lambda task: self._refreshed(issuer, task))
+        return await asyncio.shield(pending)
+
+    def _refreshed(self, issuer: str, task: asyncio.Task):
+        if self._refreshing.get(issuer) is task:
+            del self._refreshing[issuer]
+        if not task.cancelled():
+            task.exception()  # waiters re-raise it; mark as retrieved if none are left
+
+    async def _fetch(self, issuer: str, reason: str) -> int:
+        self._attempted_at[issuer] = time.monotonic()
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                response = await client.get(f"{issuer}/.well-known/jwks.json")
+                response.raise_for_status()
+                count = self.set_keys(issuer, response.json())
+        except Exception:
+            JWKS_FETCHES.inc(reason=reason, outcome="error")
+            raise
+        JWKS_FETCHES.inc(reason=reason, outcome="ok")
+        return count
+
+    def set_keys(self, issuer: str, jwks: Dict) -> int:
+        """Replace the issuer's keys from a JWKS document; returns keys kept"""
+        from jwt import PyJWK
+        from jwt.exceptions import PyJWKError
+
+        keys = {}
+        for jwk in jwks.get("keys", []):
+            if jwk.get("use", "sig") != "sig" or not jwk.get("kid"):
+                continue
+            try:
+                keys[jwk["kid"]] = PyJWK(jwk)
+            except PyJWKError:
+                continue  # unsupported key type; skip rather than drop the set
+        issuer = issuer.rstrip("/")
+        self._keys[issuer] = keys
+        self._fetched_at[issuer] = time.monotonic()
+        return len(keys)
+
+    def _refresh_in_background(self, issuer: str):
+        task = self._background.get(issuer)
+        if task is not None and not task.done():
+            return
+        if time.monotonic() - self._attempted_at.get(issuer, 0.0) < self.min_refresh_interval:
+            return  # the last attempt failed recently; keep serving the old keys
+        self._background[issuer] = asyncio.get_running_loop().create_task(self._refresh_quietly(issuer))
+
+    async def _refresh_quietly(self, issuer: str):
+        try:
+            await self.refresh(issuer, reason="ttl")
+        except Exception as e:
+            print(f"⚠️ JWKS refresh for {issuer} failed, keeping cached keys: {e}")
+
+
+def allowed_issuers() -> list:
+    """CLERK_ISSUERS, or the Frontend API encoded in the publishable key"""
+    from .clerk import issuer_from_publishable_key
+
+    if Config.CLERK_ISSUERS:
+        return Config.CLERK_ISSUERS
+    issuer = issuer_from_publishable_key(Config.CLERK_PUBLISHABLE_KEY or "")
+    return [issuer] if issuer else []
+
+
+_cache: Optional[JWKSCache] = None
+
+
+def get_jwks_cache() -> JWKSCache:
+    global _cache
+    if _cache is None:
+        _cache = JWKSCache(
+            allowed_issuers(),
+            ttl=Config.CLERK_JWKS_TTL,
+            min_refresh_interval=Config.CLERK_JWKS_MIN_REFRESH
+        )
+    return _cache
@@ -0,0 +1,58 @@
+"""
+Bounded fan-out for batch endpoints, streamed back as NDJSON
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Sequence
+
+from starlette.concurrency import run_in_threadpool
+
+from .responses import dumps
+
+
+def _line(record: Dict[str, Any]) -> bytes:
+    return dumps(record) + b"\n"
+
+
+async def stream_batch(
+    items: Sequence[Any],
+    worker: Callable[[Any], Dict[str, Any]],
+    concurrency: int,
+    describe: Callable[[Any], Dict[str, Any]] = lambda item: {},
+    admit: Optional[Callable[[int], Awaitable[None]]] = None
+) -> AsyncIterator[bytes]:
+    """
+    Run the blocking worker over items with at most `concurrency` in flight,
+    yielding one NDJSON line per item as soon as it completes, then a summary.
+
+    Each line carries the item's index so clients can re-order. Failures are
+    reported per item and never abort the batch. If the client disconnects
+    the generator is closed and every unfinished item is cancelled. admit(index),
+    when given, is awaited before each item starts (e.g. to pace a rate limit).
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(index: int, item: Any) -> Dict[str, Any]:
+        async with semaphore:
+            if admit is not None:
+                await admit(index)
+            record = {"index": index, "success": False, **describe(item)}
+            try:
+                record["data"] = await run_in_threadpool(worker, item)
+                record["success"] = True
+            except Exception as e:
+                record["error"] = str(e)
+            return record
+
+    tasks = [asyncio.create_task(run(i, item)) for i, item in enumerate(items)]
+    failed = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            record = await next_done
+            failed += not record["success"]
+            yield _line(record)
+        yield _line({"done": True, "total": len(tasks), "failed": failed})
+    finally:
+        # Client went away (or the stream errored): drop queued work
+        for task in tasks:
+            task.cancel()
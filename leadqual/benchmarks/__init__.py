@@ -0,0 +1 @@
+"""Benchmarks for LeadQual AI (run each with python -m leadqual.benchmarks.<name>)"""
@@ -0,0 +1,91 @@
+"""
+Measure first-request latency after a worker starts, with and without warm-up
+
+Starts leadqual.benchmarks.mock_app once with WARMUP_ENABLED=false (clients
+built lazily by the first request) and once with warm-up, then times the
+first /api/leads/generate-email against the steady-state median. Zoho, JWKS
+and database warm-up steps also run when their credentials are in .env.
+
+Usage:
+    python -m leadqual.benchmarks.cold_start [--runs 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+from typing import Dict
+
+import httpx
+
+from .load_test import APP, ENDPOINTS, _free_port
+
+METHOD, PATH, BODY = ENDPOINTS["POST /api/leads/generate-email"]
+
+
+def _timed(client: httpx.Client) -> float:
+    start = time.perf_counter()
+    response = client.request(METHOD, PATH, json=BODY)
+    elapsed = (time.perf_counter() - start) * 1000
+    if response.status_code != 200:
+        raise RuntimeError(f"{PATH} returned {response.status_code}: {response.text[:200]}")
+    return elapsed
+
+
+def run_once(warmup: bool) -> Dict:
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    env = dict(os.environ, WARMUP_ENABLED=str(warmup).lower(), TRACE_SAMPLE_RATE="0")
+    cmd = [sys.executable, "-m", "leadqual.serve", "--host", "127.0.0.1", "--port", str(port), "--app", APP]
+
+    started = time.perf_counter()
+    server = subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        with httpx.Client(base_url=base_url, timeout=30, headers={"Authorization": "Bearer bench"}) as client:
+            while True:
+                try:
+                    if client.get("/ready").status_code == 200:
+                        break
+                except httpx.HTTPError:
+                    pass
+                if time.perf_counter() - started > 60:
+                    raise RuntimeError("Server did not become ready")
+                time.sleep(0.05)
+            ready_ms = (time.perf_counter() - started) * 1000
+            steps = client.get("/ready").json()["steps"]
+
+            first = _timed(client)
+            steady = statistics.median(_timed(client) for _ in range(20))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    return {"ready_ms": ready_ms, "first_ms": first, "steady_ms": steady, "steps": steps}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold first-request latency benchmark")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print("🧊 LeadQual Cold Start Benchmark (auth and Nova mocked)")
+    print("=" * 72)
+
+    print(f"\n   {'warm-up':<8} {'ready ms':>9} {'first req ms':>13} {'steady ms':>10} {'penalty ms':>11}")
+    for warmup in (False, True):
+        runs = [run_once(warmup) for _ in range(args.runs)]
+        ready = statistics.median(r["ready_ms"] for r in runs)
+        first = statistics.median(r["first_ms"] for r in runs)
+        steady = statistics.median(r["steady_ms"] for r in runs)
+        label = "on" if warmup else "off"
+        print(f"   {label:<8} {ready:>9.0f} {first:>13.1f} {steady:>10.1f} {first - steady:>11.1f}")
+        if warmup:
+            for name, step in runs[-1]["steps"].items():
+                print(f"      {name:<20} {step['status']:<8} {step['ms']:>7.1f} ms {step.get('error', '')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+"""
+In-process fake of the Zoho APIs LeadQual uses, for offline load tests
+
+Serves, from one origin:
+    POST /oauth/v2/token                          accounts (refresh_token, authorization_code)
+    POST /crm/v3/Leads, /crm/v3/Leads/upsert      CRM leads (100 records per call)
+    GET  /crm/v3/users                            CRM users
+    GET  /api/accounts                            Mail accounts
+    POST /api/accounts/{id}/messages              Mail send
+
+Bearer tokens are checked (401 INVALID_TOKEN for unknown or expired ones) and
+CRM responses carry X-RATELIMIT-* credit headers. Latency, 5xx errors and 429s
+can be injected, and changed at runtime with POST /_fake/config; counters are
+at GET /_fake/stats.
+
+Point the app at it with:
+    python -m leadqual.benchmarks.fake_zoho --port 8765 --latency-ms 50
+    ZOHO_ACCOUNTS_URL=http://127.0.0.1:8765 \\
+    ZOHO_CRM_API_URL=http://127.0.0.1:8765/crm/v3 \\
+    ZOHO_MAIL_API_URL=http://127.0.0.1:8765/api ...
+"""
+
+import os
+import time
+import random
+import socket
+import asyncio
+import argparse
+import tempfile
+import threading
+import subprocess
+from collections import Counter
+from dataclasses import dataclass, asdict
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+MAX_RECORDS = 100
+
+
+@dataclass
+class FakeZohoOptions:
+    latency_ms: float = 0.0  # added to every API call
+    jitter_ms: float = 0.0  # plus uniform(0, jitter)
+    error_rate: float = 0.0  # fraction answered 500
+    throttle_rate: float = 0.0  # fraction answered 429
+    retry_after: float = 1.0  # Retry-After on injected 429s
+    token_ttl: int = 3600
+    credits: int = 0  # CRM calls per credit window before 429s; 0 = unlimited
+    credit_window: float = 60.0
+
+
+class FakeZoho:
+    """State behind the fake: issued tokens, stored leads, counters"""
+
+    def __init__(self, options: Optional[FakeZohoOptions] = None):
+        self.options = options or FakeZohoOptions()
+        self.tokens: Dict[str, float] = {}  # access token -> expiry (epoch)
+        self.leads: Dict[str, Dict] = {}  # email -> record
+        self.stats: Counter = Counter()
+        self._credits_used = 0
+        self._window_start = time.time()
+        self._ids = 0
+
+    def _next_id(self) -> str:
+        self._ids += 1
+        return str(5_000_000_000 + self._ids)
+
+    def issue_token(self) -> str:
+        token = f"fake-{self._next_id()}"
+        self.tokens[token] = time.time() + self.options.token_ttl
+        return token
+
+    def authorized(self, request: Request) -> bool:
+        header = request.headers.get("authorization", "")
+        token = header.removeprefix("Zoho-oauthtoken ").strip()
+        return self.tokens.get(token, 0) > time.time()
+
+    def credit_headers(self) -> Dict[str, str]:
+        if not self.options.credits:
+            return {}
+        now = time.time()
+        if now - self._window_start >= self.options.credit_window:
+            self._window_start, self._credits_used = now, 0
+        reset = self._window_start + self.options.credit_window
+        return {
+            "X-RATELIMIT-LIMIT": str(self.options.credits),
+            "X-RATELIMIT-REMAINING": str(max(0, self.options.credits - self._credits_used)),
+            "X-RATELIMIT-RESET": str(int(reset * 1000))
+        }
+
+    async def fault(self, request: Request, crm: bool = False) -> Optional[JSONResponse]:
+        """Apply latency and injected failures; a response here replaces the real one"""
+        options = self.options
+        delay = options.latency_ms + random.uniform(0, options.jitter_ms)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+        if not self.authorized(request):
+            return JSONResponse({"code": "INVALID_TOKEN", "message": "invalid oauth token", "status": "error"}, 401)
+        roll = random.random()
+        if roll < options.throttle_rate:
+            return JSONResponse(
+                {"code": "TOO_MANY_REQUESTS", "message": "injected throttle", "status": "error"},
+                429, headers={"Retry-After": str(options.retry_after)}
+            )
+        if roll < options.throttle_rate + options.error_rate:
+            return JSONResponse({"code": "INTERNAL_ERROR", "message": "injected failure", "status": "error"}, 500)
+        if crm and options.credits:
+            headers = self.credit_headers()
+            if self._credits_used >= options.credits:
+                reset_in = self._window_start + options.credit_window - time.time()
+                return JSONResponse(
+                    {"code": "TOO_MANY_REQUESTS", "message": "API credits exhausted", "status": "error"},
+                    429, headers={**headers, "Retry-After": str(max(1, int(reset_in)))}
+                )
+            self._credits_used += 1
+        return None
+
+
+def create_app(state: Optional[FakeZoho] = None) -> FastAPI:
+    state = state or FakeZoho()
+    app = FastAPI(title="Fake Zoho")
+    app.state.fake = state
+
+    @app.middleware("http")
+    async def count(request: Request, call_next):
+        response = await call_next(request)
+        route = getattr(request.scope.get("route"), "path", request.url.path)
+        state.stats[f"{request.method} {route} {response.status_code}"] += 1
+        return response
+
+    @app.post("/oauth/v2/token")
+    async def token(request: Request):
+        form = parse_qs((await request.body()).decode())
+        grant = (form.get("grant_type") or [None])[0]
+        if grant not in ("refresh_token", "authorization_code"):
+            return JSONResponse({"error": "unsupported_grant_type"}, 400)
+        body = {
+            "access_token": state.issue_token(),
+            "expires_in": state.options.token_ttl,
+            "api_domain": str(request.base_url).rstrip("/"),
+            "token_type": "Bearer"
+        }
+        if grant == "authorization_code":
+            body["refresh_token"] = "fake-refresh-token"
+        return body
+
+    def crm_response(body: Dict, status: int = 200) -> JSONResponse:
+        return JSONResponse(body, status, headers=state.credit_headers())
+
+    def validate(records) -> Optional[JSONResponse]:
+        if not isinstance(records, list) or not records:
+            return crm_response({"code": "INVALID_DATA", "message": "data is required", "status": "error"}, 400)
+        if len(records) > MAX_RECORDS:
+            return crm_response({"code": "LIMIT_EXCEEDED", "message": "at most 100 records", "status": "error"}, 400)
+        return None
+
+    def record_result(action: Optional[str], record_id: Optional[str]) -> Dict:
+        if record_id is None:
+            return {
+                "code": "MANDATORY_NOT_FOUND", "details": {"api_name": "Last_Name"},
+                "message": "required field not found", "status": "error"
+            }
+        return {
+            "code": "SUCCESS", "duplicate_field": "Email" if action == "update" else None,
+            "action": action, "details": {"id": record_id},
+            "message": "record updated" if action == "update" else "record added", "status": "success"
+        }
+
+    @app.post("/crm/v3/Leads")
+    async def create_leads(request: Request):
+        failure = await state.fault(request, crm=True)
+        if failure:
+            return failure
+        records = (await request.json()).get("data")
+        invalid = validate(records)
+        if invalid:
+            return invalid
+        data = []
+        for record in records:
+            if not record.get("Last_Name"):
+                data.append(record_result(None, None))
+                continue
+            record_id = state._next_id()
+            if record.get("Email"):
+                state.leads[record["Email"].lower()] = {**record, "id": record_id}
+            data.append(record_result("insert", record_id))
+        return crm_response({"data": data}, 201)
+
+    @app.post("/crm/v3/Leads/upsert")
+    async def upsert_leads(request: Request):
+        failure = await state.fault(request, crm=True)
+        if failure:
+            return failure
+        records = (await request.json()).get("data")
+        invalid = validate(records)
+        if invalid:
+            return invalid
+        data = []
+        for record in records:
+            email = (record.get("Email") or "").lower()
+            if not record.get("Last_Name"):
+                data.append(record_result(None, None))
+                continue
+            existing = state.leads.get(email) if email else None
+            if existing is not None:
+                existing.update(record)
+                data.append(record_result("update", existing["id"]))
+            else:
+                record_id = state._next_id()
+                if email:
+                    state.leads[email] = {**record, "id": record_id}
+                data.append(record_result("insert", record_id))
+        return crm_response({"data": data})
+
+    @app.get("/crm/v3/users")
+    async def users(request: Request):
+        failure = await state.fault(request, crm=True)
+        if failure:
+            return failure
+        return crm_response({"users": [{"id": "1000", "full_name": "Fake Admin", "email": "admin@example.com"}]})
+
+    @app.get("/api/accounts")
+    async def accounts(request: Request):
+        failure = await state.fault(request)
+        if failure:
+            return failure
+        return {"status": {"code": 200, "description": "success"}, "data": [{"accountId": "1000"}]}
+
+    @app.post("/api/accounts/{account_id}/messages")
+    async def send(account_id: str, request: Request):
+        failure = await state.fault(request)
+        if failure:
+            return failure
+        payload = await request.json()
+        if not payload.get("toAddress"):
+            return JSONResponse(
+                {"status": {"code": 400, "description": "toAddress is required"}, "data": {"errorCode": "EXTRA_KEY_FOUND_IN_JSON"}},
+                400
+            )
+        return {
+            "status": {"code": 200, "description": "success"},
+            "data": {"messageId": state._next_id(), "toAddress": payload["toAddress"], "subject": payload.get("subject")}
+        }
+
+    @app.post("/_fake/config")
+    async def configure(changes: Dict):
+        for key, value in changes.items():
+            if hasattr(state.options, key):
+                setattr(state.options, key, type(getattr(state.options, key))(value))
+        return asdict(state.options)
+
+    @app.get("/_fake/stats")
+    async def stats():
+        return {"requests": dict(state.stats), "leads": len(state.leads), "tokens": len(state.tokens)}
+
+    return app
+
+
+def self_signed_cert() -> Optional[Tuple[str, str]]:
+    """Throwaway (cert, key) for 127.0.0.1 via the openssl CLI, or None without it"""
+    directory = tempfile.mkdtemp()
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    try:
+        subprocess.run(
+            ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+             "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1",
+             "-keyout", key, "-out", cert],
+            check=True, capture_output=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return cert, key
+
+
+def start_fake_zoho(
+    options: Optional[FakeZohoOptions] = None,
+    tls: bool = False,
+    port: int = 0
+) -> Tuple[str, FakeZoho, uvicorn.Server]:
+    """Run the fake in a background thread; returns (base URL, state, server)"""
+    if not port:
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+
+    ssl = {}
+    cert = self_signed_cert() if tls else None
+    if cert:
+        # httpx trusts SSL_CERT_FILE, so clients verify the fake cert
+        os.environ["SSL_CERT_FILE"] = cert[0]
+        ssl = {"ssl_certfile": cert[0], "ssl_keyfile": cert[1]}
+
+    state = FakeZoho(options)
+    config = uvicorn.Config(create_app(state), host="127.0.0.1", port=port, log_level="warning", **ssl)
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"{'https' if cert else 'http'}://127.0.0.1:{port}", state, server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake Zoho API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--credits", type=int, default=0, help="CRM calls per window (0 = unlimited)")
+    args = parser.parse_args()
+
+    options = FakeZohoOptions(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        credits=args.credits
+    )
+    base = f"http://{args.host}:{args.port}"
+    print(f"🚀 Fake Zoho on {base}")
+    print(f"   ZOHO_ACCOUNTS_URL={base} ZOHO_CRM_API_URL={base}/crm/v3 ZOHO_MAIL_API_URL={base}/api")
+    uvicorn.run(create_app(FakeZoho(options)), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
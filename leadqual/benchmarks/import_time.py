@@ -0,0 +1,96 @@
+"""
+Measure how long importing the API takes in a fresh interpreter
+
+Runs `python -X importtime -c "import leadqual.api"` several times and reports
+the median cumulative import time with its heaviest direct imports. Fails when
+the median is over budget or when an SDK that should load on first use
+(openai, jwt, psycopg2, clerk_backend_api) is imported at startup - worker
+boot time is what autoscaling waits on.
+
+Usage:
+    python -m leadqual.benchmarks.import_time [--runs 5] [--budget-ms 800]
+"""
+
+import os
+import sys
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[2]
+MODULE = "leadqual.api"
+IMPORT_BUDGET_MS = 800.0
+LAZY_MODULES = ("openai", "jwt", "psycopg2", "clerk_backend_api")
+
+
+def import_profile(module: str) -> Tuple[float, List[Tuple[str, float]], Dict[str, float]]:
+    """(cumulative ms, direct imports by cumulative ms, every module's cumulative ms) for one fresh import"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=dict(os.environ, PYTHONDONTWRITEBYTECODE="1"),
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    modules: Dict[str, float] = {}
+    children: List[Tuple[str, float]] = []
+    total = 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        name = name[1:]
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        name, ms = name.strip(), int(cumulative) / 1000
+        modules[name] = ms
+        # importtime lists children before their parent
+        if depth == 1:
+            children.append((name, ms))
+        elif depth == 0:
+            if name == module:
+                total = ms
+                break
+            children = []
+    return total, sorted(children, key=lambda c: c[1], reverse=True), modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API import time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"⏱️  Import Time Benchmark ({MODULE})")
+    print("=" * 60)
+
+    profiles = [import_profile(MODULE) for _ in range(args.runs)]
+    profiles.sort(key=lambda p: p[0])
+    total, children, modules = profiles[len(profiles) // 2]
+
+    print(f"\n   runs: {', '.join(f'{p[0]:.0f}' for p in profiles)} ms")
+    print(f"   median: {total:.0f} ms  (budget {args.budget_ms:.0f} ms)\n")
+    print(f"   {'direct import':<40} {'ms':>8}")
+    for name, ms in children[:args.top]:
+        print(f"   {name:<40} {ms:>8.1f}")
+
+    eager = [name for name in LAZY_MODULES if name in modules]
+    failed = False
+    if eager:
+        print(f"\n❌ Imported at startup but should load on first use: {', '.join(eager)}")
+        failed = True
+    if total > args.budget_ms:
+        print(f"\n❌ Import time {total:.0f} ms is over budget")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print(f"\n✅ Import time within budget ({total:.0f} ms median)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Post a burst of lead replies to the inbound webhook and report ack latency,
+dropped duplicates and the throttled scoring rate
+
+Scoring is stubbed (no database or Nova calls), so this measures the webhook
+and queue only.
+
+Usage:
+    python -m leadqual.benchmarks.inbound_burst [--replies 1000] [--duplicates 0.2]
+"""
+
+import os
+import time
+import random
+import asyncio
+import argparse
+
+os.environ.setdefault("INBOUND_WEBHOOK_SECRET", "bench-secret")
+os.environ.setdefault("WARMUP_ENABLED", "false")
+# Client and app share one loop here, so the burst itself looks like a stall
+os.environ.setdefault("LOOP_MONITOR_ENABLED", "false")
+
+import httpx
+
+from .. import api
+from ..config import Config
+from ..inbound import TOKEN_HEADER, webhook_token
+
+MIME = """From: Lead {n} <lead{n}@example.com>
+To: sales@example.com
+Subject: Re: Quick question
+Message-ID: <reply-{n}@example.com>
+Content-Type: text/plain; charset=utf-8
+
+Hi, we have budget approved for Q3 and I sign off on tools like this.
+Our team is 40 people.
+
+--
+Lead {n}
+VP Sales
+
+On Tue, Jan 6, 2026 at 9:00 AM Sales <sales@example.com> wrote:
+> What does your timeline look like?
+"""
+
+
+async def run(replies: int, duplicates: float, concurrency: int):
+    scored = []
+
+    async def handler(reply):
+        scored.append(time.perf_counter())
+        return "scored"
+
+    async with api.lifespan(api.app):
+        queue = api.get_reply_queue()
+        queue.handler = handler
+
+        numbers = list(range(replies))
+        numbers += random.sample(numbers, int(replies * duplicates))
+        random.shuffle(numbers)
+
+        transport = httpx.ASGITransport(app=api.app)
+        latencies, statuses = [], {}
+        semaphore = asyncio.Semaphore(concurrency)
+        url = "/webhooks/inbound-email/bench-user"
+        headers = {"Content-Type": "message/rfc822", TOKEN_HEADER: webhook_token("bench-user")}
+
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            async def post(n):
+                async with semaphore:
+                    start = time.perf_counter()
+                    response = await client.post(url, content=MIME.format(n=n).encode(), headers=headers)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                    status = response.json().get("status", response.status_code)
+                    statuses[status] = statuses.get(status, 0) + 1
+
+            burst_start = time.perf_counter()
+            await asyncio.gather(*(post(n) for n in numbers))
+            burst_seconds = time.perf_counter() - burst_start
+
+            # Watch the throttled workers for a few seconds
+            await asyncio.sleep(3)
+            in_window = len(scored)
+            queue.pacer.interval = 0  # then drain the rest quickly for shutdown
+
+    latencies.sort()
+    print("=" * 60)
+    print("📬 Inbound Reply Burst")
+    print("=" * 60)
+    print(f"\n   posted:          {len(numbers)} ({replies} unique) in {burst_seconds:.2f}s")
+    print(f"   outcomes:        {statuses}")
+    print(f"   ack p50 / p99:   {latencies[len(latencies) // 2]:.2f} / {latencies[int(len(latencies) * 0.99)]:.2f} ms")
+    if scored:
+        rate = in_window / max(scored[min(in_window, len(scored)) - 1] - scored[0], 1e-9)
+        print(f"   scoring rate:    {rate:.1f}/s (limit {Config.INBOUND_SCORES_PER_SECOND}/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inbound webhook burst benchmark")
+    parser.add_argument("--replies", type=int, default=1000)
+    parser.add_argument("--duplicates", type=float, default=0.2, help="Fraction of extra duplicate posts")
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.replies, args.duplicates, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Load test the API in development and production serving modes
+
+Starts leadqual.benchmarks.mock_app (auth and Nova stubbed) with
+leadqual.serve in each mode, drives it from several client processes and
+reports req/s and p50/p99 latency for /api/me and /api/leads/generate-email.
+
+Usage:
+    python -m leadqual.benchmarks.load_test [--duration 10] [--concurrency 64] [--workers 4]
+"""
+
+import os
+import sys
+import time
+import socket
+import asyncio
+import argparse
+import subprocess
+import multiprocessing
+from typing import Dict, List, Tuple
+
+import httpx
+
+APP = "leadqual.benchmarks.mock_app:app"
+
+ENDPOINTS = {
+    "GET /api/me": ("GET", "/api/me", None),
+    "POST /api/leads/generate-email": ("POST", "/api/leads/generate-email", {
+        "lead_name": "Jordan Lee",
+        "lead_email": "jordan@example.com",
+        "company": "Example Corp",
+        "conversation_history": "Asked about pricing for a 20 person team.",
+        "current_score": 35
+    }),
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(base_url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become ready")
+
+
+async def _drive(base_url: str, method: str, path: str, body, concurrency: int, duration: float) -> Tuple[List[float], int]:
+    latencies: List[float] = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    headers = {"Authorization": "Bearer bench", "Accept-Encoding": "gzip"}
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, headers=headers, timeout=30) as client:
+        deadline = time.perf_counter() + duration
+
+        async def user():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.request(method, path, json=body)
+                    ok = response.status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+    return latencies, errors
+
+
+def _client_process(args) -> Tuple[List[float], int]:
+    return asyncio.run(_drive(*args))
+
+
+def run_endpoint(pool, base_url: str, name: str, concurrency: int, duration: float, procs: int) -> Dict:
+    method, path, body = ENDPOINTS[name]
+    per_proc = max(1, concurrency // procs)
+    # Short warm-up so connection setup and lazy imports are not measured
+    pool.map(_client_process, [(base_url, method, path, body, per_proc, 0.5)] * procs)
+    results = pool.map(_client_process, [(base_url, method, path, body, per_proc, duration)] * procs)
+
+    latencies = sorted(l for lats, _ in results for l in lats)
+    errors = sum(e for _, e in results)
+    if not latencies:
+        return {"rps": 0.0, "p50": 0.0, "p99": 0.0, "errors": errors}
+    return {
+        "rps": len(latencies) / duration,
+        "p50": latencies[len(latencies) // 2] * 1000,
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "errors": errors
+    }
+
+
+def run_mode(mode: str, args, pool) -> Dict[str, Dict]:
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    # One bench user would hit its tier limit within seconds
+    env = dict(os.environ, TRACE_SAMPLE_RATE="0", LOOP_MONITOR_ENABLED="false", RATE_LIMIT_ENABLED="false")
+    cmd = [
+        sys.executable, "-m", "leadqual.serve",
+        "--mode", mode, "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(args.workers), "--app", APP
+    ]
+    server = subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        _wait_ready(base_url)
+        return {
+            name: run_endpoint(pool, base_url, name, args.concurrency, args.duration, args.client_procs)
+            for name in ENDPOINTS
+        }
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test LeadQual serving modes")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per endpoint")
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent connections in total")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Workers in production mode")
+    parser.add_argument("--client-procs", type=int, default=2, help="Load generator processes")
+    parser.add_argument("--modes", nargs="+", default=["development", "production"])
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print("🏋️ LeadQual API Load Test (auth and Nova mocked)")
+    print("=" * 72)
+    print(f"   {args.concurrency} connections, {args.duration:.0f}s per endpoint, {args.workers} production workers")
+
+    with multiprocessing.Pool(args.client_procs) as pool:
+        results = {mode: run_mode(mode, args, pool) for mode in args.modes}
+
+    print(f"\n   {'mode':<12} {'endpoint':<32} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for mode, endpoints in results.items():
+        for name, r in endpoints.items():
+            print(f"   {mode:<12} {name:<32} {r['rps']:>9.0f} {r['p50']:>8.1f} {r['p99']:>8.1f} {r['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark metric recording and /metrics rendering against the overhead budget
+
+Usage:
+    python -m leadqual.benchmarks.metrics_overhead
+"""
+
+import sys
+import time
+
+from ..monitoring.metrics import (
+    Histogram, Counter, OBSERVE_BUDGET_US, RENDER_BUDGET_MS, render
+)
+
+ITERATIONS = 200_000
+
+
+def bench_observe() -> float:
+    """Average cost of one labelled histogram observation, in microseconds"""
+    histogram = Histogram("bench_observe_seconds", "benchmark", ("method", "route", "status"))
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        histogram.observe(0.012, method="GET", route="/api/me", status=200)
+    return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+
+def bench_counter() -> float:
+    """Average cost of one labelled counter increment, in microseconds"""
+    counter = Counter("bench_counter_total", "benchmark", ("service", "operation"))
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        counter.inc(service="crm", operation="POST Leads")
+    return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+
+def bench_render() -> float:
+    """Render time with a realistic number of series, in milliseconds"""
+    histogram = Histogram("bench_render_seconds", "benchmark", ("method", "route", "status"))
+    for route in range(40):
+        for status in (200, 401, 500):
+            histogram.observe(0.05, method="POST", route=f"/api/route/{route}", status=status)
+    render()  # warm up
+    start = time.perf_counter()
+    for _ in range(20):
+        render()
+    return (time.perf_counter() - start) / 20 * 1000
+
+
+def main():
+    print("=" * 60)
+    print("📊 Metrics Overhead Benchmark")
+    print("=" * 60)
+
+    observe_us = bench_observe()
+    counter_us = bench_counter()
+    render_ms = bench_render()
+
+    print(f"\n   histogram.observe: {observe_us:.2f} µs  (budget {OBSERVE_BUDGET_US} µs)")
+    print(f"   counter.inc:       {counter_us:.2f} µs  (budget {OBSERVE_BUDGET_US} µs)")
+    print(f"   /metrics render:   {render_ms:.2f} ms  (budget {RENDER_BUDGET_MS} ms)")
+
+    over = observe_us > OBSERVE_BUDGET_US or counter_us > OBSERVE_BUDGET_US or render_ms > RENDER_BUDGET_MS
+    if over:
+        print("\n❌ Metrics overhead is over budget")
+        sys.exit(1)
+    print("\n✅ Metrics overhead within budget")
+
+
+if __name__ == "__main__":
+    main()
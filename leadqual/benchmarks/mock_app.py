@@ -0,0 +1,60 @@
+"""
+The LeadQual API with Clerk auth and Nova calls stubbed out, for load tests
+
+Serve with:
+    python -m leadqual.serve --mode production --app leadqual.benchmarks.mock_app:app
+
+MOCK_NOVA_LATENCY_MS adds a simulated model round trip (default 0, so the
+numbers show framework and serialisation overhead only). The agent and its
+OpenAI client are still built for real, so cold-start cost is measured too.
+"""
+
+import os
+import json
+import time
+from types import SimpleNamespace
+
+# The agent refuses to start without a key; it never reaches Nova here
+os.environ.setdefault("NOVA_API_KEY", "bench")
+
+from .. import api
+from ..agent.qualifier import LeadQualifierAgent
+from ..auth import clerk_auth, ClerkUser
+
+NOVA_LATENCY = float(os.getenv("MOCK_NOVA_LATENCY_MS", "0")) / 1000
+
+_EMAIL = json.dumps({
+    "subject": "Quick question about your goals for next quarter",
+    "body": "Hi there,\n\n" + "Thanks for reaching out about LeadQual. " * 40,
+    "questions_asked": ["budget", "timeline"],
+    "reasoning": "Budget and timeline are still unknown. " * 10
+})
+
+
+class _FakeCompletions:
+    def create(self, model, messages, **kwargs):
+        if NOVA_LATENCY:
+            time.sleep(NOVA_LATENCY)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=_EMAIL))],
+            usage=SimpleNamespace(prompt_tokens=850, completion_tokens=320)
+        )
+
+
+_get_agent = api.get_agent
+
+
+def _stubbed_agent() -> LeadQualifierAgent:
+    agent = _get_agent()
+    if not isinstance(agent.client.chat.completions, _FakeCompletions):
+        agent.client.chat.completions = _FakeCompletions()
+    return agent
+
+
+async def _fake_user() -> ClerkUser:
+    return ClerkUser(user_id="user_bench", email="bench@example.com", first_name="Bench", last_name="User")
+
+
+api.get_agent = _stubbed_agent
+api.app.dependency_overrides[clerk_auth] = _fake_user
+app = api.app
@@ -0,0 +1,61 @@
+"""
+Benchmark the per-request cost of the in-process rate limiter
+
+Usage:
+    python -m leadqual.benchmarks.ratelimit_overhead
+"""
+
+import sys
+import time
+import asyncio
+
+from ..ratelimit import MemoryBackend, RateLimiter, TierCache
+
+ITERATIONS = 200_000
+USERS = 10_000
+CHECK_BUDGET_US = 20.0
+
+
+async def bench_hit(max_keys: int) -> float:
+    """Average backend hit across USERS users, in microseconds"""
+    backend = MemoryBackend(max_keys=max_keys)
+    keys = [f"user_{i}" for i in range(USERS)]
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        await backend.hit(keys[i % USERS], 1_000_000, 60.0)
+    return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+
+async def bench_check() -> float:
+    """Average full check (cached tier lookup + hit), in microseconds"""
+    limiter = RateLimiter(MemoryBackend(), TierCache(ttl=300), window=60.0)
+    keys = [f"user_{i}" for i in range(USERS)]
+    for key in keys:
+        await limiter.check(key)  # warm the tier cache
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        await limiter.check(keys[i % USERS])
+    return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+
+async def run():
+    print("=" * 60)
+    print("🚦 Rate Limiter Overhead Benchmark")
+    print("=" * 60)
+
+    hit_us = await bench_hit(max_keys=USERS * 2)
+    evict_us = await bench_hit(max_keys=USERS // 2)
+    check_us = await bench_check()
+
+    print(f"\n   backend hit:             {hit_us:.2f} µs")
+    print(f"   backend hit (evicting):  {evict_us:.2f} µs")
+    print(f"   limiter check:           {check_us:.2f} µs  (budget {CHECK_BUDGET_US} µs)")
+
+    if check_us > CHECK_BUDGET_US:
+        print("\n❌ Rate limiter overhead is over budget")
+        sys.exit(1)
+    print("\n✅ Rate limiter overhead within budget")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,74 @@
+"""
+Latency of 100 sequential ZohoMail sends: one-off clients vs the pooled client
+
+Runs the local fake Zoho server (fake_zoho.py, HTTPS with a throwaway self-signed cert when
+the openssl CLI is available, so TLS setup cost is included) and sends through
+ZohoMail with a new httpx client per call, then with build_client's pool.
+
+Usage:
+    python -m leadqual.benchmarks.zoho_send_latency [--sends 100] [--latency-ms 0]
+"""
+
+import time
+import asyncio
+import argparse
+import statistics
+
+from ..integrations.http import build_client, HTTP_CONNECTIONS_OPENED
+from ..integrations.zoho_mail import ZohoMail
+from ..integrations.zoho_token import ZohoTokenManager
+from .fake_zoho import FakeZohoOptions, start_fake_zoho
+
+
+async def run_sends(base_url: str, sends: int, pooled: bool) -> dict:
+    name = "bench_pooled" if pooled else "bench_one_off"
+    mail_http = build_client(name) if pooled else None
+    accounts_http = build_client(f"{name}_accounts") if pooled else None
+    tokens = ZohoTokenManager("id", "secret", "refresh", http=accounts_http, accounts_url=base_url)
+    mail = ZohoMail(http=mail_http, tokens=tokens, api_url=f"{base_url}/api")
+
+    latencies = []
+    try:
+        for i in range(sends):
+            start = time.perf_counter()
+            await mail.send_email(to_address=f"lead{i}@example.com", subject="Hello", html_content="<p>Hi</p>")
+            latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        for client in (mail_http, accounts_http):
+            if client is not None:
+                await client.aclose()
+
+    latencies.sort()
+    return {
+        "mean": statistics.mean(latencies),
+        "p50": latencies[len(latencies) // 2],
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        "total": sum(latencies)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sequential Zoho Mail send latency")
+    parser.add_argument("--sends", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Fake server think time")
+    args = parser.parse_args()
+
+    base_url, _, server = start_fake_zoho(FakeZohoOptions(latency_ms=args.latency_ms), tls=True)
+
+    print("=" * 64)
+    print("📮 Zoho Mail Send Latency (local fake endpoint)")
+    print("=" * 64)
+    print(f"   {args.sends} sequential sends to {base_url}")
+    print(f"\n   {'client':<10} {'mean ms':>8} {'p50 ms':>8} {'p99 ms':>8} {'total s':>8}")
+    for pooled in (False, True):
+        result = asyncio.run(run_sends(base_url, args.sends, pooled))
+        label = "pooled" if pooled else "one-off"
+        print(f"   {label:<10} {result['mean']:>8.2f} {result['p50']:>8.2f} {result['p99']:>8.2f} {result['total'] / 1000:>8.2f}")
+    for (client,), count in HTTP_CONNECTIONS_OPENED.collect().items():
+        print(f"   connections opened by {client}: {count:.0f}")
+
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Offline throughput of CRM pushes and mail sends against the fake Zoho server
+
+Runs fake_zoho.py in-process and drives the real ZohoCRM / ZohoMail clients
+(pooled HTTP, shared token, retries, pacing, circuit breaker) through it:
+    crm create   one create_lead call per lead
+    crm upsert   upsert_leads in 100-record calls
+    mail send    one send_email per message
+
+Usage:
+    python -m leadqual.benchmarks.zoho_throughput [--leads 1000] [--emails 500]
+        [--concurrency 20] [--latency-ms 20] [--error-rate 0.02] [--throttle-rate 0.02]
+"""
+
+import time
+import asyncio
+import argparse
+from typing import Awaitable, Callable, Dict, List
+
+from ..integrations.http import build_client
+from ..integrations.zoho_api import ZOHO_RETRIES
+from ..integrations.zoho_crm import ZohoCRM
+from ..integrations.zoho_mail import ZohoMail
+from ..integrations.zoho_token import ZohoTokenManager
+from .fake_zoho import FakeZohoOptions, start_fake_zoho
+
+
+def _lead(i: int) -> Dict:
+    return {
+        "id": str(i),
+        "email": f"lead{i}@example.com",
+        "first_name": "Bench",
+        "last_name": f"Lead {i}",
+        "company": "Example Co",
+        "score": 80,
+        "status": "qualified"
+    }
+
+
+async def _drive(calls: List[Callable[[], Awaitable[int]]], concurrency: int) -> Dict:
+    """Run calls with at most concurrency in flight; each returns items it completed"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    done = failed = 0
+
+    async def one(call):
+        nonlocal done, failed
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                completed = await call()
+            except Exception:
+                failed += 1
+            else:
+                done += completed
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(call) for call in calls))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "items": done,
+        "failed_calls": failed,
+        "seconds": elapsed,
+        "per_second": done / elapsed if elapsed else 0.0,
+        "p50": latencies[len(latencies) // 2] if latencies else 0.0,
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] if latencies else 0.0
+    }
+
+
+async def run(base_url: str, leads: int, emails: int, concurrency: int) -> Dict[str, Dict]:
+    accounts_http, crm_http, mail_http = (
+        build_client(name, max_connections=concurrency, max_keepalive=concurrency)
+        for name in ("bench_accounts", "bench_crm", "bench_mail")
+    )
+    tokens = ZohoTokenManager("id", "secret", "refresh", http=accounts_http, accounts_url=base_url)
+    crm = ZohoCRM(http=crm_http, tokens=tokens, api_url=f"{base_url}/crm/v3")
+    mail = ZohoMail(http=mail_http, tokens=tokens, api_url=f"{base_url}/api")
+    await tokens.get_token()
+    await mail.get_account_id()
+
+    async def create(i: int) -> int:
+        result = await crm.create_lead(_lead(i))
+        return sum(1 for record in result.get("data", []) if record.get("status") == "success")
+
+    async def upsert(batch: List[Dict]) -> int:
+        results = await crm.upsert_leads(batch)
+        return sum(1 for r in results if r["success"])
+
+    async def send(i: int) -> int:
+        await mail.send_email(to_address=f"lead{i}@example.com", subject="Hello", html_content="<p>Hi</p>")
+        return 1
+
+    all_leads = [_lead(i) for i in range(leads)]
+    batches = [all_leads[i:i + ZohoCRM.MAX_RECORDS_PER_CALL] for i in range(0, leads, ZohoCRM.MAX_RECORDS_PER_CALL)]
+    results = {}
+    try:
+        results["crm create"] = await _drive([lambda i=i: create(i) for i in range(leads)], concurrency)
+        results["crm upsert"] = await _drive([lambda b=b: upsert(b) for b in batches], concurrency)
+        results["mail send"] = await _drive([lambda i=i: send(i) for i in range(emails)], concurrency)
+    finally:
+        for client in (accounts_http, crm_http, mail_http):
+            await client.aclose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline Zoho CRM / Mail throughput")
+    parser.add_argument("--leads", type=int, default=1000)
+    parser.add_argument("--emails", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Fake server think time")
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 500s")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of 429s")
+    parser.add_argument("--credits", type=int, default=0, help="CRM calls per minute (0 = unlimited)")
+    args = parser.parse_args()
+
+    options = FakeZohoOptions(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=0,
+        credits=args.credits
+    )
+    base_url, fake, server = start_fake_zoho(options)
+
+    print("=" * 72)
+    print("📈 Zoho Throughput (offline, fake Zoho server)")
+    print("=" * 72)
+    print(f"   {args.leads} leads, {args.emails} emails, concurrency {args.concurrency}, "
+          f"latency {args.latency_ms:.0f}±{args.jitter_ms:.0f} ms, "
+          f"errors {args.error_rate:.0%}, 429s {args.throttle_rate:.0%}")
+
+    results = asyncio.run(run(base_url, args.leads, args.emails, args.concurrency))
+
+    print(f"\n   {'scenario':<12} {'items':>7} {'items/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'failed':>7}")
+    for name, r in results.items():
+        print(f"   {name:<12} {r['items']:>7} {r['per_second']:>9.1f} {r['p50']:>8.1f} {r['p99']:>8.1f} {r['failed_calls']:>7}")
+
+    retries = {f"{service}/{reason}": int(count) for (service, reason), count in ZOHO_RETRIES.collect().items()}
+    print(f"\n   client retries: {retries or 'none'}")
+    statuses: Dict[str, int] = {}
+    for key, count in fake.stats.items():
+        status = key.rsplit(" ", 1)[1]
+        statuses[status] = statuses.get(status, 0) + count
+    print(f"   server responses by status: {dict(sorted(statuses.items()))}")
+
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
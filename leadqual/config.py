@@ -31,6 +31,12 @@ class Config:
     # Clerk Auth
     CLERK_PUBLISHABLE_KEY = os.getenv('CLERK_PUBLISHABLE_KEY')
     CLERK_SECRET_KEY = os.getenv('CLERK_SECRET_KEY')
+    # Trusted token issuers (comma-separated); defaults to the publishable key's Frontend API
+    CLERK_ISSUERS = [i.strip().rstrip('/') for i in os.getenv('CLERK_ISSUERS', '').split(',') if i.strip()]
+    CLERK_JWKS_TTL = float(os.getenv('CLERK_JWKS_TTL', '3600'))  # then re-fetch in the background
+    CLERK_JWKS_MIN_REFRESH = float(os.getenv('CLERK_JWKS_MIN_REFRESH', '30'))  # unknown-kid refetch limit
+    CLERK_AUTHORIZED_PARTIES = [p.strip() for p in os.getenv('CLERK_AUTHORIZED_PARTIES', '').split(',') if p.strip()]
+    CLERK_TOKEN_CACHE_SIZE = int(os.getenv('CLERK_TOKEN_CACHE_SIZE', '10000'))  # verified tokens, each kept until exp
     
     # Stripe
     STRIPE_PUBLISHABLE_KEY = os.getenv('STRIPE_PUBLISHABLE_KEY')
@@ -40,11 +46,29 @@ class Config:
     # Zoho
     ZOHO_CLIENT_ID = os.getenv('ZOHO_CLIENT_ID')
     ZOHO_CLIENT_SECRET = os.getenv('ZOHO_CLIENT_SECRET')
-    ZOHO_REFRESH_TOKEN = os.getenv('ZOHO_REFRESH_TOKEN')
+    ZOHO_REFRESH_TOKEN = os.getenv('ZOHO_REFRESH_TOKEN', '').strip("'\"") or None
     ZOHO_ORG_ID = os.getenv('ZOHO_ORG_ID')
-    ZOHO_ACCOUNTS_URL = "https://accounts.zoho.com"
-    ZOHO_CRM_API_URL = "https://www.zohoapis.com/crm/v3"
-    ZOHO_MAIL_API_URL = "https://mail.zoho.com/api"
+    ZOHO_MAIL_ACCOUNT_ID = os.getenv('ZOHO_MAIL_ACCOUNT_ID')  # skips the account lookup
+    # Base URLs; override for another Zoho data center or the local fake (benchmarks/fake_zoho.py)
+    ZOHO_ACCOUNTS_URL = os.getenv('ZOHO_ACCOUNTS_URL', 'https://accounts.zoho.com')
+    ZOHO_CRM_API_URL = os.getenv('ZOHO_CRM_API_URL', 'https://www.zohoapis.com/crm/v3')
+    ZOHO_MAIL_API_URL = os.getenv('ZOHO_MAIL_API_URL', 'https://mail.zoho.com/api')
+    ZOHO_TOKEN_FILE = os.getenv('ZOHO_TOKEN_FILE', '.zoho_token.json')  # persisted access token
+    ZOHO_TOKEN_REFRESH_MARGIN = float(os.getenv('ZOHO_TOKEN_REFRESH_MARGIN', '300'))
+    
+    # Per-user Zoho clients (see leadqual/integrations/zoho_tenants.py)
+    ZOHO_TENANT_CACHE_SIZE = int(os.getenv('ZOHO_TENANT_CACHE_SIZE', '1000'))  # warm users kept in memory
+    ZOHO_TENANT_TTL = float(os.getenv('ZOHO_TENANT_TTL', '900'))  # then re-read the grant
+    ZOHO_TOKEN_FLUSH_SECONDS = float(os.getenv('ZOHO_TOKEN_FLUSH_SECONDS', '5'))
+    
+    # Zoho request layer (see leadqual/integrations/zoho_api.py)
+    ZOHO_MAX_RETRIES = int(os.getenv('ZOHO_MAX_RETRIES', '3'))
+    ZOHO_RETRY_BASE_DELAY = float(os.getenv('ZOHO_RETRY_BASE_DELAY', '0.5'))
+    ZOHO_RETRY_MAX_DELAY = float(os.getenv('ZOHO_RETRY_MAX_DELAY', '8'))  # longer Retry-After fails fast
+    ZOHO_BREAKER_FAILURES = int(os.getenv('ZOHO_BREAKER_FAILURES', '5'))
+    ZOHO_BREAKER_RESET_SECONDS = float(os.getenv('ZOHO_BREAKER_RESET_SECONDS', '30'))
+    ZOHO_CREDIT_PACE_BELOW = float(os.getenv('ZOHO_CREDIT_PACE_BELOW', '0.2'))  # fraction of credits left
+    ZOHO_PACE_MAX_WAIT = float(os.getenv('ZOHO_PACE_MAX_WAIT', '5'))
     
     # Gmail
     GOOGLE_CLIENT_ID = os.getenv('GOOGLE_CLIENT_ID')
@@ -55,12 +79,114 @@ class Config:
     APP_NAME = "LeadQual AI"
     APP_URL = os.getenv('APP_URL', 'http://localhost:3000')
     
+    # Serving (see leadqual/serve.py)
+    SERVING_MODE = os.getenv('SERVING_MODE', 'production' if ENVIRONMENT == 'production' else 'development')
+    WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', '0')) or (os.cpu_count() or 1)
+    GZIP_MIN_SIZE = int(os.getenv('GZIP_MIN_SIZE', '1024'))
+    GZIP_PATH_PREFIXES = ('/metrics', '/admin/profiles')  # list/export endpoints
+    
+    # Pooled HTTP clients for integrations (see leadqual/integrations/http.py)
+    HTTP2_ENABLED = os.getenv('HTTP2_ENABLED', 'false').lower() == 'true'  # needs the h2 package
+    HTTP_MAX_CONNECTIONS = int(os.getenv('HTTP_MAX_CONNECTIONS', '20'))
+    HTTP_MAX_KEEPALIVE = int(os.getenv('HTTP_MAX_KEEPALIVE', '10'))
+    HTTP_KEEPALIVE_EXPIRY = float(os.getenv('HTTP_KEEPALIVE_EXPIRY', '30'))
+    HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '5'))
+    HTTP_TIMEOUTS = {  # read timeouts in seconds, by operation
+        'default': 20.0,
+        'token_refresh': 10.0,
+        'get_account_id': 10.0,
+        'send_email': 30.0,
+        'crm_read': 15.0,
+        'crm_write': 30.0
+    }
+    
+    # Startup warm-up (see leadqual/warmup.py)
+    WARMUP_ENABLED = os.getenv('WARMUP_ENABLED', 'true').lower() == 'true'
+    WARMUP_CONCURRENCY = int(os.getenv('WARMUP_CONCURRENCY', '4'))
+    WARMUP_STEP_TIMEOUT = float(os.getenv('WARMUP_STEP_TIMEOUT', '10'))
+    WARMUP_TIMEOUT_SECONDS = float(os.getenv('WARMUP_TIMEOUT_SECONDS', '20'))  # then serve, not ready
+    DB_POOL_MIN = int(os.getenv('DB_POOL_MIN', '1'))
+    DB_POOL_MAX = int(os.getenv('DB_POOL_MAX', '10'))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))  # seconds to wait for a free connection
+    DB_POOL_PING_AFTER = float(os.getenv('DB_POOL_PING_AFTER', '60'))  # idle seconds before a liveness check
+    
+    # Per-user rate limiting (see leadqual/ratelimit.py)
+    RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    RATE_LIMIT_BACKEND = os.getenv('RATE_LIMIT_BACKEND', 'memory')  # memory, postgres
+    RATE_LIMIT_WINDOW_SECONDS = float(os.getenv('RATE_LIMIT_WINDOW_SECONDS', '60'))
+    RATE_LIMIT_MAX_KEYS = int(os.getenv('RATE_LIMIT_MAX_KEYS', '100000'))
+    RATE_LIMIT_TIER_TTL = float(os.getenv('RATE_LIMIT_TIER_TTL', '300'))
+    RATE_LIMIT_DEFAULT_TIER = os.getenv('RATE_LIMIT_DEFAULT_TIER', 'free')
+    
+    # Inbound reply webhook (see leadqual/inbound)
+    INBOUND_WEBHOOK_SECRET = os.getenv('INBOUND_WEBHOOK_SECRET')  # per-user tokens are derived from it
+    INBOUND_MAX_BYTES = int(os.getenv('INBOUND_MAX_BYTES', str(1024 * 1024)))
+    INBOUND_WORKERS = int(os.getenv('INBOUND_WORKERS', '4'))
+    INBOUND_SCORES_PER_SECOND = float(os.getenv('INBOUND_SCORES_PER_SECOND', '5'))
+    INBOUND_QUEUE_MAX = int(os.getenv('INBOUND_QUEUE_MAX', '10000'))
+    
+    # Outbound email queue (see leadqual/outbound/queue.py)
+    EMAIL_WORKERS = int(os.getenv('EMAIL_WORKERS', '4'))  # 0: only enqueue, another process sends
+    EMAIL_CLAIM_BATCH = int(os.getenv('EMAIL_CLAIM_BATCH', '5'))
+    EMAIL_POLL_INTERVAL = float(os.getenv('EMAIL_POLL_INTERVAL', '2'))
+    EMAIL_LEASE_SECONDS = float(os.getenv('EMAIL_LEASE_SECONDS', '120'))
+    EMAIL_MAX_ATTEMPTS = int(os.getenv('EMAIL_MAX_ATTEMPTS', '6'))
+    EMAIL_RETRY_BASE_SECONDS = float(os.getenv('EMAIL_RETRY_BASE_SECONDS', '30'))
+    EMAIL_RETRY_MAX_SECONDS = float(os.getenv('EMAIL_RETRY_MAX_SECONDS', '3600'))
+    EMAIL_SENDER_RATE = float(os.getenv('EMAIL_SENDER_RATE', '1'))  # sends per second per sender
+    EMAIL_DOMAIN_RATE = float(os.getenv('EMAIL_DOMAIN_RATE', '5'))  # sends per second per recipient domain
+    
+    # Background CRM sync (see leadqual/crm_sync.py)
+    CRM_SYNC_ENABLED = os.getenv('CRM_SYNC_ENABLED', 'false').lower() == 'true'
+    CRM_SYNC_INTERVAL = float(os.getenv('CRM_SYNC_INTERVAL', '60'))
+    CRM_SYNC_CONCURRENCY = int(os.getenv('CRM_SYNC_CONCURRENCY', '4'))
+    CRM_SYNC_BATCH_SIZE = int(os.getenv('CRM_SYNC_BATCH_SIZE', '100'))
+    # updated_at is the writer's transaction start, so a row can commit after a
+    # later-stamped one; the sync only reads rows older than this
+    CRM_SYNC_SAFETY_LAG = float(os.getenv('CRM_SYNC_SAFETY_LAG', '30'))
+    
+    # Tracing
+    TRACE_SAMPLE_RATE = float(os.getenv('TRACE_SAMPLE_RATE', '0.1'))
+    # Only these socket peers may continue a trace (and its sampling decision) via
+    # traceparent. Checked before X-Forwarded-For is applied, so it needs the
+    # leadqual.asgi entry point (python -m leadqual.serve); serving leadqual.api:app
+    # directly never continues inbound traces
+    TRACE_TRUSTED_PROXIES = {ip.strip() for ip in os.getenv('TRACE_TRUSTED_PROXIES', '').split(',') if ip.strip()}
+    TRACE_EXPORTER = os.getenv('TRACE_EXPORTER', 'file')  # file, otlp, none
+    TRACE_FILE = os.getenv('TRACE_FILE', 'traces.jsonl')
+    FORWARDED_ALLOW_IPS = os.getenv('FORWARDED_ALLOW_IPS', '127.0.0.1')  # proxies whose X-Forwarded-For is applied
+    OTLP_ENDPOINT = os.getenv('OTLP_ENDPOINT', 'http://localhost:4318/v1/traces')
+    
+    # Profiling (disabled unless an admin token or sample rate is set)
+    PROFILER_ADMIN_TOKEN = os.getenv('PROFILER_ADMIN_TOKEN')
+    PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', '0'))
+    PROFILE_INTERVAL_MS = float(os.getenv('PROFILE_INTERVAL_MS', '5'))
+    PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles')
+    PROFILE_MAX_FILES = int(os.getenv('PROFILE_MAX_FILES', '50'))
+    
+    # Event-loop watchdog
+    LOOP_MONITOR_ENABLED = os.getenv('LOOP_MONITOR_ENABLED', 'true').lower() == 'true'
+    LOOP_LAG_INTERVAL_MS = float(os.getenv('LOOP_LAG_INTERVAL_MS', '100'))
+    LOOP_BLOCK_THRESHOLD_MS = float(os.getenv('LOOP_BLOCK_THRESHOLD_MS', '100'))
+    LOOP_BLOCK_FAIL_MS = float(os.getenv('LOOP_BLOCK_FAIL_MS', '0')) or None  # test mode
+    
+    # Batch endpoints
+    BATCH_CONCURRENCY = int(os.getenv('BATCH_CONCURRENCY', '8'))
+    BATCH_MAX_ITEMS = int(os.getenv('BATCH_MAX_ITEMS', '5000'))
+    
+    # Idempotency keys (send-email, push-to-crm)
+    IDEMPOTENCY_TTL_SECONDS = int(os.getenv('IDEMPOTENCY_TTL_SECONDS', '86400'))
+    IDEMPOTENCY_MEMORY_MAX = int(os.getenv('IDEMPOTENCY_MEMORY_MAX', '10000'))
+    IDEMPOTENCY_WAIT_SECONDS = float(os.getenv('IDEMPOTENCY_WAIT_SECONDS', '30'))
+    # How often each worker deletes expired rows from Postgres-backed stores
+    PURGE_INTERVAL_SECONDS = float(os.getenv('PURGE_INTERVAL_SECONDS', '3600'))
+    
     # Subscription Tiers
     TIERS = {
-        'free': {'leads_limit': 25, 'price': 0},
-        'starter': {'leads_limit': 200, 'price': 49},
-        'pro': {'leads_limit': 1000, 'price': 149},
-        'agency': {'leads_limit': 5000, 'price': 299}
+        'free': {'leads_limit': 25, 'price': 0, 'requests_per_minute': 30},
+        'starter': {'leads_limit': 200, 'price': 49, 'requests_per_minute': 120},
+        'pro': {'leads_limit': 1000, 'price': 149, 'requests_per_minute': 600},
+        'agency': {'leads_limit': 5000, 'price': 299, 'requests_per_minute': 1500}
     }
     
     @classmethod
@@ -78,6 +204,11 @@ class Config:
     def get_tier_limit(cls, tier: str) -> int:
         """Get leads limit for a subscription tier"""
         return cls.TIERS.get(tier, cls.TIERS['free'])['leads_limit']
+    
+    @classmethod
+    def get_tier_rate_limit(cls, tier: str) -> int:
+        """Get API requests allowed per rate-limit window for a subscription tier"""
+        return cls.TIERS.get(tier, cls.TIERS['free'])['requests_per_minute']
 
 
 # Validate on import
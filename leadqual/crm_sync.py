@@ -0,0 +1,254 @@
+"""
+Incremental sync of qualified leads to Zoho CRM
+
+Each user has a committed (updated_at, id) high-water mark in sync_watermarks.
+A cycle pushes only leads past it, in batches, and commits the watermark after
+each batch is written back - so a crashed run resumes where it stopped and at
+worst re-upserts one batch. Leads changed in the last CRM_SYNC_SAFETY_LAG seconds
+wait for the next cycle, so a transaction that commits late cannot land behind
+the watermark.
+
+Usage:
+    python -m leadqual.crm_sync            # run forever every CRM_SYNC_INTERVAL seconds
+    python -m leadqual.crm_sync --once     # one cycle, then exit
+
+Or in-process: set CRM_SYNC_ENABLED=true and the API lifespan runs it.
+"""
+
+import time
+import asyncio
+import argparse
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List
+
+from starlette.concurrency import run_in_threadpool
+
+from .config import Config
+from .integrations.zoho_crm import ZohoCRM
+from .integrations.zoho_tenants import ZohoNotConnected
+from .monitoring.metrics import Counter, Gauge
+
+TARGET = "zoho_crm"
+LEADER_LOCK = "leadqual_crm_sync"
+
+CRM_SYNC_LAG = Gauge(
+    "leadqual_crm_sync_lag_seconds",
+    "Age of the oldest qualified-lead change not yet pushed to the CRM (0 when caught up)"
+)
+
+CRM_SYNC_PENDING = Gauge(
+    "leadqual_crm_sync_pending_leads",
+    "Qualified leads past their user's sync watermark at the start of a cycle"
+)
+
+CRM_SYNC_LEADS = Counter(
+    "leadqual_crm_sync_leads_total",
+    "Leads processed by the CRM sync",
+    ("outcome",)  # pushed, rejected, deferred
+)
+
+
+class CRMSyncEngine:
+    """Push changed qualified leads per user, several users at a time"""
+
+    def __init__(
+        self,
+        crm_for_user: Callable[[str], Awaitable[ZohoCRM]],
+        concurrency: int = 4,
+        batch_size: int = 100,
+        safety_lag: float = Config.CRM_SYNC_SAFETY_LAG
+    ):
+        self.crm_for_user = crm_for_user
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.safety_lag = safety_lag
+        self._leader = None  # connection holding the advisory lock
+
+    async def sync_user(self, user_id: str) -> int:
+        """Push everything past the user's watermark; returns leads pushed"""
+        from .database.models import LeadRepository, SyncWatermarkRepository
+
+        watermark = await run_in_threadpool(SyncWatermarkRepository.get, user_id, TARGET)
+        after_updated_at = watermark["last_updated_at"] if watermark else None
+        after_id = watermark["last_lead_id"] if watermark else None
+        crm = await self.crm_for_user(user_id)
+        pushed = 0
+
+        while True:
+            batch = await run_in_threadpool(
+                LeadRepository.get_changed_since,
+                user_id, after_updated_at, after_id, self.batch_size, self.safety_lag
+            )
+            if not batch:
+                return pushed
+
+            results = {r["lead_id"]: r for r in await crm.upsert_leads([lead.to_dict() for lead in batch])}
+            synced, done = [], 0
+            for lead in batch:
+                result = results.get(lead.id)
+                if result is None or result["retryable"]:
+                    # Transient failure: stop here so the watermark does not pass this lead
+                    break
+                if result["success"]:
+                    synced.append((lead.id, result["zoho_lead_id"], lead.updated_at))
+                else:
+                    CRM_SYNC_LEADS.inc(outcome="rejected")
+                    print(f"⚠️ Zoho rejected lead {lead.id}: {result['error']}")
+                done += 1
+
+            await run_in_threadpool(LeadRepository.bulk_update_zoho_sync, synced)
+            CRM_SYNC_LEADS.inc(len(synced), outcome="pushed")
+            pushed += len(synced)
+
+            if done:
+                last = batch[done - 1]
+                after_updated_at, after_id = last.updated_at, last.id
+                await run_in_threadpool(SyncWatermarkRepository.save, user_id, TARGET, after_updated_at, after_id)
+            if done < len(batch):
+                CRM_SYNC_LEADS.inc(len(batch) - done, outcome="deferred")
+                return pushed
+            if len(batch) < self.batch_size:
+                return pushed
+
+    async def run_once(self) -> Dict:
+        """One cycle over every user with pending changes"""
+        from .database.models import SyncWatermarkRepository
+
+        start = time.perf_counter()
+        pending = await run_in_threadpool(SyncWatermarkRepository.pending_users, TARGET)
+        now = datetime.now(timezone.utc)
+        oldest = min((row["oldest_unsynced"] for row in pending), default=None)
+        CRM_SYNC_LAG.set((now - oldest).total_seconds() if oldest else 0.0)
+        CRM_SYNC_PENDING.set(sum(row["pending"] for row in pending))
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        pushed: Dict[str, int] = {}
+        failed: Dict[str, str] = {}
+        skipped: List[str] = []
+
+        async def run_user(user_id: str):
+            async with semaphore:
+                try:
+                    pushed[user_id] = await self.sync_user(user_id)
+                except ZohoNotConnected:
+                    skipped.append(user_id)
+                except Exception as e:
+                    failed[user_id] = str(e)
+                    print(f"❌ CRM sync failed for user {user_id}: {e}")
+
+        await asyncio.gather(*(run_user(str(row["user_id"])) for row in pending))
+        return {
+            "users": len(pending),
+            "pushed": sum(pushed.values()),
+            "failed_users": failed,
+            "not_connected": len(skipped),
+            "seconds": round(time.perf_counter() - start, 3)
+        }
+
+    async def run_forever(self, interval: float):
+        """Run a cycle every interval seconds while this process holds the leader lock"""
+        try:
+            while True:
+                try:
+                    if await run_in_threadpool(self._acquire_leader):
+                        await self.run_once()
+                except Exception as e:
+                    print(f"❌ CRM sync cycle failed: {e}")
+                    await run_in_threadpool(self._release_leader)
+                await asyncio.sleep(interval)
+        finally:
+            await run_in_threadpool(self._release_leader)
+
+    def _acquire_leader(self) -> bool:
+        """Only one process (API worker or CLI) syncs at a time, via a session advisory lock"""
+        from .database.connection import get_connection
+
+        if self._leader is not None:
+            # A dropped session has released the lock even if psycopg2 has not noticed yet
+            try:
+                with self._leader.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                return True
+            except Exception as e:
+                print(f"⚠️ CRM sync leader connection lost: {e}")
+                self._release_leader()
+        conn = get_connection()
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT pg_try_advisory_lock(hashtext(%s))", (LEADER_LOCK,))
+            acquired = cursor.fetchone()[0]
+        if acquired:
+            self._leader = conn
+        else:
+            conn.close()
+        return acquired
+
+    def _release_leader(self):
+        if self._leader is not None:
+            if not self._leader.closed:
+                try:
+                    self._leader.close()  # ends the session, releasing the lock
+                except Exception:
+                    pass
+            self._leader = None
+
+
+async def _run_cli(once: bool, interval: float):
+    from .integrations.http import build_client
+    from .integrations.zoho_mail import ZohoMail
+    from .integrations.zoho_tenants import ZohoClientRegistry, ZohoTenant
+    from .integrations.zoho_token import ZohoTokenManager, FileTokenStore
+
+    http_clients = {name: build_client(name) for name in ("zoho_accounts", "zoho_crm", "zoho_mail")}
+    fallback = None
+    if Config.ZOHO_REFRESH_TOKEN:
+        tokens = ZohoTokenManager.from_env(
+            http=http_clients["zoho_accounts"],
+            store=FileTokenStore(Config.ZOHO_TOKEN_FILE),
+            refresh_margin=Config.ZOHO_TOKEN_REFRESH_MARGIN
+        )
+        fallback = ZohoTenant(
+            tokens,
+            ZohoCRM(http=http_clients["zoho_crm"], tokens=tokens),
+            ZohoMail(http=http_clients["zoho_mail"], tokens=tokens),
+            loaded_at=0.0
+        )
+    registry = ZohoClientRegistry(
+        http_clients,
+        max_tenants=Config.ZOHO_TENANT_CACHE_SIZE,
+        ttl=Config.ZOHO_TENANT_TTL,
+        flush_interval=Config.ZOHO_TOKEN_FLUSH_SECONDS,
+        fallback=fallback
+    )
+    registry.start()
+
+    engine = CRMSyncEngine(registry.crm, Config.CRM_SYNC_CONCURRENCY, Config.CRM_SYNC_BATCH_SIZE)
+    try:
+        if once:
+            if not await run_in_threadpool(engine._acquire_leader):
+                print("⏭️ Another CRM sync is running")
+                return
+            print(f"✅ CRM sync: {await engine.run_once()}")
+        else:
+            print(f"🔄 CRM sync every {interval:.0f}s (Ctrl+C to stop)")
+            await engine.run_forever(interval)
+    finally:
+        await run_in_threadpool(engine._release_leader)
+        await registry.close()
+        for client in http_clients.values():
+            await client.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync qualified leads to Zoho CRM")
+    parser.add_argument("--once", action="store_true", help="Run one cycle and exit")
+    parser.add_argument("--interval", type=float, default=Config.CRM_SYNC_INTERVAL)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_run_cli(args.once, args.interval))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,8 @@
 from .connection import (
     get_connection,
     get_cursor,
+    init_pool,
+    close_pool,
     execute_query,
     execute_one,
     execute_insert,
@@ -13,6 +15,8 @@ from .connection import (
 __all__ = [
     'get_connection',
     'get_cursor', 
+    'init_pool',
+    'close_pool',
     'execute_query',
     'execute_one',
     'execute_insert',
@@ -3,34 +3,107 @@ Database connection utilities for LeadQual AI
 Uses Neon PostgreSQL with psycopg2
 """
 
-import os
+import time
+import threading
 import psycopg2
+from psycopg2.pool import PoolError, ThreadedConnectionPool
 from psycopg2.extras import RealDictCursor
-from contextlib import contextmanager
-from dotenv import load_dotenv
 from pathlib import Path
+from typing import Dict, Optional
+from contextlib import contextmanager
+
+from ..config import Config
+from ..monitoring.tracing import span
 
-# Load environment variables from parent directory
-env_path = Path(__file__).parent.parent.parent / '.env'
-load_dotenv(env_path)
 
-DATABASE_URL = os.getenv('NEON_DATABASE_URL')
+# Opened by the API lifespan; scripts without a pool connect per call
+_pool: Optional[ThreadedConnectionPool] = None
+# ThreadedConnectionPool raises PoolError when empty; callers wait on this instead
+_pool_slots: Optional[threading.BoundedSemaphore] = None
+# When each pooled connection was last returned, keyed by id()
+_idle_since: Dict[int, float] = {}
 
-if not DATABASE_URL:
-    raise ValueError("NEON_DATABASE_URL not found in environment variables")
+
+def _database_url() -> str:
+    # Checked on first connect, not at import, so importing never needs a database
+    if not Config.DATABASE_URL:
+        raise ValueError("NEON_DATABASE_URL not found in environment variables")
+    return Config.DATABASE_URL
 
 
 def get_connection():
     """Create a new database connection"""
-    # Remove quotes if present
-    db_url = DATABASE_URL.strip("'\"")
-    return psycopg2.connect(db_url)
+    return psycopg2.connect(_database_url())
+
+
+def init_pool(minconn: int = 1, maxconn: int = 10) -> ThreadedConnectionPool:
+    """Open the shared connection pool (minconn connections are made up front)"""
+    global _pool, _pool_slots
+    if _pool is None:
+        _pool = ThreadedConnectionPool(minconn, maxconn, _database_url())
+        _pool_slots = threading.BoundedSemaphore(maxconn)
+    return _pool
+
+
+def close_pool():
+    """Close every pooled connection"""
+    global _pool, _pool_slots
+    if _pool is not None:
+        _pool.closeall()
+        _pool = None
+        _pool_slots = None
+        _idle_since.clear()
+
+
+def _alive(conn) -> bool:
+    """Cheap check for connections the server dropped while they sat idle (Neon does)"""
+    if conn.closed:
+        return False
+    if time.monotonic() - _idle_since.get(id(conn), 0.0) < Config.DB_POOL_PING_AFTER:
+        return True
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        conn.rollback()
+        return True
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        return False
+
+
+def _checkout(pool: ThreadedConnectionPool, slots: threading.BoundedSemaphore):
+    """Wait for a free slot, then take a live connection from the pool"""
+    if not slots.acquire(timeout=Config.DB_POOL_TIMEOUT):
+        raise PoolError(f"no database connection free after {Config.DB_POOL_TIMEOUT:.0f}s")
+    try:
+        conn = pool.getconn()
+        if not _alive(conn):
+            _idle_since.pop(id(conn), None)
+            pool.putconn(conn, close=True)
+            conn = pool.getconn()
+        return conn
+    except BaseException:
+        slots.release()
+        raise
+
+
+def _checkin(pool: ThreadedConnectionPool, slots: threading.BoundedSemaphore, conn):
+    try:
+        pool.putconn(conn, close=conn.closed != 0)
+        # The pool closes connections beyond minconn rather than keeping them
+        if conn.closed:
+            _idle_since.pop(id(conn), None)
+        else:
+            _idle_since[id(conn)] = time.monotonic()
+    finally:
+        slots.release()
 
 
 @contextmanager
 def get_cursor(dict_cursor=True):
     """Context manager for database cursor"""
-    conn = get_connection()
+    pool, slots = _pool, _pool_slots
+    conn = _checkout(pool, slots) if pool is not None else get_connection()
+    cursor = None
     try:
         cursor_factory = RealDictCursor if dict_cursor else None
         cursor = conn.cursor(cursor_factory=cursor_factory)
@@ -40,13 +113,17 @@ def get_cursor(dict_cursor=True):
         conn.rollback()
         raise e
     finally:
-        cursor.close()
-        conn.close()
+        if cursor is not None:
+            cursor.close()
+        if pool is not None:
+            _checkin(pool, slots, conn)
+        else:
+            conn.close()
 
 
 def execute_query(query: str, params: tuple = None, fetch: bool = True):
     """Execute a query and optionally fetch results"""
-    with get_cursor() as cursor:
+    with span("db", op="query"), get_cursor() as cursor:
         cursor.execute(query, params)
         if fetch:
             return cursor.fetchall()
@@ -55,14 +132,14 @@ def execute_query(query: str, params: tuple = None, fetch: bool = True):
 
 def execute_one(query: str, params: tuple = None):
     """Execute a query and fetch one result"""
-    with get_cursor() as cursor:
+    with span("db", op="one"), get_cursor() as cursor:
         cursor.execute(query, params)
         return cursor.fetchone()
 
 
 def execute_insert(query: str, params: tuple = None):
     """Execute an insert and return the new row"""
-    with get_cursor() as cursor:
+    with span("db", op="insert"), get_cursor() as cursor:
         cursor.execute(query, params)
         return cursor.fetchone()
 
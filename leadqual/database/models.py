@@ -2,10 +2,12 @@
 Database models and CRUD operations for LeadQual AI
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Tuple
 from datetime import datetime
 from dataclasses import dataclass, field, asdict
-from .connection import execute_query, execute_one, execute_insert
+from psycopg2.extras import execute_values
+from .connection import execute_query, execute_one, execute_insert, get_cursor
+from ..monitoring.metrics import DB_QUERY_DURATION, timed
 
 
 @dataclass
@@ -49,6 +51,7 @@ class LeadRepository:
     """CRUD operations for leads"""
     
     @staticmethod
+    @timed(DB_QUERY_DURATION, method="create")
     def create(lead: Lead) -> Lead:
         """Create a new lead"""
         query = """
@@ -66,6 +69,7 @@ class LeadRepository:
         return Lead(**result) if result else None
     
     @staticmethod
+    @timed(DB_QUERY_DURATION, method="get_by_id")
     def get_by_id(lead_id: str) -> Optional[Lead]:
         """Get lead by ID"""
         query = "SELECT * FROM leads WHERE id = %s"
@@ -73,6 +77,7 @@ class LeadRepository:
         return Lead(**result) if result else None
     
     @staticmethod
+    @timed(DB_QUERY_DURATION, method="get_by_email")
     def get_by_email(user_id: str, email: str) -> Optional[Lead]:
         """Get lead by email for a user"""
         query = "SELECT * FROM leads WHERE user_id = %s AND email = %s"
@@ -80,6 +85,7 @@ class LeadRepository:
         return Lead(**result) if result else None
     
     @staticmethod
+    @timed(DB_QUERY_DURATION, method="get_by_user")
     def get_by_user(user_id: str, status: str = None, limit: int = 100) -> List[Lead]:
         """Get leads for a user"""
         if status:
@@ -91,6 +97,7 @@ class LeadRepository:
         return [Lead(**r) for r in results]
     
     @staticmethod
+    @timed(DB_QUERY_DURATION, method="update")
     def update(lead_id: str, **updates) -> Optional[Lead]:
         """Update a lead"""
         if not updates:
@@ -115,6 +122,7 @@ class LeadRepository:
         return Lead(**result) if result else None
     
     @staticmethod
+    @timed(DB_QUERY_DURATION, method="update_score")
     def update_score(lead_id: str, score: int, status: str = None) -> Optional[Lead]:
         """Update lead score and optionally status"""
         updates = {'score': score}
@@ -125,6 +133,7 @@ class LeadRepository:
         return LeadRepository.update(lead_id, **updates)
     
     @staticmethod
+    @timed(DB_QUERY_DURATION, method="update_zoho_sync")
     def update_zoho_sync(lead_id: str, zoho_lead_id: str) -> Optional[Lead]:
         """Update Zoho sync info"""
         query = """
@@ -135,6 +144,7 @@ class LeadRepository:
         return Lead(**result) if result else None
     
     @staticmethod
+    @timed(DB_QUERY_DURATION, method="count_by_user")
     def count_by_user(user_id: str, since: datetime = None) -> int:
         """Count leads for a user"""
         if since:
@@ -144,4 +154,438 @@ class LeadRepository:
             query = "SELECT COUNT(*) as count FROM leads WHERE user_id = %s"
             result = execute_one(query, (user_id,))
         return result['count'] if result else 0
+    
+    @staticmethod
+    @timed(DB_QUERY_DURATION, method="get_unsynced_qualified")
+    def get_unsynced_qualified(user_id: str = None, after_id: str = None, limit: int = 100) -> List[Lead]:
+        """
+        Qualified leads changed since their last Zoho sync, in id order.
+        Pass the last id of the previous batch as after_id (keyset pagination).
+        """
+        query = """
+            SELECT * FROM leads
+            WHERE status = 'qualified'
+              AND (zoho_synced_at IS NULL OR updated_at > zoho_synced_at)
+              AND (%(user_id)s::uuid IS NULL OR user_id = %(user_id)s::uuid)
+              AND (%(after_id)s::uuid IS NULL OR id > %(after_id)s::uuid)
+            ORDER BY id
+            LIMIT %(limit)s
+        """
+        results = execute_query(query, {"user_id": user_id, "after_id": after_id, "limit": limit})
+        return [Lead(**r) for r in results]
+    
+    @staticmethod
+    def iter_unsynced_qualified(user_id: str = None, batch_size: int = 100) -> Iterator[List[Lead]]:
+        """Yield batches of unsynced qualified leads until none are left"""
+        after_id = None
+        while True:
+            batch = LeadRepository.get_unsynced_qualified(user_id, after_id, batch_size)
+            if not batch:
+                return
+            yield batch
+            if len(batch) < batch_size:
+                return
+            after_id = batch[-1].id
+    
+    @staticmethod
+    @timed(DB_QUERY_DURATION, method="get_changed_since")
+    def get_changed_since(
+        user_id: str,
+        after_updated_at: Optional[datetime] = None,
+        after_id: Optional[str] = None,
+        limit: int = 100,
+        safety_lag: float = 0.0
+    ) -> List[Lead]:
+        """
+        Qualified leads of a user updated after the (updated_at, id) watermark, oldest first.
+        Rows stamped within the last safety_lag seconds are left for a later call: updated_at
+        is set at transaction start, so an older stamp can still commit after a newer one.
+        """
+        query = """
+            SELECT * FROM leads
+            WHERE user_id = %(user_id)s AND status = 'qualified'
+              AND updated_at < NOW() - make_interval(secs => %(safety_lag)s)
+              AND (%(after_updated_at)s::timestamptz IS NULL
+                   OR (updated_at, id) > (%(after_updated_at)s::timestamptz, %(after_id)s::uuid))
+            ORDER BY updated_at, id
+            LIMIT %(limit)s
+        """
+        results = execute_query(query, {
+            "user_id": user_id, "after_updated_at": after_updated_at, "after_id": after_id,
+            "limit": limit, "safety_lag": safety_lag
+        })
+        return [Lead(**r) for r in results]
+    
+    @staticmethod
+    @timed(DB_QUERY_DURATION, method="bulk_update_zoho_sync")
+    def bulk_update_zoho_sync(synced: List[Tuple[str, str, Optional[datetime]]]) -> int:
+        """
+        Record Zoho ids for many leads in one statement. Each item is
+        (lead_id, zoho_lead_id, updated_at as read before the push); that value
+        becomes zoho_synced_at, so an edit made during the push stays unsynced.
+        updated_at itself is left alone.
+        """
+        if not synced:
+            return 0
+        query = """
+            UPDATE leads SET zoho_lead_id = v.zoho_lead_id,
+                zoho_synced_at = COALESCE(v.seen_updated_at, NOW())
+            FROM (VALUES %s) AS v(id, zoho_lead_id, seen_updated_at)
+            WHERE leads.id = v.id::uuid
+        """
+        with get_cursor(dict_cursor=False) as cursor:
+            execute_values(cursor, query, synced, template="(%s, %s, %s::timestamptz)")
+            return cursor.rowcount
+
+
+
+class IdempotencyRepository:
+    """Stored responses for Idempotency-Key requests"""
+    
+    @staticmethod
+    @timed(DB_QUERY_DURATION, method="idempotency_claim")
+    def claim(user_id: str, key: str, fingerprint: str, lease_seconds: float) -> bool:
+        """Take ownership of a key; an expired row (or stale lease) can be reclaimed"""
+        query = """
+            INSERT INTO idempotency_keys (user_id, idempotency_key, fingerprint, status, expires_at)
+            VALUES (%s, %s, %s, 'in_progress', NOW() + make_interval(secs => %s))
+            ON CONFLICT (user_id, idempotency_key) DO UPDATE
+                SET fingerprint = EXCLUDED.fingerprint, status = 'in_progress',
+                    response = NULL, created_at = NOW(), expires_at = EXCLUDED.expires_at
+                WHERE idempotency_keys.expires_at < NOW()
+            RETURNING idempotency_key
+        """
+        return execute_insert(query, (user_id, key, fingerprint, lease_seconds)) is not None
+    
+    @staticmethod
+    @timed(DB_QUERY_DURATION, method="idempotency_get")
+    def get(user_id: str, key: str) -> Optional[Dict]:
+        """Get an unexpired key"""
+        query = """
+            SELECT fingerprint, status, response FROM idempotency_keys
+            WHERE user_id = %s AND idempotency_key = %s AND expires_at >= NOW()
+        """
+        return execute_one(query, (user_id, key))
+    
+    @staticmethod
+    @timed(DB_QUERY_DURATION, method="idempotency_complete")
+    def complete(user_id: str, key: str, response: Dict, ttl_seconds: float):
+        """Store the response for replay"""
+        import json
+        query = """
+            UPDATE idempotency_keys
+            SET status = 'completed', response = %s, expires_at = NOW() + make_interval(secs => %s)
+            WHERE user_id = %s AND idempotency_key = %s
+        """
+        execute_query(query, (json.dumps(response, default=str), ttl_seconds, user_id, key), fetch=False)
+    
+    @staticmethod
+    @timed(DB_QUERY_DURATION, method="idempotency_release")
+    def release(user_id: str, key: str):
+        """Drop an in-progress claim after a failed call so the client can retry"""
+        query = """
+            DELETE FROM idempotency_keys
+            WHERE user_id = %s AND idempotency_key = %s AND status = 'in_progress'
+        """
+        execute_query(query, (user_id, key), fetch=False)
+    
+    @staticmethod
+    @timed(DB_QUERY_DURATION, method="idempotency_purge")
+    def purge_expired() -> None:
+        """Delete expired keys"""
+        execute_query("DELETE FROM idempotency_keys WHERE expires_at < NOW()", fetch=False)
+
+
+class InteractionRepository:
+    """Lead interaction history"""
+    
+    @staticmethod
+    @timed(DB_QUERY_DURATION, method="interaction_record_reply")
+    def record_reply(lead_id: str, message_id: str, details: Dict) -> Optional[str]:
+        """Record a lead reply once per Message-ID; returns None if already recorded"""
+        import json
+        query = """
+            INSERT INTO interactions (lead_id, interaction_type, details)
+            VALUES (%s, 'lead_response', %s)
+            ON CONFLICT DO NOTHING
+            RETURNING id
+        """
+        result = execute_insert(query, (lead_id, json.dumps({**details, "message_id": message_id})))
+        return result['id'] if result else None
+    
+    @staticmethod
+    @timed(DB_QUERY_DURATION, method="interaction_delete")
+    def delete(interaction_id: str):
+        """Delete an interaction"""
+        execute_query("DELETE FROM interactions WHERE id = %s", (interaction_id,), fetch=False)
+
 
+class EmailLogRepository:
+    """email_logs rows, used as the durable outbound email queue"""
+    
+    @staticmethod
+    @timed(DB_QUERY_DURATION, method="email_enqueue")
+    def enqueue(
+        user_id: str,
+        to_email: str,
+        subject: str,
+        body: str,
+        from_address: Optional[str] = None,
+        cc: Optional[List[str]] = None,
+        bcc: Optional[List[str]] = None,
+        email_type: str = "manual",
+        lead_id: Optional[str] = None,
+        provider: str = "zoho_mail"
+    ) -> Dict:
+        """Insert a pending email for a users.id (not a Clerk id); returns id, status and created_at"""
+        query = """
+            INSERT INTO email_logs (user_id, lead_id, provider, email_type, to_email,
+                from_address, cc, bcc, subject, body, status, next_attempt_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 'pending', NOW())
+            RETURNING id, status, created_at
+        """
+        return execute_insert(query, (
+            user_id, lead_id, provider, email_type, to_email,
+            from_address, cc, bcc, subject, body
+        ))
+    
+    @staticmethod
+    @timed(DB_QUERY_DURATION, method="email_get")
+    def get(email_id: str, clerk_user_id: str) -> Optional[Dict]:
+        """Delivery status of one of the user's emails"""
+        query = """
+            SELECT e.id, e.to_email, e.subject, e.status, e.attempts, e.provider_message_id,
+                e.error_message, e.next_attempt_at, e.sent_at, e.created_at
+            FROM email_logs e JOIN users u ON u.id = e.user_id
+            WHERE e.id = %s AND u.clerk_user_id = %s
+        """
+        return execute_one(query, (email_id, clerk_user_id))
+    
+    @staticmethod
+    @timed(DB_QUERY_DURATION, method="email_claim")
+    def claim(limit: int, lease_seconds: float) -> List[Dict]:
+        """
+        Lease up to limit due emails to this worker (SKIP LOCKED, so workers
+        never wait on each other). Emails whose worker died are due again
+        once their lease runs out.
+        """
+        query = """
+            UPDATE email_logs e
+            SET status = 'sending', attempts = e.attempts + 1,
+                locked_until = NOW() + make_interval(secs => %s)
+            FROM (
+                SELECT id FROM email_logs
+                WHERE (status = 'pending' AND next_attempt_at <= NOW())
+                   OR (status = 'sending' AND locked_until < NOW())
+                ORDER BY next_attempt_at
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            ) due
+            WHERE e.id = due.id
+            RETURNING e.id, e.user_id, e.to_email, e.from_address, e.cc, e.bcc,
+                e.subject, e.body, e.attempts, e.created_at
+        """
+        return execute_query(query, (lease_seconds, limit))
+    
+    @staticmethod
+    @timed(DB_QUERY_DURATION, method="email_mark_sent")
+    def mark_sent(email_id: str, provider_message_id: Optional[str]):
+        query = """
+            UPDATE email_logs
+            SET status = 'sent', provider_message_id = %s, sent_at = NOW(),
+                error_message = NULL, locked_until = NULL
+            WHERE id = %s AND status = 'sending'
+        """
+        execute_query(query, (provider_message_id, email_id), fetch=False)
+    
+    @staticmethod
+    @timed(DB_QUERY_DURATION, method="email_mark_retry")
+    def mark_retry(email_id: str, error_message: Optional[str], delay_seconds: float, count_attempt: bool = True):
+        """Put an email back in the queue after delay_seconds"""
+        query = """
+            UPDATE email_logs
+            SET status = 'pending', error_message = COALESCE(%s, error_message), locked_until = NULL,
+                next_attempt_at = NOW() + make_interval(secs => %s),
+                attempts = attempts - CASE WHEN %s THEN 0 ELSE 1 END
+            WHERE id = %s AND status = 'sending'
+        """
+        execute_query(query, (error_message, delay_seconds, count_attempt, email_id), fetch=False)
+    
+    @staticmethod
+    @timed(DB_QUERY_DURATION, method="email_mark_failed")
+    def mark_failed(email_id: str, error_message: str):
+        query = """
+            UPDATE email_logs SET status = 'failed', error_message = %s, locked_until = NULL
+            WHERE id = %s AND status = 'sending'
+        """
+        execute_query(query, (error_message, email_id), fetch=False)
+    
+    @staticmethod
+    @timed(DB_QUERY_DURATION, method="email_queue_depth")
+    def queue_depth() -> Dict[str, int]:
+        """Queued emails by state: due, scheduled (waiting to retry) and sending"""
+        query = """
+            SELECT
+                COUNT(*) FILTER (WHERE status = 'pending' AND next_attempt_at <= NOW()) AS due,
+                COUNT(*) FILTER (WHERE status = 'pending' AND next_attempt_at > NOW()) AS scheduled,
+                COUNT(*) FILTER (WHERE status = 'sending') AS sending
+            FROM email_logs
+            WHERE status IN ('pending', 'sending')
+        """
+        return dict(execute_one(query))
+
+
+class SyncWatermarkRepository:
+    """Per-user high-water marks of what has been pushed to an external system"""
+    
+    @staticmethod
+    @timed(DB_QUERY_DURATION, method="watermark_get")
+    def get(user_id: str, target: str) -> Optional[Dict]:
+        """Get the committed (last_updated_at, last_lead_id) watermark"""
+        query = "SELECT last_updated_at, last_lead_id FROM sync_watermarks WHERE user_id = %s AND target = %s"
+        return execute_one(query, (user_id, target))
+    
+    @staticmethod
+    @timed(DB_QUERY_DURATION, method="watermark_save")
+    def save(user_id: str, target: str, last_updated_at: datetime, last_lead_id: str):
+        """Commit a new watermark (never moves backwards)"""
+        query = """
+            INSERT INTO sync_watermarks (user_id, target, last_updated_at, last_lead_id, updated_at)
+            VALUES (%s, %s, %s, %s, NOW())
+            ON CONFLICT (user_id, target) DO UPDATE
+                SET last_updated_at = EXCLUDED.last_updated_at,
+                    last_lead_id = EXCLUDED.last_lead_id,
+                    updated_at = NOW()
+                WHERE (sync_watermarks.last_updated_at, sync_watermarks.last_lead_id)
+                    < (EXCLUDED.last_updated_at, EXCLUDED.last_lead_id)
+        """
+        execute_query(query, (user_id, target, last_updated_at, last_lead_id), fetch=False)
+    
+    @staticmethod
+    @timed(DB_QUERY_DURATION, method="watermark_pending_users")
+    def pending_users(target: str) -> List[Dict]:
+        """Users with qualified leads past their watermark, with the oldest such update"""
+        query = """
+            SELECT l.user_id, MIN(l.updated_at) AS oldest_unsynced, COUNT(*) AS pending
+            FROM leads l
+            LEFT JOIN sync_watermarks w ON w.user_id = l.user_id AND w.target = %s
+            WHERE l.status = 'qualified'
+              AND (w.user_id IS NULL OR (l.updated_at, l.id) > (w.last_updated_at, w.last_lead_id))
+            GROUP BY l.user_id
+        """
+        return execute_query(query, (target,))
+
+
+class IntegrationRepository:
+    """OAuth tokens of each user's connected services"""
+    
+    @staticmethod
+    @timed(DB_QUERY_DURATION, method="integration_get")
+    def get(user_id: str, provider: str) -> Optional[Dict]:
+        """Active integration of a user, with its tokens"""
+        query = """
+            SELECT user_id, refresh_token, access_token, token_expires_at, metadata
+            FROM integrations
+            WHERE user_id = %s AND provider = %s AND is_active
+        """
+        return execute_one(query, (user_id, provider))
+    
+    @staticmethod
+    @timed(DB_QUERY_DURATION, method="integration_connect")
+    def connect(
+        clerk_user_id: str,
+        provider: str,
+        refresh_token: str,
+        access_token: Optional[str] = None,
+        expires_at: Optional[datetime] = None
+    ) -> Optional[str]:
+        """Store (or replace) a user's grant; returns the user's id, None if unknown"""
+        query = """
+            INSERT INTO integrations (user_id, provider, refresh_token, access_token, token_expires_at, is_active)
+            SELECT id, %s, %s, %s, %s, true FROM users WHERE clerk_user_id = %s
+            ON CONFLICT (user_id, provider) DO UPDATE
+                SET refresh_token = EXCLUDED.refresh_token,
+                    access_token = EXCLUDED.access_token,
+                    token_expires_at = EXCLUDED.token_expires_at,
+                    metadata = integrations.metadata - 'account_id',
+                    is_active = true,
+                    updated_at = NOW()
+            RETURNING user_id
+        """
+        result = execute_insert(query, (provider, refresh_token, access_token, expires_at, clerk_user_id))
+        return str(result['user_id']) if result else None
+    
+    @staticmethod
+    @timed(DB_QUERY_DURATION, method="integration_bulk_save_tokens")
+    def bulk_save_tokens(provider: str, tokens: List[Tuple[str, str, datetime, Optional[str]]]) -> int:
+        """
+        Write back refreshed access tokens in one statement. Each item is
+        (user_id, access_token, expires_at, account_id); a row already
+        holding a later-expiring token (another worker refreshed) is kept.
+        """
+        if not tokens:
+            return 0
+        query = """
+            UPDATE integrations SET access_token = v.access_token,
+                token_expires_at = v.expires_at,
+                metadata = CASE WHEN v.account_id IS NULL THEN integrations.metadata
+                    ELSE integrations.metadata || jsonb_build_object('account_id', v.account_id) END,
+                updated_at = NOW()
+            FROM (VALUES %s) AS v(user_id, provider, access_token, expires_at, account_id)
+            WHERE integrations.user_id = v.user_id::uuid AND integrations.provider = v.provider
+              AND (integrations.token_expires_at IS NULL OR integrations.token_expires_at <= v.expires_at)
+        """
+        rows = [(user_id, provider, *rest) for user_id, *rest in tokens]
+        with get_cursor(dict_cursor=False) as cursor:
+            execute_values(cursor, query, rows, template="(%s, %s, %s, %s::timestamptz, %s)")
+            return cursor.rowcount
+
+
+class UserRepository:
+    """Lookups on app users (keyed by Clerk user id)"""
+    
+    @staticmethod
+    @timed(DB_QUERY_DURATION, method="user_get_id")
+    def get_id(clerk_user_id: str) -> Optional[str]:
+        """Internal id of a Clerk user"""
+        result = execute_one("SELECT id FROM users WHERE clerk_user_id = %s", (clerk_user_id,))
+        return str(result['id']) if result else None
+    
+    @staticmethod
+    @timed(DB_QUERY_DURATION, method="user_get_tier")
+    def get_tier(clerk_user_id: str) -> Optional[str]:
+        """Get a user's subscription tier"""
+        query = "SELECT subscription_tier FROM users WHERE clerk_user_id = %s"
+        result = execute_one(query, (clerk_user_id,))
+        return result['subscription_tier'] if result else None
+
+
+class RateLimitRepository:
+    """Shared fixed-window counters for the sliding-window rate limiter"""
+    
+    @staticmethod
+    @timed(DB_QUERY_DURATION, method="rate_limit_add")
+    def add(key: str, window_start: float, window: float, cost: int) -> tuple:
+        """Add cost to the current window; return (previous window count, current count)"""
+        query = """
+            WITH bumped AS (
+                INSERT INTO rate_limit_windows (rate_key, window_start, count, expires_at)
+                VALUES (%s, %s, %s, NOW() + make_interval(secs => %s))
+                ON CONFLICT (rate_key, window_start) DO UPDATE
+                    SET count = rate_limit_windows.count + EXCLUDED.count
+                RETURNING count
+            )
+            SELECT
+                (SELECT count FROM bumped) AS current,
+                COALESCE((SELECT count FROM rate_limit_windows
+                          WHERE rate_key = %s AND window_start = %s), 0) AS previous
+        """
+        start, previous_start = int(window_start), int(window_start - window)
+        result = execute_one(query, (key, start, cost, window * 2, key, previous_start))
+        return result['previous'], result['current']
+    
+    @staticmethod
+    @timed(DB_QUERY_DURATION, method="rate_limit_purge")
+    def purge_expired() -> None:
+        """Delete windows that can no longer affect a decision"""
+        execute_query("DELETE FROM rate_limit_windows WHERE expires_at < NOW()", fetch=False)
@@ -123,13 +123,21 @@ CREATE TABLE IF NOT EXISTS email_logs (
     email_type VARCHAR(50),  -- 'qualification', 'follow_up', 'qualified_notification'
     
     to_email VARCHAR(255) NOT NULL,
+    from_address VARCHAR(255),
+    cc TEXT[],
+    bcc TEXT[],
     subject VARCHAR(500),
     body TEXT,
     
-    status VARCHAR(50) DEFAULT 'pending',  -- pending, sent, failed, opened, clicked
+    status VARCHAR(50) DEFAULT 'pending',  -- pending, sending, sent, failed, opened, clicked
     provider_message_id VARCHAR(255),
     error_message TEXT,
     
+    -- Outbound queue (see leadqual/outbound/queue.py)
+    attempts INTEGER DEFAULT 0,
+    next_attempt_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    locked_until TIMESTAMP WITH TIME ZONE,  -- lease of the worker sending it
+    
     sent_at TIMESTAMP WITH TIME ZONE,
     opened_at TIMESTAMP WITH TIME ZONE,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
@@ -146,6 +154,56 @@ CREATE TABLE IF NOT EXISTS interactions (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- ============================================
+-- IDEMPOTENCY KEYS TABLE
+-- ============================================
+-- Stored responses for retried send-email / push-to-crm calls
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    user_id VARCHAR(255) NOT NULL,  -- Clerk user id
+    idempotency_key VARCHAR(255) NOT NULL,
+    fingerprint VARCHAR(64) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'in_progress',  -- in_progress, completed
+    response JSONB,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    PRIMARY KEY (user_id, idempotency_key)
+);
+
+-- ============================================
+-- RATE LIMIT WINDOWS TABLE
+-- ============================================
+-- Per-user request counters when RATE_LIMIT_BACKEND=postgres
+CREATE TABLE IF NOT EXISTS rate_limit_windows (
+    rate_key VARCHAR(255) NOT NULL,  -- Clerk user id
+    window_start BIGINT NOT NULL,  -- epoch seconds
+    count INTEGER NOT NULL DEFAULT 0,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    PRIMARY KEY (rate_key, window_start)
+);
+
+-- ============================================
+-- SYNC WATERMARKS TABLE
+-- ============================================
+-- Last (updated_at, id) of leads pushed to an external system, per user
+CREATE TABLE IF NOT EXISTS sync_watermarks (
+    user_id UUID REFERENCES users(id) ON DELETE CASCADE,
+    target VARCHAR(50) NOT NULL DEFAULT 'zoho_crm',
+    last_updated_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    last_lead_id UUID NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (user_id, target)
+);
+
+-- ============================================
+-- UPGRADES FOR EXISTING DATABASES
+-- ============================================
+ALTER TABLE email_logs ADD COLUMN IF NOT EXISTS from_address VARCHAR(255);
+ALTER TABLE email_logs ADD COLUMN IF NOT EXISTS cc TEXT[];
+ALTER TABLE email_logs ADD COLUMN IF NOT EXISTS bcc TEXT[];
+ALTER TABLE email_logs ADD COLUMN IF NOT EXISTS attempts INTEGER DEFAULT 0;
+ALTER TABLE email_logs ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMP WITH TIME ZONE DEFAULT NOW();
+ALTER TABLE email_logs ADD COLUMN IF NOT EXISTS locked_until TIMESTAMP WITH TIME ZONE;
+
 -- ============================================
 -- INDEXES
 -- ============================================
@@ -156,4 +214,16 @@ CREATE INDEX IF NOT EXISTS idx_leads_created_at ON leads(created_at);
 CREATE INDEX IF NOT EXISTS idx_email_logs_lead_id ON email_logs(lead_id);
 CREATE INDEX IF NOT EXISTS idx_interactions_lead_id ON interactions(lead_id);
 CREATE INDEX IF NOT EXISTS idx_qualification_responses_lead_id ON qualification_responses(lead_id);
-
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires_at ON idempotency_keys(expires_at);
+CREATE INDEX IF NOT EXISTS idx_rate_limit_windows_expires_at ON rate_limit_windows(expires_at);
+-- leads(user_id, email) lookups use the index behind UNIQUE(user_id, email)
+DROP INDEX IF EXISTS idx_leads_user_id_email;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_interactions_reply_message_id
+    ON interactions(lead_id, (details->>'message_id'))
+    WHERE interaction_type = 'lead_response';
+CREATE INDEX IF NOT EXISTS idx_leads_zoho_unsynced ON leads(user_id, id)
+    WHERE status = 'qualified' AND (zoho_synced_at IS NULL OR updated_at > zoho_synced_at);
+CREATE INDEX IF NOT EXISTS idx_leads_qualified_updated ON leads(user_id, updated_at, id)
+    WHERE status = 'qualified';
+CREATE INDEX IF NOT EXISTS idx_email_logs_queue ON email_logs(next_attempt_at)
+    WHERE status IN ('pending', 'sending');
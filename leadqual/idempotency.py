@@ -0,0 +1,212 @@
+"""
+Idempotency-Key support for LeadQual AI
+Retried requests with the same key replay the stored response instead of
+repeating the external call; concurrent duplicates wait on the first one
+"""
+
+import time
+import json
+import asyncio
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from .config import Config
+
+
+class IdempotencyError(Exception):
+    """Base error for Idempotency-Key handling"""
+    status_code = 400
+
+
+class IdempotencyKeyMismatch(IdempotencyError):
+    """The key was already used with a different request body"""
+    status_code = 422
+
+
+class IdempotencyInProgress(IdempotencyError):
+    """Another worker still owns the key after the wait timeout"""
+    status_code = 409
+
+
+def fingerprint(route: str, payload: Any) -> str:
+    """Stable hash of the route and canonical JSON request body"""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{route}\n{canonical}".encode()).hexdigest()
+
+
+@dataclass
+class _Entry:
+    fingerprint: str
+    response: Dict[str, Any]
+    expires_at: float
+
+
+class MemoryTier:
+    """Per-process LRU of completed responses with TTL"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+
+    def get(self, scope: Tuple[str, str]) -> Optional[_Entry]:
+        entry = self._entries.get(scope)
+        if entry is None:
+            return None
+        if entry.expires_at < time.monotonic():
+            del self._entries[scope]
+            return None
+        self._entries.move_to_end(scope)
+        return entry
+
+    def put(self, scope: Tuple[str, str], entry: _Entry):
+        self._entries[scope] = entry
+        self._entries.move_to_end(scope)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class PostgresTier:
+    """Shared tier in the idempotency_keys table, used across workers"""
+
+    def __init__(self):
+        # Lazy: keeps psycopg2 out of worker startup
+        from .database.models import IdempotencyRepository
+        self.repo = IdempotencyRepository
+
+    async def claim(self, scope, fp: str, lease: float) -> bool:
+        return await run_in_threadpool(self.repo.claim, scope[0], scope[1], fp, lease)
+
+    async def get(self, scope) -> Optional[Dict]:
+        return await run_in_threadpool(self.repo.get, scope[0], scope[1])
+
+    async def complete(self, scope, response: Dict, ttl: float):
+        await run_in_threadpool(self.repo.complete, scope[0], scope[1], response, ttl)
+
+    async def release(self, scope):
+        await run_in_threadpool(self.repo.release, scope[0], scope[1])
+
+    async def purge(self):
+        await run_in_threadpool(self.repo.purge_expired)
+
+
+class IdempotencyStore:
+    """Two-tier (memory, then Postgres) store of responses keyed by user and key"""
+
+    def __init__(
+        self,
+        ttl: float,
+        memory: MemoryTier,
+        postgres: Optional[PostgresTier] = None,
+        wait_timeout: float = 30.0
+    ):
+        self.ttl = ttl
+        self.memory = memory
+        self.postgres = postgres
+        self.wait_timeout = wait_timeout
+        self._inflight: Dict[Tuple[str, str], Tuple[str, asyncio.Future]] = {}
+
+    async def run(
+        self,
+        user_id: str,
+        key: str,
+        fp: str,
+        call: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Return (response, replayed) - call() runs at most once per key"""
+        scope = (user_id, key)
+
+        entry = self.memory.get(scope)
+        if entry is not None:
+            return self._replay(entry.fingerprint, fp, entry.response), True
+
+        inflight = self._inflight.get(scope)
+        if inflight is not None:
+            owner_fp, future = inflight
+            self._check(owner_fp, fp)
+            return await asyncio.shield(future), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[scope] = (fp, future)
+        try:
+            response, replayed = await self._run_owned(scope, fp, call)
+            future.set_result(response)
+            return response, replayed
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # waiters re-raise it; mark as retrieved
+            raise
+        finally:
+            del self._inflight[scope]
+
+    async def _run_owned(self, scope, fp: str, call) -> Tuple[Dict[str, Any], bool]:
+        if self.postgres is not None:
+            stored = await self._claim_or_wait(scope, fp)
+            if stored is not None:
+                return stored, True
+
+        try:
+            response = await call()
+        except BaseException:
+            if self.postgres is not None:
+                await self.postgres.release(scope)
+            raise
+
+        self.memory.put(scope, _Entry(fp, response, time.monotonic() + self.ttl))
+        if self.postgres is not None:
+            await self.postgres.complete(scope, response, self.ttl)
+        return response, False
+
+    async def _claim_or_wait(self, scope, fp: str) -> Optional[Dict[str, Any]]:
+        """Claim the key in Postgres, or wait for another worker's stored response"""
+        deadline = time.monotonic() + self.wait_timeout
+        delay = 0.05
+        while True:
+            if await self.postgres.claim(scope, fp, lease=self.wait_timeout * 2):
+                return None
+            row = await self.postgres.get(scope)
+            if row is not None:
+                self._check(row["fingerprint"], fp)
+                if row["status"] == "completed":
+                    response = row["response"]
+                    self.memory.put(scope, _Entry(fp, response, time.monotonic() + self.ttl))
+                    return response
+            if time.monotonic() > deadline:
+                raise IdempotencyInProgress("A request with this Idempotency-Key is still in progress")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 1.0)
+
+    async def purge(self):
+        """Delete expired keys from the shared tier (the memory tier expires on read)"""
+        if self.postgres is not None:
+            await self.postgres.purge()
+
+    def _replay(self, stored_fp: str, fp: str, response: Dict[str, Any]) -> Dict[str, Any]:
+        self._check(stored_fp, fp)
+        return response
+
+    @staticmethod
+    def _check(stored_fp: str, fp: str):
+        if stored_fp != fp:
+            raise IdempotencyKeyMismatch("Idempotency-Key was already used with a different request")
+
+
+_store: Optional[IdempotencyStore] = None
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    global _store
+    if _store is None:
+        _store = IdempotencyStore(
+            ttl=Config.IDEMPOTENCY_TTL_SECONDS,
+            memory=MemoryTier(Config.IDEMPOTENCY_MEMORY_MAX),
+            postgres=PostgresTier() if Config.DATABASE_URL else None,
+            wait_timeout=Config.IDEMPOTENCY_WAIT_SECONDS
+        )
+    return _store
@@ -0,0 +1,14 @@
+"""Inbound lead reply ingestion for LeadQual AI"""
+
+from .parser import InboundReply, InboundParseError, MessageTooLarge, parse_mime_stream, parse_zoho_notification, build_reply
+from .queue import ReplyQueue, get_reply_queue, start_reply_queue, stop_reply_queue
+from .scoring import score_reply
+from .webhook import TOKEN_HEADER, webhook_token, verify_webhook_token
+
+__all__ = [
+    'InboundReply', 'InboundParseError', 'MessageTooLarge',
+    'parse_mime_stream', 'parse_zoho_notification', 'build_reply',
+    'ReplyQueue', 'get_reply_queue', 'start_reply_queue', 'stop_reply_queue',
+    'score_reply',
+    'TOKEN_HEADER', 'webhook_token', 'verify_webhook_token'
+]
@@ -0,0 +1,143 @@
+"""
+Parse inbound lead replies (raw MIME or Zoho Mail notifications) into the
+new text of the reply, without quoted history or signatures
+"""
+
+import re
+import html
+import hashlib
+from dataclasses import dataclass
+from email import policy
+from email.feedparser import BytesFeedParser
+from email.utils import parseaddr
+from typing import AsyncIterator, Dict, Iterable, Iterator, Optional
+
+
+class InboundParseError(ValueError):
+    """The posted message could not be used"""
+
+
+class MessageTooLarge(InboundParseError):
+    """The posted message is over INBOUND_MAX_BYTES"""
+
+
+@dataclass
+class InboundReply:
+    """One lead reply, ready for scoring"""
+    user_id: str  # users.id (not the Clerk id), matching leads.user_id
+    sender: str
+    subject: str
+    text: str
+    message_id: str
+    in_reply_to: Optional[str] = None
+
+
+# Lines that start quoted history - everything from here on is dropped
+_QUOTE_HEADERS = [
+    re.compile(r"^On .{0,200}wrote:\s*$", re.IGNORECASE),
+    re.compile(r"^-{2,}\s*(Original|Forwarded) Message\s*-{2,}", re.IGNORECASE),
+    re.compile(r"^(From|Sent|De|Von):\s.+", re.IGNORECASE),
+    re.compile(r"^_{10,}\s*$"),
+    re.compile(r"^>"),
+]
+
+# Lines that start a signature
+_SIGNATURES = [
+    re.compile(r"^--\s*$"),
+    re.compile(r"^Sent from my \w+", re.IGNORECASE),
+    re.compile(r"^Get Outlook for \w+", re.IGNORECASE),
+]
+
+_TAG = re.compile(r"<[^>]+>")
+_BLOCK_TAG = re.compile(r"<\s*(br|/p|/div|/li|/tr|/h\d)\b[^>]*>", re.IGNORECASE)
+_DROP_BLOCK = re.compile(r"<(style|script|blockquote)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+
+
+def strip_reply(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Yield the lines of a reply up to the first quoted-history or signature
+    marker; stops consuming input as soon as one is seen
+    """
+    for line in lines:
+        stripped = line.strip()
+        if any(p.match(stripped) for p in _QUOTE_HEADERS) or any(p.match(stripped) for p in _SIGNATURES):
+            return
+        yield line.rstrip()
+
+
+def reply_text(lines: Iterable[str]) -> str:
+    return "\n".join(strip_reply(lines)).strip()
+
+
+def html_lines(content: str) -> Iterator[str]:
+    """Plain-text lines of an HTML body (quoted <blockquote>s removed)"""
+    content = _DROP_BLOCK.sub("", content)
+    content = _BLOCK_TAG.sub("\n", content)
+    for line in html.unescape(_TAG.sub("", content)).splitlines():
+        yield line
+
+
+async def parse_mime_stream(chunks: AsyncIterator[bytes], max_bytes: int) -> Dict[str, str]:
+    """Feed a raw RFC 822 body into the parser chunk by chunk"""
+    parser = BytesFeedParser(policy=policy.default)
+    size = 0
+    async for chunk in chunks:
+        size += len(chunk)
+        if size > max_bytes:
+            raise MessageTooLarge(f"Message is larger than {max_bytes} bytes")
+        parser.feed(chunk)
+    message = parser.close()
+
+    if message.defects and not message.get("From"):
+        raise InboundParseError("Body is not a MIME message")
+
+    body = message.get_body(preferencelist=("plain", "html"))
+    if body is None:
+        lines: Iterable[str] = ()
+    elif body.get_content_type() == "text/html":
+        lines = html_lines(body.get_content())
+    else:
+        lines = body.get_content().splitlines()
+
+    return {
+        "sender": str(message.get("From", "")),
+        "subject": str(message.get("Subject", "")),
+        "message_id": str(message.get("Message-ID", "")),
+        "in_reply_to": str(message.get("In-Reply-To", "")) or None,
+        "text": reply_text(lines)
+    }
+
+
+def parse_zoho_notification(payload: Dict) -> Dict[str, str]:
+    """Map a Zoho Mail incoming-email notification to reply fields"""
+    content = payload.get("html") or payload.get("content") or ""
+    lines = html_lines(content) if "<" in content else content.splitlines()
+    if not content:
+        lines = (payload.get("summary") or "").splitlines()
+    return {
+        "sender": payload.get("fromAddress") or payload.get("sender") or "",
+        "subject": payload.get("subject") or "",
+        "message_id": str(payload.get("messageIdString") or payload.get("messageId") or ""),
+        "in_reply_to": payload.get("inReplyTo"),
+        "text": reply_text(lines)
+    }
+
+
+def build_reply(user_id: str, fields: Dict[str, str]) -> InboundReply:
+    """Validate parsed fields; a missing Message-ID falls back to a content hash"""
+    sender = parseaddr(fields.get("sender") or "")[1].lower()
+    if "@" not in sender:
+        raise InboundParseError("Message has no sender address")
+    text = fields.get("text") or ""
+    message_id = (fields.get("message_id") or "").strip()
+    if not message_id:
+        digest = hashlib.sha256(f"{sender}\n{fields.get('subject')}\n{text}".encode()).hexdigest()
+        message_id = f"sha256:{digest}"
+    return InboundReply(
+        user_id=user_id,
+        sender=sender,
+        subject=fields.get("subject") or "",
+        text=text,
+        message_id=message_id,
+        in_reply_to=fields.get("in_reply_to")
+    )
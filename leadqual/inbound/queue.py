@@ -0,0 +1,137 @@
+"""
+In-process queue that scores inbound replies with throttled workers
+Duplicate Message-IDs are dropped before they are queued
+"""
+
+import time
+import asyncio
+from collections import OrderedDict
+from typing import Awaitable, Callable, List, Optional
+
+from ..monitoring.metrics import Counter, Gauge
+from .parser import InboundReply
+
+INBOUND_REPLIES = Counter(
+    "leadqual_inbound_replies_total",
+    "Inbound lead replies by outcome",
+    ("outcome",)  # queued, duplicate, rejected, scored, unmatched, empty, failed
+)
+
+INBOUND_QUEUE_DEPTH = Gauge(
+    "leadqual_inbound_queue_depth",
+    "Inbound replies waiting to be scored"
+)
+
+
+class _Pacer:
+    """Space out starts to at most `rate` per second across all workers"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class ReplyQueue:
+    """Bounded queue of replies, deduplicated by Message-ID, drained by workers"""
+
+    def __init__(
+        self,
+        handler: Callable[[InboundReply], Awaitable[str]],
+        workers: int = 4,
+        rate: float = 5.0,
+        max_size: int = 10_000,
+        dedupe_size: int = 50_000
+    ):
+        self.handler = handler
+        self.workers = workers
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self.pacer = _Pacer(rate)
+        self.dedupe_size = dedupe_size
+        self._seen: "OrderedDict[tuple, None]" = OrderedDict()
+        self._tasks: List[asyncio.Task] = []
+        INBOUND_QUEUE_DEPTH.set_function(self.queue.qsize)
+
+    def submit(self, reply: InboundReply) -> str:
+        """Queue a reply; returns 'queued', 'duplicate' or 'rejected' (queue full)"""
+        key = (reply.user_id, reply.message_id)
+        if key in self._seen:
+            self._seen.move_to_end(key)
+            outcome = "duplicate"
+        else:
+            try:
+                self.queue.put_nowait(reply)
+                outcome = "queued"
+            except asyncio.QueueFull:
+                outcome = "rejected"
+            else:
+                self._seen[key] = None
+                if len(self._seen) > self.dedupe_size:
+                    self._seen.popitem(last=False)
+        INBOUND_REPLIES.inc(outcome=outcome)
+        return outcome
+
+    def start(self):
+        self._tasks = [
+            asyncio.get_running_loop().create_task(self._work(), name=f"inbound-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self, drain_timeout: float = 5.0):
+        """Let workers finish what is queued (up to drain_timeout), then cancel them"""
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(self.queue.join(), drain_timeout)
+        except asyncio.TimeoutError:
+            print(f"⚠️ Dropping {self.queue.qsize()} unscored inbound replies on shutdown")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _work(self):
+        while True:
+            reply = await self.queue.get()
+            try:
+                await self.pacer.wait()
+                outcome = await self.handler(reply)
+            except Exception as e:
+                outcome = "failed"
+                # Forget the Message-ID so a redelivery can be scored
+                self._seen.pop((reply.user_id, reply.message_id), None)
+                print(f"❌ Scoring reply {reply.message_id} from {reply.sender} failed: {e}")
+            finally:
+                self.queue.task_done()
+            INBOUND_REPLIES.inc(outcome=outcome)
+
+
+_queue: Optional[ReplyQueue] = None
+
+
+def get_reply_queue() -> Optional[ReplyQueue]:
+    return _queue
+
+
+def start_reply_queue(handler: Callable[[InboundReply], Awaitable[str]], **options) -> ReplyQueue:
+    global _queue
+    _queue = ReplyQueue(handler, **options)
+    _queue.start()
+    return _queue
+
+
+async def stop_reply_queue():
+    global _queue
+    if _queue is not None:
+        await _queue.stop()
+        _queue = None
@@ -0,0 +1,89 @@
+"""
+Score a queued reply against the matching lead
+"""
+
+from typing import Any, Callable, Dict, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from ..agent.qualifier import LeadQualifierAgent
+from .parser import InboundReply
+
+SCORE_KEYS = ("budget", "authority", "need", "timeline")
+
+
+async def score_reply(reply: InboundReply, get_agent: Callable[[], LeadQualifierAgent]) -> str:
+    """Match the sender to a lead, analyze the reply and store the new scores"""
+    # Lazy: keeps psycopg2 out of worker startup
+    from ..database.models import LeadRepository, InteractionRepository
+
+    if not reply.text:
+        return "empty"
+
+    lead = await run_in_threadpool(LeadRepository.get_by_email, reply.user_id, reply.sender)
+    if lead is None:
+        return "unmatched"
+
+    # Claim the Message-ID in the database so other workers/processes skip it
+    interaction_id = await run_in_threadpool(
+        InteractionRepository.record_reply,
+        lead.id,
+        reply.message_id,
+        {"subject": reply.subject, "text": reply.text, "in_reply_to": reply.in_reply_to}
+    )
+    if interaction_id is None:
+        return "duplicate"
+
+    qualification = lead.qualification_data or {}
+    try:
+        analysis = await run_in_threadpool(
+            get_agent().analyze_response,
+            response_text=reply.text,
+            current_scores=qualification.get("scores"),
+            previous_analysis=qualification.get("analysis", "")
+        )
+        if "error" in analysis:
+            raise ValueError(f"Unusable analysis for reply {reply.message_id}: {analysis['error']}")
+        await run_in_threadpool(_apply_analysis, lead, analysis, qualification)
+    except Exception:
+        # Release the Message-ID so a redelivery is scored instead of skipped as a duplicate
+        await run_in_threadpool(InteractionRepository.delete, interaction_id)
+        raise
+
+    return "scored"
+
+
+def _as_score(value: Any) -> Optional[int]:
+    """An int for numeric model output, None for anything else"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(float(value.strip()))
+        except ValueError:
+            return None
+    return None
+
+
+def _apply_analysis(lead, analysis: Dict[str, Any], qualification: Dict[str, Any]):
+    from ..database.models import LeadRepository
+
+    # Keep the previous score for any dimension the model didn't give a number for
+    scores = dict(qualification.get("scores") or {})
+    for key in SCORE_KEYS:
+        score = _as_score(analysis.get(f"{key}_score"))
+        if score is not None:
+            scores[key] = score
+    total = _as_score(analysis.get("total_score"))
+    if total is None:
+        total = sum(_as_score(scores.get(key)) or 0 for key in SCORE_KEYS)
+    updates = {
+        "score": total,
+        "qualification_data": {**qualification, "scores": scores, "analysis": analysis.get("analysis", "")}
+    }
+    status = analysis.get("status")
+    if status in ("qualifying", "qualified", "unqualified"):
+        updates["status"] = status
+    LeadRepository.update(lead.id, **updates)
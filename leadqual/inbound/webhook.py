@@ -0,0 +1,27 @@
+"""
+Per-user tokens for the inbound reply webhook
+Each tenant's token is an HMAC of its user id under INBOUND_WEBHOOK_SECRET, so
+one tenant's token can't post replies into another tenant's leads and the
+master secret never leaves the server
+"""
+
+import hmac
+import hashlib
+from typing import Optional
+
+from ..config import Config
+
+TOKEN_HEADER = "X-Webhook-Token"
+
+
+def webhook_token(user_id: str) -> str:
+    """The token a tenant's mail provider sends in the X-Webhook-Token header"""
+    if not Config.INBOUND_WEBHOOK_SECRET:
+        raise ValueError("INBOUND_WEBHOOK_SECRET is not configured")
+    return hmac.new(Config.INBOUND_WEBHOOK_SECRET.encode(), user_id.encode(), hashlib.sha256).hexdigest()
+
+
+def verify_webhook_token(user_id: str, supplied: Optional[str]) -> bool:
+    if not Config.INBOUND_WEBHOOK_SECRET or not supplied:
+        return False
+    return hmac.compare_digest(supplied, webhook_token(user_id))
@@ -3,6 +3,17 @@
 from .zoho_oauth import ZohoOAuth
 from .zoho_crm import ZohoCRM
 from .zoho_mail import ZohoMail
+from .zoho_token import ZohoTokenManager, FileTokenStore, TokenStore
+from .zoho_api import (
+    ZohoAPI, ZohoAPIError, ZohoAuthError, ZohoClientError, ZohoRateLimited,
+    ZohoServerError, ZohoConnectionError, ZohoUnavailable
+)
+from .zoho_tenants import ZohoClientRegistry, ZohoTenant, ZohoNotConnected, IntegrationTokenStore
 
-__all__ = ['ZohoOAuth', 'ZohoCRM', 'ZohoMail']
+__all__ = [
+    'ZohoOAuth', 'ZohoCRM', 'ZohoMail', 'ZohoTokenManager', 'FileTokenStore', 'TokenStore',
+    'ZohoAPI', 'ZohoAPIError', 'ZohoAuthError', 'ZohoClientError', 'ZohoRateLimited',
+    'ZohoServerError', 'ZohoConnectionError', 'ZohoUnavailable',
+    'ZohoClientRegistry', 'ZohoTenant', 'ZohoNotConnected', 'IntegrationTokenStore'
+]
 
@@ -0,0 +1,81 @@
+"""
+Shared HTTP client helpers for the integrations
+Long-lived pooled clients are built once per worker in the API lifespan
+"""
+
+import importlib.util
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import httpx
+
+from ..config import Config
+from ..monitoring.metrics import Counter, Gauge
+
+HTTP_POOL_CONNECTIONS = Gauge(
+    "leadqual_http_pool_connections",
+    "Connections held by an integration's HTTP pool",
+    ("client", "state")  # active, idle
+)
+
+HTTP_CONNECTIONS_OPENED = Counter(
+    "leadqual_http_connections_opened_total",
+    "New TCP connections opened by an integration's HTTP pool",
+    ("client",)
+)
+
+
+def _pool_connections(client: httpx.AsyncClient, idle: bool) -> int:
+    # httpcore internals; the gauge skips the sample if they change shape
+    connections = client._transport._pool.connections
+    return sum(1 for c in connections if c.is_idle() == idle)
+
+
+def build_client(
+    name: str,
+    http2: bool = False,
+    max_connections: int = 20,
+    max_keepalive: int = 10,
+    keepalive_expiry: float = 30.0
+) -> httpx.AsyncClient:
+    """Pooled keep-alive client for one integration, with pool metrics"""
+    if http2 and importlib.util.find_spec("h2") is None:
+        print(f"⚠️ HTTP/2 requested for {name} but h2 is not installed; using HTTP/1.1")
+        http2 = False
+
+    async def trace(event: str, info: dict):
+        if event == "connection.connect_tcp.complete":
+            HTTP_CONNECTIONS_OPENED.inc(client=name)
+
+    async def attach_trace(request: httpx.Request):
+        request.extensions["trace"] = trace
+
+    client = httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry
+        ),
+        timeout=timeout_for("default"),
+        event_hooks={"request": [attach_trace]}
+    )
+    HTTP_POOL_CONNECTIONS.set_function(lambda: _pool_connections(client, idle=False), client=name, state="active")
+    HTTP_POOL_CONNECTIONS.set_function(lambda: _pool_connections(client, idle=True), client=name, state="idle")
+    return client
+
+
+def timeout_for(operation: str) -> httpx.Timeout:
+    """Per-operation read timeout (Config.HTTP_TIMEOUTS) with a shared connect timeout"""
+    seconds = Config.HTTP_TIMEOUTS.get(operation, Config.HTTP_TIMEOUTS["default"])
+    return httpx.Timeout(seconds, connect=Config.HTTP_CONNECT_TIMEOUT)
+
+
+@asynccontextmanager
+async def client_session(shared: Optional[httpx.AsyncClient]) -> AsyncIterator[httpx.AsyncClient]:
+    """Use the app's pooled client when one was passed in, else a one-off client"""
+    if shared is not None:
+        yield shared
+        return
+    async with httpx.AsyncClient(timeout=timeout_for("default")) as client:
+        yield client
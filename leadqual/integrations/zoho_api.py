@@ -0,0 +1,353 @@
+"""
+Resilient request layer shared by the Zoho CRM and Mail clients
+
+Every call goes through ZohoAPI.request, which
+- classifies failures into the ZohoAPIError hierarchy (status codes are checked),
+- retries transient ones with full-jitter backoff (non-idempotent calls only
+  when Zoho cannot have processed them),
+- invalidates the token and replays once on 401,
+- paces calls from Zoho's API-credit headers, and
+- fails fast through a per-service circuit breaker while Zoho is down.
+"""
+
+import time
+import random
+import asyncio
+from typing import Any, Dict, Optional
+
+import httpx
+
+from ..config import Config
+from ..monitoring.metrics import ZOHO_REQUEST_DURATION, ZOHO_ERRORS, Counter, Gauge, track
+from .http import client_session
+from .zoho_token import ZohoTokenManager
+
+ZOHO_RETRIES = Counter(
+    "leadqual_zoho_retries_total",
+    "Zoho API calls retried or replayed",
+    ("service", "reason")  # throttled, server_error, connection, auth
+)
+
+ZOHO_CIRCUIT_STATE = Gauge(
+    "leadqual_zoho_circuit_state",
+    "Zoho circuit breaker state (0 closed, 1 half-open, 2 open)",
+    ("service",)
+)
+
+ZOHO_API_CREDITS = Gauge(
+    "leadqual_zoho_api_credits_remaining",
+    "API credits left in the current window, from Zoho's rate-limit headers",
+    ("service",)
+)
+
+_AUTH_CODES = {"INVALID_TOKEN", "INVALID_OAUTHTOKEN", "AUTHENTICATION_FAILURE", "OAUTH_SCOPE_MISMATCH"}
+
+
+class ZohoAPIError(Exception):
+    """A Zoho call failed; retryable says whether trying again may succeed"""
+    retryable = False
+    trips_breaker = False
+    safe_to_replay = False  # Zoho cannot have acted on the request
+
+    def __init__(self, message: str, status_code: Optional[int] = None, code: Optional[str] = None,
+                 retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.code = code
+        self.retry_after = retry_after
+
+
+class ZohoAuthError(ZohoAPIError):
+    """The access token was rejected (401)"""
+
+
+class ZohoClientError(ZohoAPIError):
+    """Zoho rejected the request itself (4xx); retrying will not help"""
+
+
+class ZohoRateLimited(ZohoAPIError):
+    """Throttled (429) - the request was not processed"""
+    retryable = True
+    safe_to_replay = True
+
+
+class ZohoServerError(ZohoAPIError):
+    """Zoho failed (5xx)"""
+    retryable = True
+    trips_breaker = True
+
+
+class ZohoConnectionError(ZohoAPIError):
+    """Network failure or timeout talking to Zoho"""
+    retryable = True
+    trips_breaker = True
+
+
+class ZohoUnavailable(ZohoAPIError):
+    """The circuit breaker is open; the call was not attempted"""
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    try:
+        return max(0.0, float(response.headers["retry-after"]))
+    except (KeyError, ValueError):
+        return None
+
+
+def classify(response: httpx.Response) -> Optional[ZohoAPIError]:
+    """The error a response represents, or None for success"""
+    try:
+        body = response.json() if response.content else {}
+    except ValueError:
+        body = {}
+    # CRM: {"code", "message"}; Mail: {"status": {"code", "description"}, "data": {"errorCode"}}
+    status = body.get("status") if isinstance(body, dict) else None
+    data = body.get("data") if isinstance(body, dict) else None
+    code = (body.get("code") if isinstance(body, dict) else None) or (
+        data.get("errorCode") if isinstance(data, dict) else None
+    )
+    message = (body.get("message") if isinstance(body, dict) else None) or (
+        status.get("description") if isinstance(status, dict) else None
+    ) or response.reason_phrase
+
+    if response.status_code < 400:
+        return None
+    text = f"Zoho {response.status_code} {code or ''}: {message}".replace("  ", " ")
+    if response.status_code == 401 or code in _AUTH_CODES:
+        return ZohoAuthError(text, response.status_code, code)
+    if response.status_code == 429:
+        return ZohoRateLimited(text, 429, code, _retry_after(response))
+    if response.status_code >= 500:
+        return ZohoServerError(text, response.status_code, code, _retry_after(response))
+    return ZohoClientError(text, response.status_code, code)
+
+
+class CircuitBreaker:
+    """Open after `failures` consecutive outage errors; probe once after reset_timeout"""
+
+    CLOSED, HALF_OPEN, OPEN = 0, 1, 2
+
+    def __init__(self, service: str, failures: int = 5, reset_timeout: float = 30.0):
+        self.service = service
+        self.failures = failures
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._consecutive = 0
+        self._opened_at = 0.0
+        self._probing = False
+        ZOHO_CIRCUIT_STATE.set(self.CLOSED, service=service)
+
+    def before(self):
+        """Raise ZohoUnavailable unless a call may go out now"""
+        if self.state == self.CLOSED:
+            return
+        remaining = self._opened_at + self.reset_timeout - time.monotonic()
+        if self.state == self.OPEN and remaining <= 0:
+            self._set(self.HALF_OPEN)
+        if self.state == self.HALF_OPEN and not self._probing:
+            self._probing = True
+            return
+        raise ZohoUnavailable(
+            f"Zoho {self.service} is unavailable (circuit open)",
+            code="CIRCUIT_OPEN",
+            retry_after=max(1.0, remaining)
+        )
+
+    def success(self):
+        self._consecutive = 0
+        self._probing = False
+        if self.state != self.CLOSED:
+            self._set(self.CLOSED)
+
+    def failure(self):
+        self._consecutive += 1
+        self._probing = False
+        if self.state == self.HALF_OPEN or self._consecutive >= self.failures:
+            self._opened_at = time.monotonic()
+            if self.state != self.OPEN:
+                print(f"⚠️ Zoho {self.service} circuit opened after {self._consecutive} failures")
+            self._set(self.OPEN)
+
+    def release(self):
+        """End a half-open probe without a verdict"""
+        self._probing = False
+
+    def _set(self, state: int):
+        self.state = state
+        ZOHO_CIRCUIT_STATE.set(state, service=self.service)
+
+
+class CreditPacer:
+    """
+    Spread calls over what is left of Zoho's rate-limit window once credits
+    run low, instead of spending them all and getting 429s.
+    """
+
+    def __init__(self, service: str, pace_below: float = 0.2, max_wait: float = 5.0):
+        self.service = service
+        self.pace_below = pace_below
+        self.max_wait = max_wait
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0  # monotonic
+        self._next_slot = 0.0
+
+    def update(self, response: httpx.Response):
+        headers = response.headers
+        try:
+            remaining = int(headers["x-ratelimit-remaining"])
+        except (KeyError, ValueError):
+            return
+        self.remaining = remaining
+        ZOHO_API_CREDITS.set(remaining, service=self.service)
+        try:
+            self.limit = int(headers["x-ratelimit-limit"])
+        except (KeyError, ValueError):
+            pass
+        try:
+            reset = float(headers["x-ratelimit-reset"])
+        except (KeyError, ValueError):
+            return
+        # Zoho sends an epoch in ms; accept epoch seconds or a delay too
+        if reset > 1e12:
+            reset = reset / 1000 - time.time()
+        elif reset > 1e9:
+            reset -= time.time()
+        self.reset_at = time.monotonic() + max(0.0, reset)
+
+    async def wait(self):
+        """Delay this call if credits are low; raise ZohoRateLimited if the wait is too long"""
+        now = time.monotonic()
+        if self.remaining is None or now >= self.reset_at:
+            return
+        window_left = self.reset_at - now
+        if self.remaining <= 0:
+            delay = window_left
+        elif self.limit and self.remaining > self.limit * self.pace_below:
+            return
+        else:
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + window_left / self.remaining
+            delay = slot - now
+        if delay > self.max_wait:
+            raise ZohoRateLimited(
+                f"Zoho {self.service} API credits exhausted", code="CREDITS_EXHAUSTED", retry_after=delay
+            )
+        self.remaining -= 1
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+# Outages and credits are per Zoho service, so every client shares these
+_breakers: Dict[str, CircuitBreaker] = {}
+_pacers: Dict[str, CreditPacer] = {}
+
+
+def get_breaker(service: str) -> CircuitBreaker:
+    if service not in _breakers:
+        _breakers[service] = CircuitBreaker(service, Config.ZOHO_BREAKER_FAILURES, Config.ZOHO_BREAKER_RESET_SECONDS)
+    return _breakers[service]
+
+
+def get_pacer(service: str) -> CreditPacer:
+    if service not in _pacers:
+        _pacers[service] = CreditPacer(service, Config.ZOHO_CREDIT_PACE_BELOW, Config.ZOHO_PACE_MAX_WAIT)
+    return _pacers[service]
+
+
+class ZohoAPI:
+    """Authenticated, resilient calls to one Zoho service ("crm" or "mail")"""
+
+    def __init__(self, service: str, tokens: ZohoTokenManager, http: Optional[httpx.AsyncClient] = None):
+        self.service = service
+        self.tokens = tokens
+        self.http = http
+        self.breaker = get_breaker(service)
+        self.pacer = get_pacer(service)
+        self.max_retries = Config.ZOHO_MAX_RETRIES
+        self.base_delay = Config.ZOHO_RETRY_BASE_DELAY
+        self.max_delay = Config.ZOHO_RETRY_MAX_DELAY
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        operation: str,
+        timeout: httpx.Timeout,
+        json: Any = None,
+        idempotent: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """Send the call and return its JSON body, raising ZohoAPIError on failure"""
+        if idempotent is None:
+            idempotent = method in ("GET", "PUT", "DELETE")
+        attempt, replayed = 0, False
+        while True:
+            await self.pacer.wait()
+            self.breaker.before()
+            token = None
+            try:
+                token = await self.tokens.get_token()
+                with track(ZOHO_REQUEST_DURATION, ZOHO_ERRORS, service=self.service, operation=operation):
+                    response = await self._send(method, url, token, timeout, json)
+                    self.pacer.update(response)
+                    error = classify(response)
+                    if error is not None:
+                        raise error
+            except ZohoAuthError:
+                self.breaker.success()  # Zoho answered
+                if replayed or token is None:
+                    raise
+                await self.tokens.invalidate(token)
+                replayed = True
+                ZOHO_RETRIES.inc(service=self.service, reason="auth")
+                continue
+            except ZohoAPIError as e:
+                if e.trips_breaker:
+                    self.breaker.failure()
+                else:
+                    self.breaker.success()
+                delay = self._retry_delay(e, attempt, idempotent)
+                if delay is None:
+                    raise
+                attempt += 1
+                ZOHO_RETRIES.inc(service=self.service, reason=self._reason(e))
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                self.breaker.release()  # e.g. the token refresh failed; says nothing about the API
+                raise
+
+            self.breaker.success()
+            return response.json() if response.content else {}
+
+    async def _send(self, method: str, url: str, token: str, timeout: httpx.Timeout, json: Any) -> httpx.Response:
+        headers = {"Authorization": f"Zoho-oauthtoken {token}"}
+        try:
+            async with client_session(self.http) as client:
+                return await client.request(method, url, headers=headers, json=json, timeout=timeout)
+        except httpx.TransportError as e:
+            error = ZohoConnectionError(f"Zoho {self.service} unreachable: {e!r}")
+            # Nothing reached Zoho if we never got a connection
+            error.safe_to_replay = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+            raise error from e
+
+    def _retry_delay(self, error: ZohoAPIError, attempt: int, idempotent: bool) -> Optional[float]:
+        """Seconds to wait before retrying, or None to give up"""
+        if not error.retryable or attempt >= self.max_retries:
+            return None
+        if not (idempotent or error.safe_to_replay):
+            return None
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if error.retry_after is not None:
+            if error.retry_after > self.max_delay:
+                return None  # fail fast rather than hold the caller
+            delay = max(delay, error.retry_after)
+        return delay
+
+    @staticmethod
+    def _reason(error: ZohoAPIError) -> str:
+        if isinstance(error, ZohoRateLimited):
+            return "throttled"
+        if isinstance(error, ZohoConnectionError):
+            return "connection"
+        return "server_error"
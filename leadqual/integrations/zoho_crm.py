@@ -3,102 +3,166 @@ Zoho CRM Integration for LeadQual AI
 Handles pushing qualified leads to Zoho CRM
 """
 
-import os
 import httpx
 from typing import Optional, Dict, Any, List
-from pathlib import Path
-from dotenv import load_dotenv, set_key
-from datetime import datetime, timedelta
 
-env_path = Path(__file__).parent.parent.parent / '.env'
-load_dotenv(env_path)
+from ..config import Config
+from ..monitoring.tracing import span
+from .http import timeout_for
+from .zoho_api import ZohoAPI, ZohoAPIError, ZohoUnavailable
+from .zoho_token import ZohoTokenManager
 
 
 class ZohoCRM:
     """Zoho CRM API client"""
     
-    ACCOUNTS_URL = "https://accounts.zoho.com"
-    API_URL = "https://www.zohoapis.com/crm/v3"
+    def __init__(
+        self,
+        http: Optional[httpx.AsyncClient] = None,
+        tokens: Optional[ZohoTokenManager] = None,
+        api_url: Optional[str] = None
+    ):
+        # Share one token manager with ZohoMail where possible (see api.py)
+        self.tokens = tokens or ZohoTokenManager.from_env(http=http)
+        self.http = http
+        self.api_url = (api_url or Config.ZOHO_CRM_API_URL).rstrip('/')
+        self.api = ZohoAPI("crm", self.tokens, http)
     
-    def __init__(self):
-        self.client_id = os.getenv('ZOHO_CLIENT_ID')
-        self.client_secret = os.getenv('ZOHO_CLIENT_SECRET')
-        self.refresh_token = os.getenv('ZOHO_REFRESH_TOKEN', '').strip("'\"")
-        self.access_token = None
-        self.token_expires_at = None
+    async def _ensure_access_token(self) -> str:
+        """Get or refresh access token"""
+        return await self.tokens.get_token()
+    
+    async def _request(self, method: str, endpoint: str, data: Dict = None) -> Dict:
+        """Make authenticated API request"""
+        with span("zoho_crm", method=method, endpoint=endpoint.split('?')[0]):
+            return await self._send(method, endpoint, data)
+    
+    async def _send(self, method: str, endpoint: str, data: Dict = None) -> Dict:
+        if method not in ("GET", "POST", "PUT"):
+            raise ValueError(f"Unsupported method: {method}")
+        path = endpoint.split('?')[0]
+        return await self.api.request(
+            method,
+            f"{self.api_url}/{endpoint}",
+            operation=f"{method} {path}",
+            timeout=timeout_for("crm_read" if method == "GET" else "crm_write"),
+            json=data,
+            # An upsert matched on Email can be replayed safely; a plain create cannot
+            idempotent=method != "POST" or path.endswith("/upsert")
+        )
+    
+    # Zoho accepts at most this many records per insert/upsert call
+    MAX_RECORDS_PER_CALL = 100
+    
+    async def create_lead(self, lead_data: Dict[str, Any]) -> Dict:
+        """Create a lead in Zoho CRM"""
+        payload = {"data": [self._to_zoho_lead(lead_data)]}
+        result = await self._request("POST", "Leads", payload)
         
-        if not all([self.client_id, self.client_secret, self.refresh_token]):
-            raise ValueError("Zoho credentials not configured")
+        return result
     
-    async def _ensure_access_token(self):
-        """Get or refresh access token"""
-        if self.access_token and self.token_expires_at and datetime.now() < self.token_expires_at:
-            return self.access_token
+    async def upsert_leads(self, leads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Insert or update leads in Zoho CRM, matched on Email, in calls of up to
+        MAX_RECORDS_PER_CALL records. Leads sharing an email are sent once (the
+        most recently updated) and all of them get that record's result.
         
-        url = f"{self.ACCOUNTS_URL}/oauth/v2/token"
-        data = {
-            "grant_type": "refresh_token",
-            "client_id": self.client_id,
-            "client_secret": self.client_secret,
-            "refresh_token": self.refresh_token
-        }
+        Returns one result per input lead:
+            {"lead_id", "email", "success", "zoho_lead_id", "action", "error", "retryable"}
+        
+        retryable is True when the call itself failed transiently (no per-record verdict).
+        """
+        # Dedupe on Email, case-insensitively, keeping the newest version
+        by_email: Dict[str, Dict[str, Any]] = {}
+        lead_ids: Dict[str, List[str]] = {}
+        results: List[Dict[str, Any]] = []
+        for lead in leads:
+            email = (lead.get('email') or '').strip().lower()
+            if not email:
+                results.append(self._upsert_result(lead.get('id'), None, error="Lead has no email"))
+                continue
+            lead_ids.setdefault(email, []).append(lead.get('id'))
+            current = by_email.get(email)
+            if current is None or self._newer(lead, current):
+                by_email[email] = lead
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, data=data)
-            result = response.json()
+        emails = list(by_email)
+        for start in range(0, len(emails), self.MAX_RECORDS_PER_CALL):
+            chunk = emails[start:start + self.MAX_RECORDS_PER_CALL]
+            payload = {
+                "data": [self._to_zoho_lead(by_email[email]) for email in chunk],
+                "duplicate_check_fields": ["Email"]
+            }
+            try:
+                response = await self._request("POST", "Leads/upsert", payload)
+                records = response.get('data') or []
+                error = None if records else f"Unexpected response: {response}"
+                retryable = True
+            except ZohoAPIError as e:
+                records, error, retryable = [], str(e), e.retryable or isinstance(e, ZohoUnavailable)
+            except Exception as e:
+                records, error, retryable = [], str(e), True
+            
+            # Zoho returns per-record results in request order
+            for i, email in enumerate(chunk):
+                record = records[i] if i < len(records) else None
+                for lead_id in lead_ids[email]:
+                    results.append(self._upsert_result(lead_id, email, record, error, retryable))
         
-        if 'access_token' in result:
-            self.access_token = result['access_token']
-            expires_in = result.get('expires_in', 3600)
-            self.token_expires_at = datetime.now() + timedelta(seconds=expires_in - 60)
-            return self.access_token
-        else:
-            raise Exception(f"Failed to get access token: {result}")
+        return results
     
-    async def _request(self, method: str, endpoint: str, data: Dict = None) -> Dict:
-        """Make authenticated API request"""
-        token = await self._ensure_access_token()
-        url = f"{self.API_URL}/{endpoint}"
-        headers = {
-            "Authorization": f"Zoho-oauthtoken {token}",
-            "Content-Type": "application/json"
+    @staticmethod
+    def _newer(lead: Dict[str, Any], other: Dict[str, Any]) -> bool:
+        if lead.get('updated_at') is None:
+            return False
+        return other.get('updated_at') is None or lead['updated_at'] > other['updated_at']
+    
+    @staticmethod
+    def _upsert_result(
+        lead_id: Optional[str],
+        email: Optional[str],
+        record: Dict = None,
+        error: str = None,
+        retryable: bool = True
+    ) -> Dict[str, Any]:
+        if record is not None and record.get('status') == 'success':
+            return {
+                "lead_id": lead_id,
+                "email": email,
+                "success": True,
+                "zoho_lead_id": (record.get('details') or {}).get('id'),
+                "action": record.get('action'),
+                "error": None,
+                "retryable": False
+            }
+        retryable = retryable and record is None and email is not None
+        if record is not None:
+            error = f"{record.get('code')}: {record.get('message')}"
+        return {
+            "lead_id": lead_id,
+            "email": email,
+            "success": False,
+            "zoho_lead_id": None,
+            "action": None,
+            "error": error or "No result returned for record",
+            "retryable": retryable
         }
-        
-        async with httpx.AsyncClient() as client:
-            if method == "GET":
-                response = await client.get(url, headers=headers)
-            elif method == "POST":
-                response = await client.post(url, headers=headers, json=data)
-            elif method == "PUT":
-                response = await client.put(url, headers=headers, json=data)
-            else:
-                raise ValueError(f"Unsupported method: {method}")
-        
-        return response.json()
     
-    async def create_lead(self, lead_data: Dict[str, Any]) -> Dict:
-        """Create a lead in Zoho CRM"""
-        # Map our lead fields to Zoho fields
+    def _to_zoho_lead(self, lead_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Map our lead fields to Zoho fields (empty values dropped)"""
         zoho_lead = {
             "First_Name": lead_data.get('first_name', ''),
-            "Last_Name": lead_data.get('last_name', 'Unknown'),
+            "Last_Name": lead_data.get('last_name') or 'Unknown',
             "Email": lead_data.get('email'),
-            "Company": lead_data.get('company', 'Unknown'),
+            "Company": lead_data.get('company') or 'Unknown',
             "Phone": lead_data.get('phone', ''),
             "Website": lead_data.get('website', ''),
             "Designation": lead_data.get('job_title', ''),
-            "Lead_Source": lead_data.get('source', 'LeadQual AI'),
+            "Lead_Source": lead_data.get('source') or 'LeadQual AI',
             "Lead_Status": "Qualified",
             "Description": self._build_description(lead_data)
         }
-        
-        # Remove empty values
-        zoho_lead = {k: v for k, v in zoho_lead.items() if v}
-        
-        payload = {"data": [zoho_lead]}
-        result = await self._request("POST", "Leads", payload)
-        
-        return result
+        return {k: v for k, v in zoho_lead.items() if v}
     
     def _build_description(self, lead_data: Dict) -> str:
         """Build description from qualification data"""
@@ -3,23 +3,22 @@ Zoho OAuth Handler for LeadQual AI
 Handles OAuth 2.0 flow to get access and refresh tokens
 """
 
-import os
 import httpx
 import webbrowser
+from typing import Optional
 from urllib.parse import urlencode, parse_qs, urlparse
 from pathlib import Path
-from dotenv import load_dotenv, set_key
+from dotenv import set_key
 
-# Load environment
+from ..config import Config
+
+# Where save_refresh_token writes the single-account token
 env_path = Path(__file__).parent.parent.parent / '.env'
-load_dotenv(env_path)
 
 
 class ZohoOAuth:
     """Handle Zoho OAuth 2.0 authentication"""
     
-    ACCOUNTS_URL = "https://accounts.zoho.com"
-    
     # Scopes needed for CRM and Mail
     SCOPES = [
         "ZohoCRM.modules.ALL",
@@ -29,9 +28,10 @@ class ZohoOAuth:
         "ZohoMail.accounts.READ"
     ]
     
-    def __init__(self):
-        self.client_id = os.getenv('ZOHO_CLIENT_ID')
-        self.client_secret = os.getenv('ZOHO_CLIENT_SECRET')
+    def __init__(self, accounts_url: Optional[str] = None):
+        self.accounts_url = (accounts_url or Config.ZOHO_ACCOUNTS_URL).rstrip('/')
+        self.client_id = Config.ZOHO_CLIENT_ID
+        self.client_secret = Config.ZOHO_CLIENT_SECRET
         self.redirect_uri = "http://localhost:3000/api/auth/zoho/callback"
         
         if not self.client_id or not self.client_secret:
@@ -47,11 +47,11 @@ class ZohoOAuth:
             "scope": ",".join(self.SCOPES),
             "prompt": "consent"  # Force consent to get refresh token
         }
-        return f"{self.ACCOUNTS_URL}/oauth/v2/auth?{urlencode(params)}"
+        return f"{self.accounts_url}/oauth/v2/auth?{urlencode(params)}"
     
     def exchange_code_for_tokens(self, authorization_code: str) -> dict:
         """Exchange authorization code for access and refresh tokens"""
-        url = f"{self.ACCOUNTS_URL}/oauth/v2/token"
+        url = f"{self.accounts_url}/oauth/v2/token"
         
         data = {
             "grant_type": "authorization_code",
@@ -68,7 +68,7 @@ class ZohoOAuth:
     
     def refresh_access_token(self, refresh_token: str) -> dict:
         """Get a new access token using refresh token"""
-        url = f"{self.ACCOUNTS_URL}/oauth/v2/token"
+        url = f"{self.accounts_url}/oauth/v2/token"
         
         data = {
             "grant_type": "refresh_token",
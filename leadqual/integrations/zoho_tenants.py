@@ -0,0 +1,264 @@
+"""
+Per-tenant Zoho clients backed by the integrations table
+
+Each user's grant (refresh token) is loaded on first use; the user's
+ZohoCRM / ZohoMail pair and access token then stay warm in a bounded LRU.
+Refreshed access tokens are written back to integrations in batches.
+All tenants share the app's pooled HTTP clients.
+"""
+
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+import httpx
+from starlette.concurrency import run_in_threadpool
+
+from ..config import Config
+from ..monitoring.metrics import Counter, Gauge
+from .zoho_crm import ZohoCRM
+from .zoho_mail import ZohoMail
+from .zoho_token import TokenStore, ZohoTokenManager
+
+# One Zoho grant covers the CRM and Mail scopes (see ZohoOAuth.SCOPES)
+PROVIDER = "zoho_crm"
+
+ZOHO_TENANTS = Gauge(
+    "leadqual_zoho_tenant_clients",
+    "Per-user Zoho clients held in memory"
+)
+
+ZOHO_TENANT_LOOKUPS = Counter(
+    "leadqual_zoho_tenant_lookups_total",
+    "Per-user Zoho client lookups",
+    ("outcome",)  # hit, loaded, reloaded, fallback, not_connected
+)
+
+
+class ZohoNotConnected(LookupError):
+    """The user has no active Zoho integration"""
+
+
+class IntegrationTokenStore(TokenStore):
+    """
+    TokenStore over integrations rows. Saves are buffered and flushed in one
+    statement; a lost buffer only costs a token refresh.
+    """
+
+    def __init__(self, provider: str = PROVIDER, max_pending: int = 100):
+        self.provider = provider
+        self.max_pending = max_pending
+        self._pending: Dict[str, Dict] = {}
+        self._lock = threading.Lock()  # save/flush run in the threadpool
+
+    def load(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            pending = self._pending.get(key)
+        if pending is not None:
+            return pending
+        from ..database.models import IntegrationRepository
+
+        row = IntegrationRepository.get(key, self.provider)
+        return _token_state(row) if row else None
+
+    def save(self, key: str, state: Dict):
+        with self._lock:
+            self._pending[key] = state
+            full = len(self._pending) >= self.max_pending
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write buffered tokens back; returns rows written"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        from ..database.models import IntegrationRepository
+
+        rows = [
+            (
+                user_id,
+                state["access_token"],
+                datetime.fromtimestamp(state["expires_at"], timezone.utc),
+                state.get("account_id")
+            )
+            for user_id, state in pending.items()
+            if state.get("access_token")
+        ]
+        try:
+            return IntegrationRepository.bulk_save_tokens(self.provider, rows)
+        except Exception:
+            # Keep them for the next flush unless newer states arrived meanwhile
+            with self._lock:
+                for user_id, state in pending.items():
+                    self._pending.setdefault(user_id, state)
+            raise
+
+
+def _token_state(row: Dict) -> Dict:
+    expires_at = row.get("token_expires_at")
+    return {
+        "access_token": row.get("access_token"),
+        "expires_at": expires_at.timestamp() if expires_at else 0.0,
+        "account_id": (row.get("metadata") or {}).get("account_id")
+    }
+
+
+@dataclass
+class ZohoTenant:
+    """One user's token manager and clients"""
+    tokens: ZohoTokenManager
+    crm: ZohoCRM
+    mail: ZohoMail
+    loaded_at: float
+
+
+class ZohoClientRegistry:
+    """LRU of per-user Zoho clients, loaded from integrations on demand"""
+
+    def __init__(
+        self,
+        http_clients: Dict[str, httpx.AsyncClient],
+        store: Optional[IntegrationTokenStore] = None,
+        max_tenants: int = 1000,
+        ttl: float = 900.0,
+        flush_interval: float = 5.0,
+        fallback: Optional[ZohoTenant] = None
+    ):
+        self.http_clients = http_clients
+        self.store = store or IntegrationTokenStore()
+        self.max_tenants = max_tenants
+        self.ttl = ttl
+        self.flush_interval = flush_interval
+        self.fallback = fallback  # the env-configured account, for users without a grant
+        self._tenants: "OrderedDict[str, ZohoTenant]" = OrderedDict()
+        self._loading: Dict[str, asyncio.Task] = {}
+        self._user_ids: "OrderedDict[str, str]" = OrderedDict()  # clerk id -> users.id
+        self._task: Optional[asyncio.Task] = None
+        ZOHO_TENANTS.set_function(lambda: len(self._tenants))
+
+    async def crm(self, user_id: str) -> ZohoCRM:
+        return (await self.tenant(user_id)).crm
+
+    async def mail(self, user_id: str) -> ZohoMail:
+        return (await self.tenant(user_id)).mail
+
+    async def tenant(self, user_id: Optional[str]) -> ZohoTenant:
+        """The user's clients; raises ZohoNotConnected without a grant or fallback"""
+        tenant = self._tenants.get(user_id) if user_id else None
+        if tenant is not None and time.monotonic() - tenant.loaded_at < self.ttl:
+            self._tenants.move_to_end(user_id)
+            ZOHO_TENANT_LOOKUPS.inc(outcome="hit")
+            return tenant
+        if not user_id:
+            return self._fallback()
+
+        # One load per user however many requests arrive at once. It runs in its
+        # own task, so a caller that disconnects doesn't cancel it for the others
+        loading = self._loading.get(user_id)
+        if loading is None:
+            loading = asyncio.get_running_loop().create_task(self._load(user_id, tenant))
+            self._loading[user_id] = loading
+            loading.add_done_callback(lambda task: self._loaded(user_id, task))
+        tenant = await asyncio.shield(loading)
+        return tenant if tenant is not None else self._fallback()
+
+    def _loaded(self, user_id: str, task: asyncio.Task):
+        if self._loading.get(user_id) is task:
+            del self._loading[user_id]
+        if not task.cancelled():
+            task.exception()  # waiters re-raise it; mark as retrieved if none are left
+
+    async def clerk_user_id(self, clerk_user_id: str) -> Optional[str]:
+        """users.id for a Clerk user id (the mapping never changes, so it is cached)"""
+        user_id = self._user_ids.get(clerk_user_id)
+        if user_id is None:
+            from ..database.models import UserRepository
+
+            user_id = await run_in_threadpool(UserRepository.get_id, clerk_user_id)
+            if user_id is None:
+                return None
+            self._user_ids[clerk_user_id] = user_id
+            if len(self._user_ids) > self.max_tenants * 4:
+                self._user_ids.popitem(last=False)
+        return user_id
+
+    async def _load(self, user_id: str, stale: Optional[ZohoTenant]) -> Optional[ZohoTenant]:
+        from ..database.models import IntegrationRepository
+
+        row = await run_in_threadpool(IntegrationRepository.get, user_id, self.store.provider)
+        if row is None or not row.get("refresh_token"):
+            self._tenants.pop(user_id, None)
+            return None
+
+        if stale is not None and stale.tokens.refresh_token == row["refresh_token"]:
+            # Same grant: keep the warm token, just restart the TTL
+            stale.loaded_at = time.monotonic()
+            tenant = stale
+            ZOHO_TENANT_LOOKUPS.inc(outcome="reloaded")
+        else:
+            tokens = ZohoTokenManager(
+                Config.ZOHO_CLIENT_ID,
+                Config.ZOHO_CLIENT_SECRET,
+                row["refresh_token"],
+                http=self.http_clients.get("zoho_accounts"),
+                store=self.store,
+                key=user_id,
+                refresh_margin=Config.ZOHO_TOKEN_REFRESH_MARGIN
+            )
+            state = _token_state(row)
+            tokens.access_token, tokens.expires_at = state["access_token"], state["expires_at"]
+            tokens.account_id = state["account_id"]
+            tenant = ZohoTenant(
+                tokens=tokens,
+                crm=ZohoCRM(http=self.http_clients.get("zoho_crm"), tokens=tokens),
+                mail=ZohoMail(http=self.http_clients.get("zoho_mail"), tokens=tokens),
+                loaded_at=time.monotonic()
+            )
+            ZOHO_TENANT_LOOKUPS.inc(outcome="loaded")
+
+        self._tenants[user_id] = tenant
+        self._tenants.move_to_end(user_id)
+        while len(self._tenants) > self.max_tenants:
+            self._tenants.popitem(last=False)
+        return tenant
+
+    def _fallback(self) -> ZohoTenant:
+        if self.fallback is None:
+            ZOHO_TENANT_LOOKUPS.inc(outcome="not_connected")
+            raise ZohoNotConnected("Zoho is not connected for this user")
+        ZOHO_TENANT_LOOKUPS.inc(outcome="fallback")
+        return self.fallback
+
+    def forget(self, user_id: str):
+        """Drop a user's clients, e.g. after they reconnect Zoho"""
+        self._tenants.pop(user_id, None)
+
+    def start(self):
+        """Flush refreshed tokens to the database every flush_interval"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._flush_loop(), name="zoho-token-flush")
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        loading = list(self._loading.values())
+        for task in loading:
+            task.cancel()
+        await asyncio.gather(*loading, return_exceptions=True)
+        await run_in_threadpool(self.store.flush)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await run_in_threadpool(self.store.flush)
+            except Exception as e:
+                print(f"⚠️ Writing Zoho tokens back failed: {e}")
@@ -0,0 +1,215 @@
+"""
+Shared Zoho OAuth access-token manager for LeadQual AI
+One refresh at a time, proactive refresh before expiry, and the token plus the
+mail account id persisted so a restart does not need a new refresh
+"""
+
+import os
+import json
+import time
+import asyncio
+import tempfile
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional
+
+import httpx
+from starlette.concurrency import run_in_threadpool
+
+from ..config import Config
+from ..monitoring.metrics import ZOHO_REQUEST_DURATION, ZOHO_ERRORS, track
+from .http import client_session, timeout_for
+
+
+class TokenStore:
+    """Where a manager persists its token state (one record per key)"""
+
+    def load(self, key: str) -> Optional[Dict]:
+        return None
+
+    def save(self, key: str, state: Dict):
+        pass
+
+
+class FileTokenStore(TokenStore):
+    """JSON file of token records, written atomically and readable only by the owner"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def _read(self) -> Dict[str, Dict]:
+        try:
+            return json.loads(self.path.read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def load(self, key: str) -> Optional[Dict]:
+        return self._read().get(key)
+
+    def save(self, key: str, state: Dict):
+        records = self._read()
+        records[key] = state
+        # A unique temp file per write: every uvicorn worker may refresh at once
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f"{self.path.name}.", suffix=".tmp")  # mode 0600
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(records, f)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+class ZohoTokenManager:
+    """
+    Access token for one Zoho refresh token, shared by ZohoCRM and ZohoMail.
+    Concurrent callers wait on a single in-flight refresh.
+    """
+
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        refresh_token: str,
+        http: Optional[httpx.AsyncClient] = None,
+        store: Optional[TokenStore] = None,
+        key: str = "default",
+        refresh_margin: float = 300.0,
+        accounts_url: Optional[str] = None
+    ):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.refresh_token = refresh_token
+        self.http = http
+        self.store = store or TokenStore()
+        self.key = key
+        self.refresh_margin = refresh_margin
+        self.accounts_url = (accounts_url or Config.ZOHO_ACCOUNTS_URL).rstrip('/')
+        self.access_token: Optional[str] = None
+        self.expires_at = 0.0  # epoch seconds
+        self.lifetime = 3600.0
+        self.account_id: Optional[str] = None
+        self.refreshes = 0
+        self._lock = asyncio.Lock()
+        self._account_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._loaded = False
+        self._rejected: Optional[str] = None
+
+    @classmethod
+    def from_env(cls, **kwargs) -> "ZohoTokenManager":
+        """Manager for the ZOHO_* credentials in the environment"""
+        client_id = Config.ZOHO_CLIENT_ID
+        client_secret = Config.ZOHO_CLIENT_SECRET
+        refresh_token = Config.ZOHO_REFRESH_TOKEN
+        if not all([client_id, client_secret, refresh_token]):
+            raise ValueError("Zoho credentials not configured")
+        manager = cls(client_id, client_secret, refresh_token, **kwargs)
+        # ZOHO_MAIL_ACCOUNT_ID belongs to this grant; per-user managers keep their own
+        manager.account_id = Config.ZOHO_MAIL_ACCOUNT_ID or None
+        return manager
+
+    def _valid(self, margin: float = 0.0) -> bool:
+        return bool(self.access_token) and time.time() < self.expires_at - margin
+
+    async def get_token(self) -> str:
+        """Current access token, refreshing (once, for all waiters) if expired"""
+        if self._valid(60):
+            return self.access_token
+        async with self._lock:
+            # Another waiter may have refreshed while we queued for the lock
+            if self._valid(60):
+                return self.access_token
+            await self._load()
+            if self._valid(60):
+                return self.access_token
+            return await self._refresh()
+
+    async def invalidate(self, token: str):
+        """Drop a token the API rejected; the next get_token refreshes"""
+        self._rejected = token
+        if token == self.access_token:
+            self.access_token = None
+            self.expires_at = 0.0
+
+    async def get_account_id(self, fetch: Callable[[str], Awaitable[str]]) -> str:
+        """Mail account id, cached and persisted with the token; fetch(token) looks it up"""
+        if self.account_id:
+            return self.account_id
+        async with self._account_lock:
+            if not self.account_id:
+                self.account_id = await fetch(await self.get_token())
+                await self._save()
+        return self.account_id
+
+    async def _load(self):
+        """Adopt a persisted token (e.g. refreshed by another worker or before a restart)"""
+        state = await run_in_threadpool(self.store.load, self.key)
+        self._loaded = True
+        if not state:
+            return
+        self.account_id = self.account_id or state.get("account_id")
+        if state.get("expires_at", 0) > self.expires_at and state.get("access_token") != self._rejected:
+            self.access_token = state.get("access_token")
+            self.expires_at = state["expires_at"]
+
+    async def _save(self):
+        state = {"access_token": self.access_token, "expires_at": self.expires_at, "account_id": self.account_id}
+        await run_in_threadpool(self.store.save, self.key, state)
+
+    async def _refresh(self) -> str:
+        data = {
+            "grant_type": "refresh_token",
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+            "refresh_token": self.refresh_token
+        }
+        with track(ZOHO_REQUEST_DURATION, ZOHO_ERRORS, service="accounts", operation="token_refresh"):
+            async with client_session(self.http) as client:
+                response = await client.post(
+                    f"{self.accounts_url}/oauth/v2/token", data=data, timeout=timeout_for("token_refresh")
+                )
+                result = response.json()
+
+        if "access_token" not in result:
+            raise ValueError(f"Failed to get access token: {result}")
+
+        self.access_token = result["access_token"]
+        self.lifetime = float(result.get("expires_in", 3600))
+        self.expires_at = time.time() + self.lifetime
+        self.refreshes += 1
+        await self._save()
+        return self.access_token
+
+    def start(self):
+        """Refresh in the background shortly before each expiry"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._refresh_loop(), name=f"zoho-token-{self.key}")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _refresh_loop(self):
+        while True:
+            if not self._loaded:
+                async with self._lock:
+                    await self._load()
+            # Never refresh more often than every half token lifetime
+            margin = min(self.refresh_margin, self.lifetime / 2)
+            delay = self.expires_at - margin - time.time() if self.access_token else 0
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            if not self.access_token:
+                # Nothing to keep warm until the first caller needs a token
+                await asyncio.sleep(self.refresh_margin)
+                continue
+            try:
+                async with self._lock:
+                    if not self._valid(margin):
+                        await self._refresh()
+            except Exception as e:
+                print(f"⚠️ Background Zoho token refresh failed: {e}")
+                await asyncio.sleep(30)
@@ -0,0 +1,15 @@
+"""Monitoring module for LeadQual AI"""
+
+from .metrics import Counter, Gauge, Histogram, REGISTRY, render, track, timed
+from .tracing import span, traced, start_trace, current_trace
+from .middleware import MetricsMiddleware, TracingMiddleware
+from .profiler import ProfilerMiddleware, get_profile_store, profiling_enabled
+from .loop_monitor import LoopMonitor, start_loop_monitor, stop_loop_monitor, watch_loop
+
+__all__ = [
+    'Counter', 'Gauge', 'Histogram', 'REGISTRY', 'render', 'track', 'timed',
+    'span', 'traced', 'start_trace', 'current_trace',
+    'MetricsMiddleware', 'TracingMiddleware',
+    'ProfilerMiddleware', 'get_profile_store', 'profiling_enabled',
+    'LoopMonitor', 'start_loop_monitor', 'stop_loop_monitor', 'watch_loop'
+]
@@ -0,0 +1,41 @@
+"""
+pytest plugin that fails any test during which a handler blocked the event loop
+
+Usage:
+    pytest -p leadqual.monitoring.loop_guard --loop-block-ms 50
+
+The API's loop monitor records stalls over the limit while the app is running
+(e.g. inside `with TestClient(app)`); the test that caused one then fails.
+"""
+
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--loop-block-ms",
+        type=float,
+        default=None,
+        help="Fail tests that block the event loop longer than this many ms"
+    )
+
+
+def pytest_configure(config):
+    limit = config.getoption("--loop-block-ms")
+    if limit:
+        from ..config import Config
+
+        Config.LOOP_BLOCK_FAIL_MS = limit
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    from .loop_monitor import violations
+
+    before = len(violations)
+    result = yield
+    new = violations[before:]
+    if new:
+        del violations[before:]
+        pytest.fail("\n\n".join(event.describe() for event in new), pytrace=False)
+    return result
@@ -0,0 +1,218 @@
+"""
+Event-loop watchdog for LeadQual AI
+A heartbeat task measures loop lag; a watchdog thread notices stalls while
+they are happening and captures the stack of whatever is blocking the loop
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import threading
+import traceback
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from ..config import Config
+from .metrics import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+_PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LOOP_LAG = Histogram(
+    "leadqual_event_loop_lag_seconds",
+    "Delay between when the loop heartbeat was due and when it ran",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+LOOP_BLOCKS = Counter(
+    "leadqual_event_loop_blocks_total",
+    "Event-loop stalls over the threshold, by blocking code location",
+    ("location",)
+)
+
+
+class BlockingCallError(AssertionError):
+    """Raised in test mode when a handler blocks the loop for too long"""
+
+
+@dataclass
+class BlockingEvent:
+    """One stall of the event loop"""
+    location: str
+    task: Optional[str]
+    stack: List[str] = field(default_factory=list)
+    duration: float = 0.0
+
+    def describe(self) -> str:
+        return (
+            f"Event loop blocked for {self.duration * 1000:.0f} ms at {self.location}"
+            f" (task {self.task or 'unknown'})\n" + "".join(self.stack)
+        )
+
+
+# Stalls over LOOP_BLOCK_FAIL_MS, collected for the pytest loop guard
+violations: List[BlockingEvent] = []
+
+
+def _location(frame) -> str:
+    """Innermost frame inside leadqual, falling back to the innermost frame"""
+    innermost = frame
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_PACKAGE_DIR) and "/monitoring/" not in filename:
+            return f"{os.path.relpath(filename, _PACKAGE_DIR)}:{frame.f_lineno} {frame.f_code.co_name}"
+        frame = frame.f_back
+    code = innermost.f_code
+    return f"{os.path.basename(code.co_filename)}:{innermost.f_lineno} {code.co_name}"
+
+
+class LoopMonitor:
+    """Measure loop lag continuously and report stacks of blocking code"""
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        threshold: float = 0.1,
+        fail_threshold: Optional[float] = None
+    ):
+        self.interval = interval
+        self.threshold = threshold
+        self.fail_threshold = fail_threshold
+        self.events: List[BlockingEvent] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._last_beat = 0.0
+        self._pending: Optional[BlockingEvent] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start monitoring the running loop (call from inside it)"""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._task = self._loop.create_task(self._heartbeat(), name="loop-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._watchdog is not None:
+            self._watchdog.join()
+
+    async def _heartbeat(self):
+        while True:
+            # Measured from the previous beat, so a stall before the first run counts too
+            due = self._last_beat + self.interval
+            await asyncio.sleep(max(0.0, due - time.monotonic()))
+            now = time.monotonic()
+            lag = max(0.0, now - due)
+            self._last_beat = now
+            LOOP_LAG.observe(lag)
+            if lag > self.threshold:
+                self._record(lag)
+
+    def _watch(self):
+        # Check several times per threshold so the stack is caught mid-stall
+        period = max(self.threshold / 4, 0.005)
+        while not self._stop.wait(period):
+            stalled_for = time.monotonic() - self._last_beat - self.interval
+            if stalled_for > self.threshold and self._pending is None:
+                self._pending = self._capture()
+
+    def _capture(self) -> Optional[BlockingEvent]:
+        frame = sys._current_frames().get(self._loop_thread)
+        if frame is None:
+            return None
+        try:
+            task = asyncio.current_task(self._loop)
+            task_name = task.get_name() if task else None
+            if task is not None:
+                task_name = f"{task_name} {task.get_coro().__qualname__}"
+        except Exception:
+            task_name = None
+        return BlockingEvent(
+            location=_location(frame),
+            task=task_name,
+            stack=traceback.format_stack(frame)
+        )
+
+    def _record(self, lag: float):
+        event = self._pending or BlockingEvent(location="unknown", task=None)
+        self._pending = None
+        event.duration = lag
+        self.events.append(event)
+        LOOP_BLOCKS.inc(location=event.location)
+        logger.warning(event.describe())
+        if self.fail_threshold is not None and lag > self.fail_threshold:
+            violations.append(event)
+
+
+_monitor: Optional[LoopMonitor] = None
+
+
+async def start_loop_monitor() -> Optional[LoopMonitor]:
+    """Start the process-wide monitor configured by LOOP_* settings"""
+    global _monitor
+    if not Config.LOOP_MONITOR_ENABLED and not Config.LOOP_BLOCK_FAIL_MS:
+        return None
+    fail_ms = Config.LOOP_BLOCK_FAIL_MS
+    _monitor = LoopMonitor(
+        interval=Config.LOOP_LAG_INTERVAL_MS / 1000,
+        threshold=min(Config.LOOP_BLOCK_THRESHOLD_MS, fail_ms or Config.LOOP_BLOCK_THRESHOLD_MS) / 1000,
+        fail_threshold=fail_ms / 1000 if fail_ms else None
+    )
+    _monitor.start()
+    return _monitor
+
+
+async def stop_loop_monitor():
+    global _monitor
+    if _monitor is not None:
+        await _monitor.stop()
+        _monitor = None
+
+
+class watch_loop:
+    """
+    Async context manager for tests: raise BlockingCallError if the body
+    blocks the running loop for longer than max_ms.
+
+        async with watch_loop(max_ms=50):
+            await client.post("/api/leads/generate-email", ...)
+    """
+
+    def __init__(self, max_ms: float, interval_ms: float = 10):
+        self.monitor = LoopMonitor(
+            interval=interval_ms / 1000,
+            threshold=max_ms / 1000,
+            fail_threshold=max_ms / 1000
+        )
+
+    async def __aenter__(self):
+        self.monitor.start()
+        return self.monitor
+
+    async def __aexit__(self, exc_type, exc, tb):
+        # Give the heartbeat one tick to record a stall that ended the body
+        await asyncio.sleep(self.monitor.interval * 2)
+        await self.monitor.stop()
+        if exc_type is None:
+            blocked = [e for e in self.monitor.events if e.duration > self.monitor.fail_threshold]
+            for event in blocked:
+                if event in violations:
+                    violations.remove(event)
+            if blocked:
+                raise BlockingCallError("\n\n".join(e.describe() for e in blocked))
+        return False
@@ -0,0 +1,300 @@
+"""
+Prometheus-style metrics for LeadQual AI
+Counters and histograms are sharded per thread so the hot path never takes a lock
+"""
+
+import time
+import bisect
+import inspect
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Token counts
+TOKEN_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192)
+
+# Overhead budget, enforced by benchmarks/metrics_overhead.py
+OBSERVE_BUDGET_US = 5.0
+RENDER_BUDGET_MS = 25.0
+
+
+class _Metric:
+    """Base metric: one shard dict per thread, merged at scrape time"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[Dict] = []
+        self._shards_lock = threading.Lock()
+        REGISTRY.register(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def _shard(self) -> Dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            # Taken once per thread, never on the recording path
+            shard = {}
+            self._local.shard = shard
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def _format_labels(self, key: Tuple, extra: str = "") -> str:
+        pairs = [f'{n}="{_escape(v)}"' for n, v in zip(self.labelnames, key)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter"""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        shard = self._shard()
+        key = self._key(labels)
+        shard[key] = shard.get(key, 0) + amount
+
+    def collect(self) -> Dict[Tuple, float]:
+        totals: Dict[Tuple, float] = {}
+        for shard in list(self._shards):
+            for key, value in list(shard.items()):
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{self._format_labels(k)} {_num(v)}" for k, v in sorted(self.collect().items())]
+
+
+class Gauge(_Metric):
+    """Point-in-time value, either set directly or computed at scrape time"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._functions: Dict[Tuple, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels):
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set_function(self, fn: Callable[[], float], **labels):
+        """Evaluate fn on every scrape instead of storing a value"""
+        self._functions[self._key(labels)] = fn
+
+    def collect(self) -> Dict[Tuple, float]:
+        values = dict(self._values)
+        for key, fn in list(self._functions.items()):
+            try:
+                values[key] = fn()
+            except Exception:
+                continue
+        return values
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{self._format_labels(k)} {_num(v)}" for k, v in sorted(self.collect().items())]
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._width = len(self.buckets) + 2  # buckets, +Inf, sum
+
+    def observe(self, value: float, **labels):
+        shard = self._shard()
+        key = self._key(labels)
+        cells = shard.get(key)
+        if cells is None:
+            cells = shard[key] = [0] * self._width
+        cells[bisect.bisect_left(self.buckets, value)] += 1
+        cells[-1] += value
+
+    def collect(self) -> Dict[Tuple, List[float]]:
+        totals: Dict[Tuple, List[float]] = {}
+        for shard in list(self._shards):
+            for key, cells in list(shard.items()):
+                merged = totals.setdefault(key, [0] * self._width)
+                for i, v in enumerate(cells):
+                    merged[i] += v
+        return totals
+
+    def render(self) -> List[str]:
+        lines = []
+        for key, cells in sorted(self.collect().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, cells):
+                cumulative += count
+                le = 'le="%s"' % _num(bound)
+                lines.append(f"{self.name}_bucket{self._format_labels(key, le)} {cumulative}")
+            cumulative += cells[-2]
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{self._format_labels(key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{self._format_labels(key)} {_num(cells[-1])}")
+            lines.append(f"{self.name}_count{self._format_labels(key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Collection of metrics rendered together by /metrics"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric: {metric.name}")
+        self._metrics[metric.name] = metric
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        start = time.perf_counter()
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        METRICS_RENDER_SECONDS.set(time.perf_counter() - start)
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _num(value: float) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+REGISTRY = Registry()
+
+
+def render() -> str:
+    """Render all registered metrics in Prometheus text format"""
+    return REGISTRY.render()
+
+
+@contextmanager
+def track(histogram: Histogram, errors: Optional[Counter] = None, **labels):
+    """Time a block into histogram; count raised exceptions into errors"""
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        if errors is not None:
+            errors.inc(**labels)
+        raise
+    finally:
+        histogram.observe(time.perf_counter() - start, **labels)
+
+
+def timed(histogram: Histogram, errors: Optional[Counter] = None, **labels):
+    """Decorator form of track() for sync and async functions"""
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with track(histogram, errors, **labels):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with track(histogram, errors, **labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ============================================
+# LeadQual metrics
+# ============================================
+
+METRICS_RENDER_SECONDS = Gauge(
+    "leadqual_metrics_render_seconds",
+    "Time spent rendering the previous /metrics scrape"
+)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "leadqual_http_request_duration_seconds",
+    "API request latency by route",
+    ("method", "route", "status")
+)
+
+NOVA_REQUEST_DURATION = Histogram(
+    "leadqual_nova_request_duration_seconds",
+    "Amazon Nova chat completion latency",
+    ("model", "prompt_type")
+)
+
+NOVA_TOKENS = Histogram(
+    "leadqual_nova_tokens",
+    "Amazon Nova token usage per call",
+    ("model", "prompt_type", "kind"),
+    buckets=TOKEN_BUCKETS
+)
+
+NOVA_ERRORS = Counter(
+    "leadqual_nova_errors_total",
+    "Amazon Nova calls that raised",
+    ("model", "prompt_type")
+)
+
+DB_QUERY_DURATION = Histogram(
+    "leadqual_db_query_duration_seconds",
+    "Database latency per repository method",
+    ("method",)
+)
+
+ZOHO_REQUEST_DURATION = Histogram(
+    "leadqual_zoho_request_duration_seconds",
+    "Zoho API call latency",
+    ("service", "operation")
+)
+
+ZOHO_ERRORS = Counter(
+    "leadqual_zoho_errors_total",
+    "Zoho API calls that raised or returned an error status",
+    ("service", "operation")
+)
+
+AUTH_DURATION = Histogram(
+    "leadqual_auth_duration_seconds",
+    "Clerk token verification time",
+    ("method", "outcome")
+)
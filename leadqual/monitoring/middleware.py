@@ -0,0 +1,82 @@
+"""
+ASGI middleware for per-route request metrics and tracing
+"""
+
+import time
+
+from ..config import Config
+from .metrics import HTTP_REQUEST_DURATION
+from .tracing import start_trace, current_trace, server_timing
+
+# Scope key for the socket peer, set by leadqual.asgi before proxy headers rewrite "client"
+PEER_KEY = "leadqual.peer"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware - avoids the per-request task of BaseHTTPMiddleware"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Use the route template, not the raw path, to bound label cardinality
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=status_code
+            )
+
+
+class TracingMiddleware:
+    """Open a trace per request and report its breakdown in Server-Timing"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = None
+        for name, value in scope["headers"]:
+            if name == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+
+        peer = scope.get(PEER_KEY)
+        trusted = peer is not None and peer[0] in Config.TRACE_TRUSTED_PROXIES
+
+        with start_trace("request", traceparent, trusted, method=scope["method"], path=scope["path"]) as root:
+            trace = current_trace()
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    root.set(status=message["status"])
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", server_timing(trace, root).encode("latin-1")))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+            route = scope.get("route")
+            if route is not None:
+                root.set(route=route.path)
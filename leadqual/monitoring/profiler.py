@@ -0,0 +1,238 @@
+"""
+Opt-in sampling profiler for LeadQual AI requests
+Samples the event-loop thread's stack, stores gzipped folded stacks plus a
+rendered flame graph on local disk, and rotates old profiles away
+
+This is a loop-only profile: it shows where the loop spends CPU (handlers,
+serialization, middleware) for every request running alongside the profiled
+one. Work handed to the threadpool - Nova calls, DB queries - appears only as
+time the loop is idle in select, so use traces for that latency.
+"""
+
+import os
+import re
+import sys
+import gzip
+import time
+import html
+import hmac
+import zlib
+import random
+import asyncio
+import logging
+import threading
+from pathlib import Path
+from collections import Counter as StackCounter
+from typing import Dict, List, Optional
+
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile-request"
+_NAME_RE = re.compile(r"^[\w.-]+$")
+
+
+class SamplingProfiler:
+    """Sample one thread's Python stack at a fixed interval from a helper thread"""
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: StackCounter = StackCounter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> Dict[str, int]:
+        # No join: stop() runs on the event loop, and the lock is enough for a consistent copy
+        self._stop.set()
+        with self._lock:
+            return dict(self.stacks)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = _fold(frame)
+            with self._lock:
+                if self._stop.is_set():
+                    return
+                self.stacks[stack] += 1
+                self.samples += 1
+
+
+def _fold(frame) -> str:
+    """Collapse a frame chain into a root-first 'a;b;c' stack string"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def render_flamegraph(stacks: Dict[str, int], title: str = "LeadQual request profile") -> str:
+    """Render folded stacks as a self-contained SVG flame graph"""
+    width, row_height, min_width = 1200, 16, 0.5
+    total = sum(stacks.values()) or 1
+
+    # Build a tree of {name: [count, children]}
+    root: Dict = {}
+    for stack, count in stacks.items():
+        level = root
+        for name in stack.split(";"):
+            node = level.setdefault(name, [0, {}])
+            node[0] += count
+            level = node[1]
+
+    rects: List[tuple] = []
+    max_depth = 0
+
+    def layout(level: Dict, x: float, depth: int):
+        nonlocal max_depth
+        max_depth = max(max_depth, depth)
+        for name, (count, children) in sorted(level.items()):
+            w = count / total * width
+            if w >= min_width:
+                rects.append((x, depth, w, name, count))
+                layout(children, x, depth + 1)
+            x += w
+
+    layout(root, 0.0, 0)
+    height = (max_depth + 2) * row_height + 24
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" font-family="monospace" font-size="11">',
+        f'<text x="4" y="14">{html.escape(title)} ({total} samples)</text>'
+    ]
+    for x, depth, w, name, count in rects:
+        y = height - (depth + 1) * row_height
+        hue = 20 + (zlib.crc32(name.encode()) % 40)
+        label = html.escape(name[: int(w / 7)]) if w > 21 else ""
+        parts.append(
+            f'<g><title>{html.escape(name)} ({count} samples, {count / total:.1%})</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" height="{row_height - 1}" fill="hsl({hue},90%,60%)"/>'
+            f'<text x="{x + 2:.1f}" y="{y + 12}">{label}</text></g>'
+        )
+    parts.append("</svg>")
+    return "\n".join(parts)
+
+
+class ProfileStore:
+    """Gzipped folded stacks and SVG flame graphs on disk, newest max_files kept"""
+
+    def __init__(self, directory: str, max_files: int = 50):
+        self.directory = Path(directory)
+        self.max_files = max_files
+
+    def save(self, stacks: Dict[str, int], route: str, duration: float) -> str:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r"[^\w]+", "_", route).strip("_") or "root"
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}_{int(duration * 1000)}ms_{slug}_{os.urandom(3).hex()}"
+
+        folded = "\n".join(f"{stack} {count}" for stack, count in stacks.items())
+        with gzip.open(self.directory / f"{name}.folded.gz", "wt") as f:
+            f.write(folded)
+        with gzip.open(self.directory / f"{name}.svg.gz", "wt") as f:
+            f.write(render_flamegraph(stacks, title=f"{route} ({duration * 1000:.0f} ms)"))
+
+        self._rotate()
+        return name
+
+    def _rotate(self):
+        profiles = sorted(self.directory.glob("*.folded.gz"), key=lambda p: p.stat().st_mtime)
+        for old in profiles[:-self.max_files] if self.max_files else []:
+            stem = old.name[: -len(".folded.gz")]
+            for path in (old, self.directory / f"{stem}.svg.gz"):
+                path.unlink(missing_ok=True)
+
+    def list(self) -> List[Dict]:
+        if not self.directory.exists():
+            return []
+        entries = []
+        for path in sorted(self.directory.glob("*.folded.gz"), key=lambda p: p.stat().st_mtime, reverse=True):
+            stem = path.name[: -len(".folded.gz")]
+            entries.append({
+                "name": stem,
+                "created_at": path.stat().st_mtime,
+                "folded": f"{stem}.folded.gz",
+                "flamegraph": f"{stem}.svg.gz"
+            })
+        return entries
+
+    def path(self, filename: str) -> Optional[Path]:
+        """Resolve a stored file by name, rejecting anything outside the store"""
+        if not _NAME_RE.match(filename):
+            return None
+        path = self.directory / filename
+        return path if path.is_file() else None
+
+
+def profiling_enabled() -> bool:
+    return bool(Config.PROFILER_ADMIN_TOKEN) or Config.PROFILE_SAMPLE_RATE > 0
+
+
+_store: Optional[ProfileStore] = None
+
+
+def get_profile_store() -> ProfileStore:
+    global _store
+    if _store is None:
+        _store = ProfileStore(Config.PROFILE_DIR, Config.PROFILE_MAX_FILES)
+    return _store
+
+
+def _log_save_error(future: asyncio.Future):
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Failed to save request profile", exc_info=future.exception())
+
+
+class ProfilerMiddleware:
+    """
+    Profile requests carrying X-Profile-Request: <admin token>, or a random
+    PROFILE_SAMPLE_RATE fraction. Only installed when profiling is enabled;
+    one request is profiled at a time. Samples cover the event-loop thread
+    only (see the module docstring).
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.token = (Config.PROFILER_ADMIN_TOKEN or "").encode()
+        self.sample_rate = Config.PROFILE_SAMPLE_RATE
+        self.interval = Config.PROFILE_INTERVAL_MS / 1000
+        self._busy = threading.Lock()
+
+    def _wanted(self, scope) -> bool:
+        if self.token:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER:
+                    return hmac.compare_digest(value, self.token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._wanted(scope) or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profiler = SamplingProfiler(threading.get_ident(), self.interval)
+        start = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            stacks = profiler.stop()
+            self._busy.release()
+            if stacks:
+                route = getattr(scope.get("route"), "path", scope["path"])
+                duration = time.perf_counter() - start
+                # Write to disk off the event loop
+                saving = asyncio.get_running_loop().run_in_executor(
+                    None, get_profile_store().save, stacks, route, duration
+                )
+                saving.add_done_callback(_log_save_error)
@@ -0,0 +1,295 @@
+"""
+Lightweight request tracing for LeadQual AI
+Spans flow through contextvars; sampled traces are exported to a JSON-lines
+file or an OTLP/HTTP collector from a background thread
+"""
+
+import os
+import json
+import time
+import queue
+import random
+import inspect
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, Dict, List, Optional
+
+from ..config import Config
+
+
+@dataclass
+class Span:
+    """A timed unit of work inside a trace"""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    start_ns: int = 0
+    duration: float = 0.0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    perf_start: float = field(default=0.0, repr=False)
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "duration_ms": round(self.duration * 1000, 3),
+            "attributes": self.attributes,
+            "error": self.error
+        }
+
+
+@dataclass
+class Trace:
+    """All spans recorded for one request"""
+    trace_id: str
+    sampled: bool
+    spans: List[Span] = field(default_factory=list)
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("leadqual_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("leadqual_span", default=None)
+
+
+def _new_id(nbytes: int) -> str:
+    return os.urandom(nbytes).hex()
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def parse_traceparent(header: Optional[str]):
+    """Parse a W3C traceparent header into (trace_id, parent_id, sampled)"""
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        sampled = bool(int(parts[3], 16) & 0x01)
+    except ValueError:
+        return None
+    return parts[1], parts[2], sampled
+
+
+@contextmanager
+def start_trace(name: str, traceparent: Optional[str] = None, trusted: bool = False, **attributes):
+    """Begin a trace for a request and yield its root span
+
+    An inbound traceparent is only continued when it comes from a trusted
+    peer; anyone else gets a fresh trace id and the local sample rate.
+    """
+    parent = parse_traceparent(traceparent) if trusted else None
+    if parent:
+        trace_id, parent_id, sampled = parent
+    else:
+        trace_id, parent_id = _new_id(16), None
+        sampled = random.random() < Config.TRACE_SAMPLE_RATE
+
+    trace = Trace(trace_id=trace_id, sampled=sampled)
+    trace_token = _current_trace.set(trace)
+    try:
+        with span(name, **attributes) as root:
+            root.parent_id = parent_id
+            yield root
+    finally:
+        _current_trace.reset(trace_token)
+        if trace.sampled:
+            get_exporter().export(trace.spans)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Time a block as a child of the current span; no-op outside a trace"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+
+    parent = _current_span.get()
+    current = Span(
+        name=name,
+        trace_id=trace.trace_id,
+        span_id=_new_id(8),
+        parent_id=parent.span_id if parent else None,
+        start_ns=time.time_ns(),
+        attributes=attributes
+    )
+    token = _current_span.set(current)
+    current.perf_start = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.duration = time.perf_counter() - current.perf_start
+        _current_span.reset(token)
+        trace.spans.append(current)
+
+
+def traced(name: str, **attributes):
+    """Decorator form of span() for sync and async functions"""
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name, **attributes):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name, **attributes):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def server_timing(trace: Trace, root: Optional[Span] = None) -> str:
+    """Build a Server-Timing header value, summing durations per span name"""
+    totals: Dict[str, float] = {}
+    for s in trace.spans:
+        if s is root:
+            continue
+        totals[s.name] = totals.get(s.name, 0.0) + s.duration
+    entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in totals.items()]
+    if root is not None:
+        # The root span is still open when headers go out
+        elapsed = time.perf_counter() - root.perf_start
+        entries.append(f"total;dur={elapsed * 1000:.1f}")
+    return ", ".join(entries)
+
+
+# ============================================
+# Exporters
+# ============================================
+
+class _BatchExporter:
+    """Queue spans and flush them from a daemon thread"""
+
+    def __init__(self, batch_size: int = 256, interval: float = 2.0):
+        self.batch_size = batch_size
+        self.interval = interval
+        self._queue: "queue.SimpleQueue[Span]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, spans: List[Span]):
+        for s in spans:
+            self._queue.put(s)
+
+    def _run(self):
+        while True:
+            batch = []
+            try:
+                batch.append(self._queue.get(timeout=self.interval))
+                while len(batch) < self.batch_size:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            if batch:
+                try:
+                    self.write(batch)
+                except Exception as e:
+                    print(f"⚠️  Trace export failed: {e}")
+
+    def write(self, spans: List[Span]):
+        raise NotImplementedError
+
+
+class FileExporter(_BatchExporter):
+    """Append spans as JSON lines to a local file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        super().__init__()
+
+    def write(self, spans: List[Span]):
+        with open(self.path, "a") as f:
+            for s in spans:
+                f.write(json.dumps(s.to_dict(), default=str) + "\n")
+
+
+class OTLPExporter(_BatchExporter):
+    """POST spans to an OTLP/HTTP JSON collector"""
+
+    def __init__(self, endpoint: str, service_name: str = "leadqual-api"):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        super().__init__()
+
+    def write(self, spans: List[Span]):
+        import httpx
+
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attr("service.name", self.service_name)]},
+                "scopeSpans": [{
+                    "scope": {"name": "leadqual"},
+                    "spans": [self._to_otlp(s) for s in spans]
+                }]
+            }]
+        }
+        httpx.post(self.endpoint, json=payload, timeout=5.0)
+
+    @staticmethod
+    def _to_otlp(s: Span) -> Dict:
+        otlp = {
+            "traceId": s.trace_id,
+            "spanId": s.span_id,
+            "name": s.name,
+            "kind": 1,
+            "startTimeUnixNano": str(s.start_ns),
+            "endTimeUnixNano": str(s.start_ns + int(s.duration * 1e9)),
+            "attributes": [_otlp_attr(k, v) for k, v in s.attributes.items()],
+            "status": {"code": 2, "message": s.error} if s.error else {"code": 1}
+        }
+        if s.parent_id:
+            otlp["parentSpanId"] = s.parent_id
+        return otlp
+
+
+class _NullExporter:
+    def export(self, spans: List[Span]):
+        pass
+
+
+def _otlp_attr(key: str, value: Any) -> Dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+_exporter = None
+_exporter_lock = threading.Lock()
+
+
+def get_exporter():
+    """Exporter configured by TRACE_EXPORTER, created on first sampled trace"""
+    global _exporter
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                if Config.TRACE_EXPORTER == "otlp":
+                    _exporter = OTLPExporter(Config.OTLP_ENDPOINT)
+                elif Config.TRACE_EXPORTER == "file":
+                    _exporter = FileExporter(Config.TRACE_FILE)
+                else:
+                    _exporter = _NullExporter()
+    return _exporter
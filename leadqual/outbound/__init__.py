@@ -0,0 +1,6 @@
+"""Outbound email queue for LeadQual AI"""
+
+from .queue import EmailOutbox, get_email_outbox, start_email_outbox, stop_email_outbox
+from .throttle import KeyedPacer
+
+__all__ = ['EmailOutbox', 'get_email_outbox', 'start_email_outbox', 'stop_email_outbox', 'KeyedPacer']
@@ -0,0 +1,204 @@
+"""
+Durable outbound email queue on the email_logs table
+
+The API inserts a pending row and returns; workers lease due rows with
+SKIP LOCKED, pace sends per sender and per recipient domain, and record
+the outcome. Delivery is at-least-once: a worker that dies after Zoho
+accepted a message but before marking it sent leaves it to be resent
+when its lease expires.
+"""
+
+import random
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from ..integrations.zoho_api import ZohoAPIError, ZohoUnavailable
+from ..integrations.zoho_mail import ZohoMail
+from ..integrations.zoho_tenants import ZohoNotConnected
+from ..monitoring.metrics import Counter, Gauge, Histogram
+from .throttle import KeyedPacer
+
+EMAIL_QUEUE_DEPTH = Gauge(
+    "leadqual_email_queue_depth",
+    "Queued outbound emails by state",
+    ("state",)  # due, scheduled, sending
+)
+
+EMAIL_SENDS = Counter(
+    "leadqual_email_sends_total",
+    "Outbound email send attempts by outcome",
+    ("outcome",)  # sent, retried, failed, deferred
+)
+
+EMAIL_QUEUE_LATENCY = Histogram(
+    "leadqual_email_queue_latency_seconds",
+    "Time from enqueue to accepted by Zoho",
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0)
+)
+
+
+def _domain(address: str) -> str:
+    return address.rsplit("@", 1)[-1].strip().lower()
+
+
+class EmailOutbox:
+    """Worker pool draining pending email_logs rows through Zoho Mail"""
+
+    def __init__(
+        self,
+        mail_for_user: Callable[[Optional[str]], Awaitable[ZohoMail]],
+        workers: int = 4,
+        claim_batch: int = 5,
+        poll_interval: float = 2.0,
+        lease_seconds: float = 120.0,
+        max_attempts: int = 6,
+        retry_base: float = 30.0,
+        retry_max: float = 3600.0,
+        sender_rate: float = 1.0,
+        domain_rate: float = 5.0,
+        defer_after: float = 2.0
+    ):
+        self.mail_for_user = mail_for_user
+        self.workers = workers
+        self.claim_batch = claim_batch
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.senders = KeyedPacer(sender_rate)
+        self.domains = KeyedPacer(domain_rate)
+        self.defer_after = defer_after
+        self._wake = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    def notify(self):
+        """Wake idle workers (an email was just queued)"""
+        self._wake.set()
+
+    def start(self):
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._work(), name=f"email-worker-{i}") for i in range(self.workers)]
+        self._tasks.append(loop.create_task(self._report_depth(), name="email-queue-depth"))
+
+    async def stop(self):
+        """Cancel workers; rows they hold go back to the queue when their lease ends"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _work(self):
+        from ..database.models import EmailLogRepository
+
+        while True:
+            try:
+                rows = await run_in_threadpool(EmailLogRepository.claim, self.claim_batch, self.lease_seconds)
+            except Exception as e:
+                print(f"❌ Claiming queued emails failed: {e}")
+                rows = []
+            for row in rows:
+                try:
+                    await self._deliver(row)
+                except Exception as e:
+                    # Left in 'sending'; it is retried when the lease runs out
+                    print(f"❌ Delivering email {row['id']} failed: {e}")
+            if len(rows) < self.claim_batch:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _deliver(self, row: Dict[str, Any]):
+        from ..database.models import EmailLogRepository
+
+        email_id = row["id"]
+        sender = row["from_address"] or f"user:{row['user_id']}"
+        domain = _domain(row["to_email"])
+
+        # Don't hold a worker for a throttled key; hand the row back instead
+        wait = max(self.senders.delay(sender), self.domains.delay(domain))
+        if wait > self.defer_after:
+            await run_in_threadpool(EmailLogRepository.mark_retry, email_id, None, wait, False)
+            EMAIL_SENDS.inc(outcome="deferred")
+            return
+        wait = max(self.senders.reserve(sender), self.domains.reserve(domain))
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        try:
+            mail = await self.mail_for_user(row["user_id"])
+            result = await mail.send_email(
+                to_address=row["to_email"],
+                subject=row["subject"],
+                html_content=row["body"],
+                from_address=row["from_address"],
+                cc=row["cc"],
+                bcc=row["bcc"]
+            )
+        except Exception as e:
+            await self._failed(row, e)
+            return
+
+        message_id = (result.get("data") or {}).get("messageId") if isinstance(result, dict) else None
+        await run_in_threadpool(EmailLogRepository.mark_sent, email_id, message_id)
+        EMAIL_SENDS.inc(outcome="sent")
+        created_at = row.get("created_at")
+        if created_at is not None:
+            EMAIL_QUEUE_LATENCY.observe((datetime.now(timezone.utc) - created_at).total_seconds())
+
+    async def _failed(self, row: Dict[str, Any], error: Exception):
+        from ..database.models import EmailLogRepository
+
+        if isinstance(error, ZohoNotConnected):
+            retryable = False  # retrying can't connect the user's Zoho account
+        else:
+            retryable = not isinstance(error, ZohoAPIError) or error.retryable or isinstance(error, ZohoUnavailable)
+        if not retryable or row["attempts"] >= self.max_attempts:
+            await run_in_threadpool(EmailLogRepository.mark_failed, row["id"], str(error))
+            EMAIL_SENDS.inc(outcome="failed")
+            print(f"❌ Email {row['id']} to {row['to_email']} failed: {error}")
+            return
+        delay = min(self.retry_max, self.retry_base * 2 ** (row["attempts"] - 1)) * random.uniform(0.5, 1.0)
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after:
+            delay = max(delay, retry_after)
+        await run_in_threadpool(EmailLogRepository.mark_retry, row["id"], str(error), delay)
+        EMAIL_SENDS.inc(outcome="retried")
+
+    async def _report_depth(self):
+        from ..database.models import EmailLogRepository
+
+        while True:
+            try:
+                depth = await run_in_threadpool(EmailLogRepository.queue_depth)
+                for state, count in depth.items():
+                    EMAIL_QUEUE_DEPTH.set(count, state=state)
+            except Exception as e:
+                print(f"⚠️ Reading email queue depth failed: {e}")
+            await asyncio.sleep(max(self.poll_interval, 5.0))
+
+
+_outbox: Optional[EmailOutbox] = None
+
+
+def get_email_outbox() -> Optional[EmailOutbox]:
+    return _outbox
+
+
+def start_email_outbox(mail_for_user: Callable[[Optional[str]], Awaitable[ZohoMail]], **options) -> EmailOutbox:
+    global _outbox
+    _outbox = EmailOutbox(mail_for_user, **options)
+    _outbox.start()
+    return _outbox
+
+
+async def stop_email_outbox():
+    global _outbox
+    if _outbox is not None:
+        await _outbox.stop()
+        _outbox = None
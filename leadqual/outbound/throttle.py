@@ -0,0 +1,34 @@
+"""
+Per-key send pacing for the outbound email queue
+Keys are senders and recipient domains; each gets at most `rate` sends per second
+"""
+
+import time
+from collections import OrderedDict
+
+
+class KeyedPacer:
+    """Minimum spacing between sends that share a key"""
+
+    def __init__(self, rate: float, max_keys: int = 10_000):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.max_keys = max_keys
+        self._next: "OrderedDict[str, float]" = OrderedDict()
+
+    def delay(self, key: str) -> float:
+        """Seconds until key may send again, without reserving a slot"""
+        if not self.interval:
+            return 0.0
+        return max(0.0, self._next.get(key, 0.0) - time.monotonic())
+
+    def reserve(self, key: str) -> float:
+        """Take key's next slot; returns how long to wait for it"""
+        if not self.interval:
+            return 0.0
+        now = time.monotonic()
+        slot = max(now, self._next.get(key, 0.0))
+        self._next[key] = slot + self.interval
+        self._next.move_to_end(key)
+        while len(self._next) > self.max_keys:
+            self._next.popitem(last=False)
+        return slot - now
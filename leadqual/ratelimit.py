@@ -0,0 +1,237 @@
+"""
+Per-user sliding-window rate limiting for LeadQual AI
+Limits come from the user's subscription tier (Config.TIERS requests_per_minute)
+"""
+
+import math
+import time
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from fastapi import Depends, HTTPException, Response, status
+from starlette.concurrency import run_in_threadpool
+
+from .config import Config
+from .auth import clerk_auth, ClerkUser
+from .monitoring.metrics import Counter
+
+RATE_LIMITED = Counter(
+    "leadqual_rate_limited_total",
+    "Requests rejected by the per-user rate limiter",
+    ("tier",)
+)
+
+
+@dataclass
+class Decision:
+    """Outcome of one rate-limit check"""
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float = 0.0
+
+
+def _decide(previous: int, current: int, window_start: float, now: float, window: float, limit: int, cost: int) -> Decision:
+    """
+    Sliding-window counter: the previous fixed window is weighted by how much
+    of it still overlaps the sliding window ending now
+    """
+    overlap = 1.0 - (now - window_start) / window
+    estimated = previous * overlap + current
+    if estimated + cost <= limit:
+        return Decision(True, limit, max(0, int(limit - estimated - cost)))
+
+    # Earliest time the estimate falls far enough, in this window or the next
+    room = limit - current - cost
+    if previous > 0 and room >= 0:
+        wait = (overlap - room / previous) * window
+    else:
+        wait = window_start + window - now
+        if current > 0 and cost <= limit:
+            wait += (1.0 - (limit - cost) / current) * window
+        elif cost > limit:
+            wait += window
+    return Decision(False, limit, 0, max(wait, 0.0))
+
+
+class MemoryBackend:
+    """
+    Per-process counters: O(1) per hit, LRU-bounded to max_keys users.
+    With several workers each process enforces the limit on its own share.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        # key -> [window_start, previous_count, current_count]
+        self._windows: "OrderedDict[str, list]" = OrderedDict()
+
+    async def hit(self, key: str, limit: int, window: float, cost: int = 1) -> Decision:
+        now = time.time()
+        window_start = now - now % window
+        entry = self._windows.get(key)
+        if entry is None:
+            entry = [window_start, 0, 0]
+            self._windows[key] = entry
+            if len(self._windows) > self.max_keys:
+                self._windows.popitem(last=False)
+        else:
+            self._windows.move_to_end(key)
+            if entry[0] != window_start:
+                # Roll forward; a gap of more than one window forgets everything
+                previous = entry[2] if window_start - entry[0] == window else 0
+                entry[:] = [window_start, previous, 0]
+
+        decision = _decide(entry[1], entry[2], window_start, now, window, limit, cost)
+        if decision.allowed:
+            entry[2] += cost
+        return decision
+
+
+class PostgresBackend:
+    """Counters in the rate_limit_windows table, shared by every worker"""
+
+    def __init__(self):
+        # Lazy: keeps psycopg2 out of worker startup
+        from .database.models import RateLimitRepository
+        self.repo = RateLimitRepository
+
+    async def hit(self, key: str, limit: int, window: float, cost: int = 1) -> Decision:
+        now = time.time()
+        window_start = now - now % window
+        previous, current = await run_in_threadpool(self.repo.add, key, window_start, window, cost)
+        decision = _decide(previous, current - cost, window_start, now, window, limit, cost)
+        if not decision.allowed:
+            # Rejected attempts do not count against the window
+            await run_in_threadpool(self.repo.add, key, window_start, window, -cost)
+        return decision
+
+    async def purge(self):
+        await run_in_threadpool(self.repo.purge_expired)
+
+
+class TierCache:
+    """clerk_user_id -> subscription tier, cached with TTL and LRU bound"""
+
+    def __init__(self, ttl: float, max_entries: int = 100_000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # (tier, expires_at)
+
+    async def get(self, clerk_user_id: str) -> str:
+        cached = self._entries.get(clerk_user_id)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+        tier = await self._load(clerk_user_id)
+        self._entries[clerk_user_id] = (tier, time.monotonic() + self.ttl)
+        self._entries.move_to_end(clerk_user_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return tier
+
+    async def _load(self, clerk_user_id: str) -> str:
+        if not Config.DATABASE_URL:
+            return Config.RATE_LIMIT_DEFAULT_TIER
+        try:
+            from .database.models import UserRepository
+            tier = await run_in_threadpool(UserRepository.get_tier, clerk_user_id)
+        except Exception as e:
+            print(f"⚠️ Tier lookup failed for {clerk_user_id}: {e}")
+            tier = None
+        return tier if tier in Config.TIERS else Config.RATE_LIMIT_DEFAULT_TIER
+
+
+class RateLimiter:
+    """Check a user's requests against their tier's per-minute limit"""
+
+    def __init__(self, backend, tiers: TierCache, window: float = 60.0):
+        self.backend = backend
+        self.tiers = tiers
+        self.window = window
+
+    async def check(self, user_id: str, cost: int = 1, count_rejection: bool = True) -> Decision:
+        tier = await self.tiers.get(user_id)
+        limit = Config.get_tier_rate_limit(tier)
+        decision = await self.backend.hit(user_id, limit, self.window, cost)
+        if not decision.allowed and count_rejection:
+            RATE_LIMITED.inc(tier=tier)
+        return decision
+
+    async def purge(self):
+        """Delete expired shared windows (in-memory counters are LRU-bounded instead)"""
+        purge = getattr(self.backend, "purge", None)
+        if purge is not None:
+            await purge()
+
+
+_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    global _limiter
+    if _limiter is None:
+        backend = PostgresBackend() if Config.RATE_LIMIT_BACKEND == "postgres" else MemoryBackend(Config.RATE_LIMIT_MAX_KEYS)
+        _limiter = RateLimiter(
+            backend,
+            TierCache(Config.RATE_LIMIT_TIER_TTL, Config.RATE_LIMIT_MAX_KEYS),
+            window=Config.RATE_LIMIT_WINDOW_SECONDS
+        )
+    return _limiter
+
+
+def _headers(decision: Decision) -> Dict[str, str]:
+    headers = {
+        "X-RateLimit-Limit": str(decision.limit),
+        "X-RateLimit-Remaining": str(decision.remaining)
+    }
+    if not decision.allowed:
+        headers["Retry-After"] = str(max(1, math.ceil(decision.retry_after)))
+    return headers
+
+
+async def enforce_rate_limit(user: ClerkUser, cost: int = 1, response: Optional[Response] = None) -> Dict[str, str]:
+    """Count cost requests for the user, raising 429 with Retry-After when over the limit; returns the rate-limit headers"""
+    if not Config.RATE_LIMIT_ENABLED:
+        return {}
+    decision = await get_rate_limiter().check(user.user_id, cost)
+    if not decision.allowed and cost > decision.limit:
+        # Waiting would never help: the request alone is over the tier's limit
+        raise HTTPException(
+            status_code=413,
+            detail=f"Request costs {cost} but your tier allows {decision.limit} per window"
+        )
+    if not decision.allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded",
+            headers=_headers(decision)
+        )
+    if response is not None:
+        response.headers.update(_headers(decision))
+    return _headers(decision)
+
+
+async def wait_for_rate_limit(user: ClerkUser, cost: int = 1):
+    """Wait until cost fits in the user's window, then count it - paces long batches instead of rejecting them"""
+    if not Config.RATE_LIMIT_ENABLED:
+        return
+    limiter = get_rate_limiter()
+    while True:
+        decision = await limiter.check(user.user_id, cost, count_rejection=False)
+        if decision.allowed:
+            return
+        await asyncio.sleep(max(decision.retry_after, 0.05))
+
+
+async def rate_limited_user(response: Response, user: ClerkUser = Depends(clerk_auth)) -> ClerkUser:
+    """
+    clerk_auth plus the per-user rate limit.
+    
+    Usage:
+        @app.get("/api/leads")
+        async def list_leads(user: ClerkUser = Depends(rate_limited_user)):
+            ...
+    """
+    await enforce_rate_limit(user, response=response)
+    return user
@@ -0,0 +1,44 @@
+"""
+Response helpers for LeadQual AI
+Uses orjson when installed (production serving) and the stdlib otherwise
+"""
+
+import json
+from typing import Any, Tuple
+
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize to compact JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=str, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when available"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class SelectiveGZipMiddleware:
+    """GZip only responses under the given path prefixes (large list/export payloads)"""
+
+    def __init__(self, app, prefixes: Tuple[str, ...], minimum_size: int = 1024, compresslevel: int = 5):
+        self.app = app
+        self.prefixes = tuple(prefixes)
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size, compresslevel=compresslevel)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith(self.prefixes):
+            await self.gzip(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
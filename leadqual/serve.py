@@ -0,0 +1,71 @@
+"""
+Serving entry point for the LeadQual API
+
+Usage:
+    python -m leadqual.serve                                  # development: 1 worker
+    python -m leadqual.serve --mode production --workers 4    # multi-worker, uvloop/httptools
+
+Production mode runs several worker processes; each one runs the app lifespan
+and so builds its own shared clients. uvloop, httptools and orjson are used
+when installed and fall back to asyncio, h11 and json otherwise.
+"""
+
+import os
+import argparse
+import importlib.util
+
+
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def serve(
+    mode: str = "development",
+    host: str = "0.0.0.0",
+    port: int = 8000,
+    workers: int = 0,
+    app: str = "leadqual.asgi:app"
+):
+    """Run the API with uvicorn in the given serving mode"""
+    # Workers import the app fresh, so the mode travels through the environment
+    os.environ["SERVING_MODE"] = mode
+
+    import uvicorn
+    from .config import Config
+
+    if mode != "production":
+        print(f"🚀 Serving {app} on {host}:{port} (development, 1 worker)")
+        uvicorn.run(app, host=host, port=port, proxy_headers=False)
+        return
+
+    workers = workers or Config.WEB_CONCURRENCY
+    loop = "uvloop" if _available("uvloop") else "asyncio"
+    http = "httptools" if _available("httptools") else "h11"
+    print(f"🚀 Serving {app} on {host}:{port} (production, {workers} workers, loop={loop}, http={http})")
+    uvicorn.run(
+        app,
+        host=host,
+        port=port,
+        workers=workers,
+        loop=loop,
+        http=http,
+        access_log=False,
+        proxy_headers=False,  # leadqual.asgi applies them after recording the peer
+        timeout_keep_alive=30,
+        backlog=2048
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the LeadQual API")
+    parser.add_argument("--mode", choices=("development", "production"), default=os.getenv("SERVING_MODE", "development"))
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (default: WEB_CONCURRENCY or CPU count)")
+    parser.add_argument("--app", default="leadqual.asgi:app", help="ASGI app import string")
+    args = parser.parse_args()
+    serve(args.mode, args.host, args.port, args.workers, args.app)
+
+
+if __name__ == "__main__":
+    main()
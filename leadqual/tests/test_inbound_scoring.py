@@ -0,0 +1,93 @@
+"""
+Inbound replies from the webhook through the real repository queries
+
+Needs a scratch Postgres database: LEADQUAL_TEST_DATABASE_URL=postgresql://... pytest leadqual/tests
+"""
+
+import os
+import uuid
+import asyncio
+
+import pytest
+
+TEST_DATABASE_URL = os.getenv("LEADQUAL_TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="LEADQUAL_TEST_DATABASE_URL is not set")
+
+
+@pytest.fixture
+def tenant(monkeypatch):
+    """A users row (by Clerk id) with one lead, removed afterwards"""
+    from leadqual import api
+    from leadqual.config import Config
+    from leadqual.database.connection import execute_insert, execute_query, init_database
+
+    monkeypatch.setattr(Config, "DATABASE_URL", TEST_DATABASE_URL)
+    monkeypatch.setattr(Config, "INBOUND_WEBHOOK_SECRET", "test-secret")
+    monkeypatch.setattr(Config, "ZOHO_REFRESH_TOKEN", None)
+    monkeypatch.setattr(api, "zoho_registry", None)
+    init_database()
+
+    clerk_user_id = f"user_{uuid.uuid4().hex}"
+    user = execute_insert(
+        "INSERT INTO users (clerk_user_id, email) VALUES (%s, %s) RETURNING id",
+        (clerk_user_id, f"{clerk_user_id}@example.com")
+    )
+    execute_insert(
+        "INSERT INTO leads (user_id, email) VALUES (%s, %s) RETURNING id",
+        (user["id"], "lead@example.com")
+    )
+    yield clerk_user_id, str(user["id"])
+    execute_query("DELETE FROM users WHERE id = %s", (user["id"],), fetch=False)
+
+
+class CapturingQueue:
+    def __init__(self):
+        self.replies = []
+
+    def submit(self, reply):
+        self.replies.append(reply)
+        return "queued"
+
+
+class StubAgent:
+    def analyze_response(self, response_text, current_scores=None, previous_analysis=""):
+        return {
+            "budget_score": 20, "authority_score": 15, "need_score": 25, "timeline_score": 10,
+            "total_score": 70, "analysis": "Budget approved for Q3", "status": "qualifying"
+        }
+
+
+def test_webhook_reply_is_scored_against_the_lead(tenant, monkeypatch):
+    from fastapi.testclient import TestClient
+    from leadqual import api
+    from leadqual.inbound import TOKEN_HEADER, score_reply, webhook_token
+    from leadqual.database.models import LeadRepository
+
+    clerk_user_id, users_id = tenant
+    queue = CapturingQueue()
+    monkeypatch.setattr(api, "get_reply_queue", lambda: queue)
+
+    message = (
+        "From: Lead <lead@example.com>\r\n"
+        f"Message-ID: <{uuid.uuid4().hex}@example.com>\r\n"
+        "Subject: Re: Quick question\r\n\r\n"
+        "We have budget approved for Q3.\r\n"
+    ).encode()
+    response = TestClient(api.app).post(
+        f"/webhooks/inbound-email/{clerk_user_id}",
+        content=message,
+        headers={"Content-Type": "message/rfc822", TOKEN_HEADER: webhook_token(clerk_user_id)}
+    )
+    assert response.status_code == 202, response.text
+
+    reply, = queue.replies
+    assert reply.user_id == users_id  # leads.user_id is users.id, never the Clerk id
+
+    assert asyncio.run(score_reply(reply, StubAgent)) == "scored"
+    lead = LeadRepository.get_by_email(users_id, "lead@example.com")
+    assert lead.score == 70
+    assert lead.qualification_data["scores"]["need"] == 25
+
+    # The Message-ID is claimed once scored
+    assert asyncio.run(score_reply(reply, StubAgent)) == "duplicate"
@@ -0,0 +1,47 @@
+"""
+Per-tenant Zoho clients keep their own mail account id
+"""
+
+import asyncio
+
+import pytest
+
+from leadqual.config import Config
+from leadqual.database import models
+from leadqual.integrations.zoho_tenants import ZohoClientRegistry
+from leadqual.integrations.zoho_token import ZohoTokenManager
+
+ROWS = {
+    "user-a": {"refresh_token": "refresh-a", "access_token": "token-a", "metadata": {"account_id": "acct-a"}},
+    "user-b": {"refresh_token": "refresh-b", "access_token": "token-b", "metadata": {"account_id": "acct-b"}},
+}
+
+
+@pytest.fixture
+def env_account(monkeypatch):
+    monkeypatch.setattr(Config, "ZOHO_CLIENT_ID", "id")
+    monkeypatch.setattr(Config, "ZOHO_CLIENT_SECRET", "secret")
+    monkeypatch.setattr(Config, "ZOHO_REFRESH_TOKEN", "refresh-env")
+    monkeypatch.setattr(Config, "ZOHO_MAIL_ACCOUNT_ID", "acct-env")
+    monkeypatch.setattr(
+        models.IntegrationRepository, "get",
+        staticmethod(lambda user_id, provider: {"user_id": user_id, "token_expires_at": None, **ROWS[user_id]})
+    )
+    return "acct-env"
+
+
+async def _no_lookup(token: str) -> str:
+    raise AssertionError("account id should not be looked up")
+
+
+def test_tenants_keep_their_account_id(env_account):
+    async def account_ids():
+        registry = ZohoClientRegistry({})
+        mails = [await registry.mail("user-a"), await registry.mail("user-b")]
+        return [await mail.tokens.get_account_id(_no_lookup) for mail in mails]
+
+    assert asyncio.run(account_ids()) == ["acct-a", "acct-b"]
+
+
+def test_env_manager_uses_env_account_id(env_account):
+    assert ZohoTokenManager.from_env().account_id == env_account
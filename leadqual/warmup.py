@@ -0,0 +1,53 @@
+"""
+Startup warm-up for LeadQual AI workers
+Runs named async steps with bounded parallelism and tracks readiness
+"""
+
+import time
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+Step = Tuple[str, Callable[[], Awaitable[Optional[bool]]]]
+
+
+class WarmUp:
+    """
+    Run warm-up steps at most `concurrency` at a time. A step returns False
+    when it does not apply (e.g. credentials not configured) and raises on
+    failure; either way the worker becomes ready once every step has finished.
+    """
+
+    def __init__(self, steps: List[Step], concurrency: int = 4, step_timeout: float = 15.0):
+        self.steps = steps
+        self.concurrency = concurrency
+        self.step_timeout = step_timeout
+        self.results: Dict[str, Dict] = {}
+        self.ready = asyncio.Event()
+
+    async def run(self):
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run_step(name: str, step):
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    applied = await asyncio.wait_for(step(), self.step_timeout)
+                    status = "skipped" if applied is False else "ok"
+                    error = None
+                except Exception as e:
+                    status, error = "failed", f"{type(e).__name__}: {e}"
+                self.results[name] = {
+                    "status": status,
+                    "ms": round((time.perf_counter() - start) * 1000, 1)
+                }
+                if error:
+                    self.results[name]["error"] = error
+                    print(f"⚠️ Warm-up step {name} failed: {error}")
+
+        try:
+            await asyncio.gather(*(run_step(name, step) for name, step in self.steps))
+        finally:
+            self.ready.set()
+
+    def status(self) -> Dict:
+        return {"ready": self.ready.is_set(), "steps": self.results}
@@ -0,0 +1,178 @@
+"""
+Time grounded_planet_research end to end: original vs pipelined
+
+Runs both versions offline against a stubbed Nova chat completions endpoint
+on localhost, which sleeps to simulate grounded and plain calls (plus prefill
+time per 1,000 prompt characters). Nova Act is replaced by a simulated
+browser session whose extraction time varies per planet (the same planets are
+slow in every version), and the extraction cache is disabled so every run
+does the same work.
+
+Usage:
+    python benchmark_grounded_research.py [--planets 4] [--extract-s 3] [--jitter 0.5]
+        [--grounded-s 2] [--plain-s 0.5] [--ms-per-kchar 50] [--runs 1]
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import random
+import types
+import asyncio
+import argparse
+import threading
+import contextlib
+import importlib.util
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SEPARATOR = "=" * 80
+
+
+class StubNova:
+    """Latency model and call log for the stubbed endpoint"""
+
+    def __init__(self, grounded_s: float, plain_s: float, ms_per_kchar: float):
+        self.grounded_s = grounded_s
+        self.plain_s = plain_s
+        self.ms_per_kchar = ms_per_kchar
+        self.calls = 0
+        self.prompt_chars = 0
+        self._lock = threading.Lock()
+
+    def respond(self, body: dict) -> dict:
+        prompt = "".join(m.get("content") or "" for m in body.get("messages", []))
+        grounded = "nova_grounding" in body.get("system_tools", [])
+        with self._lock:
+            self.calls += 1
+            self.prompt_chars += len(prompt)
+        time.sleep((self.grounded_s if grounded else self.plain_s) + len(prompt) / 1000 * self.ms_per_kchar / 1000)
+        content = ("Comparable to Kepler-442b: similar distance band and temperate conditions. " * 8
+                   if grounded else "Insight: fiction favours extremes that real surveys rarely confirm. " * 3)
+        return {
+            "id": "stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4,
+                      "total_tokens": (len(prompt) + len(content)) // 4}
+        }
+
+
+def serve_stub(stub: StubNova) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            payload = json.dumps(stub.respond(body)).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def simulated_nova_act(extract_s: float, jitter: float, seed: int = 7):
+    """A NovaAct stand-in taking about extract_s per planet, +/- jitter, fixed per planet"""
+    rng = random.Random(seed)
+    factors = {}
+
+    class SimulatedNovaAct:
+        def __init__(self, starting_page: str, **kwargs):
+            self.planet = None
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def act(self, prompt: str) -> str:
+            if "Details" in prompt:
+                self.planet = prompt.split("for the ", 1)[1].split(" planet", 1)[0]
+                if self.planet not in factors:
+                    factors[self.planet] = 1 + rng.uniform(-jitter, jitter)
+            # three acts per planet: navigate, open details, extract
+            time.sleep(extract_s / 3 * factors.get(self.planet, 1.0))
+            return f"Planet ({self.planet}): name Zephyria, 42 light years away, gale-force winds. " * 6
+
+    return SimulatedNovaAct
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Original vs pipelined grounded planet research")
+    parser.add_argument("--planets", type=int, default=4)
+    parser.add_argument("--extract-s", type=float, default=3.0, help="Simulated Nova Act time per planet")
+    parser.add_argument("--jitter", type=float, default=0.5, help="Per-planet extraction time spread (fraction)")
+    parser.add_argument("--grounded-s", type=float, default=2.0, help="Stub latency of a grounded call")
+    parser.add_argument("--plain-s", type=float, default=0.5, help="Stub latency of a plain call")
+    parser.add_argument("--ms-per-kchar", type=float, default=50.0, help="Stub prefill time per 1,000 prompt chars")
+    parser.add_argument("--runs", type=int, default=1)
+    args = parser.parse_args()
+
+    stub = StubNova(args.grounded_s, args.plain_s, args.ms_per_kchar)
+    server = serve_stub(stub)
+
+    # Point the agent at the stub before it builds its clients
+    os.environ.update(
+        NOVA_API_KEY="stub",
+        NOVA_BASE_URL=f"http://127.0.0.1:{server.server_address[1]}/v1",
+        PLANET_CACHE_DIR="",
+        PLANET_COUNT=str(args.planets),
+        PLANET_MAX_SESSIONS=str(args.planets)
+    )
+    if importlib.util.find_spec("nova_act") is None:
+        sys.modules["nova_act"] = types.SimpleNamespace(NovaAct=None)
+    import planet_extraction
+    import grounded_planet_research as research
+
+    planet_extraction.NovaAct = simulated_nova_act(args.extract_s, args.jitter)
+
+    def original(extraction_mode: str):
+        planet_extraction.PLANET_EXTRACTION = extraction_mode
+        research.grounded_planet_research()
+
+    scenarios = {
+        "original (sequential extraction)": lambda: original("sequential"),
+        "original (parallel extraction)": lambda: original("parallel"),
+        "pipelined": lambda: asyncio.run(research.grounded_planet_research_pipelined(args.planets))
+    }
+
+    print(SEPARATOR)
+    print("⏱️  Grounded Planet Research: original vs pipelined (stubbed Nova)")
+    print(SEPARATOR)
+    print(f"   {args.planets} planets, extraction {args.extract_s}s/planet ±{args.jitter:.0%}, grounded {args.grounded_s}s, "
+          f"plain {args.plain_s}s, prefill {args.ms_per_kchar:.0f} ms/kchar\n")
+    print(f"   {'version':<34} {'wall s':>8} {'Nova calls':>11} {'prompt chars':>13}")
+
+    results = {}
+    try:
+        for name, run in scenarios.items():
+            best = None
+            for _ in range(args.runs):
+                stub.calls = stub.prompt_chars = 0
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    run()
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            results[name] = best
+            print(f"   {name:<34} {best:>8.1f} {stub.calls:>11} {stub.prompt_chars:>13}")
+    finally:
+        server.shutdown()
+
+    baseline = results["original (sequential extraction)"]
+    print(f"\n✅ Pipelined research {baseline / results['pipelined']:.1f}x faster than the original")
+
+
+if __name__ == "__main__":
+    main()
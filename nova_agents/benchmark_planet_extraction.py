@@ -0,0 +1,98 @@
+"""
+Time sequential vs parallel planet extraction against a local copy of the gym
+
+Serves gym_static/ on localhost so runs don't depend on (or load) the live
+gym, then extracts the same planets with one browser session visiting them in
+turn and with one session per planet. Also checks that the parallel results
+come back in planet order.
+
+Usage:
+    python benchmark_planet_extraction.py [--planets 4] [--sessions 4] [--runs 1]
+"""
+
+import re
+import time
+import argparse
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from planet_extraction import extract_planets_parallel, extract_planets_sequential
+
+STATIC_DIR = Path(__file__).parent / "gym_static"
+PROMPT = "Extract the planet name, weather conditions, terrain, atmosphere, and environmental characteristics"
+SEPARATOR = "=" * 80
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_gym() -> ThreadingHTTPServer:
+    """Serve the static gym copy on a free localhost port"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=str(STATIC_DIR)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def planet_names() -> list:
+    """Planet names in list order, read from the static page"""
+    return re.findall(r'name: "([^"]+)"', (STATIC_DIR / "index.html").read_text())
+
+
+def timed(extract, **kwargs):
+    start = time.perf_counter()
+    results = extract(PROMPT, **kwargs)
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sequential vs parallel Nova Act planet extraction")
+    parser.add_argument("--planets", type=int, default=4)
+    parser.add_argument("--sessions", type=int, default=4, help="Browser sessions in parallel mode")
+    parser.add_argument("--runs", type=int, default=1)
+    args = parser.parse_args()
+
+    names = planet_names()
+    if args.planets > len(names):
+        parser.error(f"the local gym has {len(names)} planets")
+
+    server = serve_gym()
+    url = f"http://127.0.0.1:{server.server_address[1]}/index.html"
+
+    print(SEPARATOR)
+    print("⏱️  Planet Extraction: sequential vs parallel")
+    print(SEPARATOR)
+    print(f"   {args.planets} planets, {args.sessions} parallel sessions, target {url}\n")
+
+    timings = {"sequential": [], "parallel": []}
+    try:
+        for _ in range(args.runs):
+            seconds, _ = timed(extract_planets_sequential, count=args.planets, starting_page=url)
+            timings["sequential"].append(seconds)
+            seconds, results = timed(
+                extract_planets_parallel, count=args.planets, starting_page=url, max_sessions=args.sessions
+            )
+            timings["parallel"].append(seconds)
+
+            out_of_order = [
+                i + 1 for i, (name, result) in enumerate(zip(names, results))
+                if name.lower() not in str(result).lower()
+            ]
+            if out_of_order:
+                print(f"⚠️  Parallel results for planets {out_of_order} don't name the expected planet")
+    finally:
+        server.shutdown()
+
+    sequential = min(timings["sequential"])
+    parallel = min(timings["parallel"])
+    print(f"\n   {'mode':<12} {'best s':>8} {'per planet s':>13}")
+    print(f"   {'sequential':<12} {sequential:>8.1f} {sequential / args.planets:>13.1f}")
+    print(f"   {'parallel':<12} {parallel:>8.1f} {parallel / args.planets:>13.1f}")
+    print(f"\n✅ Parallel extraction {sequential / parallel:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,21 @@ Grounded Planet Research using Nova Act and Nova Grounding
 This agent uses Nova Act's UI automation to explore planets on the gym website, then uses
 Nova's grounding capability to research real-world information about similar
 exoplanets and compare them.
+
+By default the steps are pipelined: each planet's grounded lookup starts as
+soon as that planet is extracted, lookups run concurrently on an async client,
+and the insights step works from the finished research alone. --sequential
+runs the original one-step-at-a-time version.
 """
 
 import os
-from openai import OpenAI
+import time
+import asyncio
+import argparse
+from openai import AsyncOpenAI, OpenAI
 from dotenv import load_dotenv
-from nova_act import NovaAct
+
+from planet_extraction import GYM_URL, PLANET_COUNT, PLANET_MAX_SESSIONS, cache, extract_planet, extract_planets
 
 # Load environment variables
 load_dotenv()
@@ -19,13 +28,19 @@ api_key = os.getenv("NOVA_API_KEY")
 if not api_key:
     raise ValueError("NOVA_API_KEY not found in environment variables. Please set it in your .env file.")
 
-base_url = "https://api.nova.amazon.com/v1"
+base_url = os.getenv("NOVA_BASE_URL", "https://api.nova.amazon.com/v1")
 client = OpenAI(api_key=api_key, base_url=base_url)
+async_client = AsyncOpenAI(api_key=api_key, base_url=base_url)
 
 # Constants
 MODEL_ID = "nova-lite-v1"
 SEPARATOR = "=" * 80
 SUB_SEPARATOR = "-" * 80
+EXTRACTION_PROMPT = (
+    "Extract the following information about this planet: "
+    "planet name, distance from Earth, environmental conditions, "
+    "and any unique characteristics mentioned"
+)
 
 def call_nova_api(query: str, use_grounding: bool = False, max_tokens: int = 2048) -> str:
     """Call Nova API with optional grounding"""
@@ -41,46 +56,41 @@ def call_nova_api(query: str, use_grounding: bool = False, max_tokens: int = 204
     response = client.chat.completions.create(**request_params)
     return response.choices[0].message.content
 
-def grounded_planet_research():
-    """
-    Use Nova Act to explore fictional planets, then use Nova Grounding
-    to research real exoplanets and create a comparison
-    """
+async def call_nova_api_async(query: str, use_grounding: bool = False, max_tokens: int = 2048) -> str:
+    """Call Nova API with optional grounding, without blocking the event loop"""
+    request_params = {
+        "model": MODEL_ID,
+        "messages": [{"role": "user", "content": query}],
+        "max_tokens": max_tokens
+    }
+    
+    if use_grounding:
+        request_params["extra_body"] = {"system_tools": ["nova_grounding"]}
+    
+    response = await async_client.chat.completions.create(**request_params)
+    return response.choices[0].message.content
+
+def print_intro():
     print("🚀 Grounded Planet Research Agent")
     print(SEPARATOR)
     print("\nThis agent will:")
-    print("  1. Use Nova Act to explore planets on nova.amazon.com/act/gym")
+    print(f"  1. Use Nova Act to explore planets on {GYM_URL}")
     print("  2. Extract planet characteristics from the gym")
     print("  3. Use Nova Grounding to research real exoplanets")
     print("  4. Create a comparison between fictional and real planets")
     print(f"\n{SEPARATOR}\n")
+
+def grounded_planet_research():
+    """
+    Use Nova Act to explore fictional planets, then use Nova Grounding
+    to research real exoplanets and create a comparison
+    """
+    print_intro()
     
-    planets_info = []
-    
-    with NovaAct(starting_page="https://nova.amazon.com/act/gym") as nova:
-        # Navigate to destinations
-        print("📍 Navigating to explore destinations...")
-        nova.act("Click on NextDot, then click on 'Explore possible destinations'")
-        
-        # Gather information for both planets
-        for i in range(1, 3):
-            print(f"\n🪐 Exploring Planet {i}...")
-            planet_selector = "first" if i == 1 else "second"
-            
-            if i == 2:
-                nova.act("Go back to the destinations list")
-            
-            nova.act(f"Click on 'Details' for the {planet_selector} planet")
-            
-            # Get planet information
-            print("📊 Extracting planet characteristics...")
-            planet_info = nova.act(
-                "Extract the following information about this planet: "
-                "planet name, distance from Earth, environmental conditions, "
-                "and any unique characteristics mentioned"
-            )
-            
-            planets_info.append(planet_info)
+    # Extract planet characteristics (one browser session per planet in parallel mode)
+    print("📊 Extracting planet characteristics...")
+    planets_info = extract_planets(EXTRACTION_PROMPT)
+    fictional = "\n    ".join(f"Planet {i}: {info}" for i, info in enumerate(planets_info, 1))
     
     # Research real exoplanets using Nova Grounding
     print(f"\n{SEPARATOR}")
@@ -91,8 +101,7 @@ def grounded_planet_research():
     research_query = f"""
     I found information about these fictional planets from a space travel website:
     
-    Planet 1: {planets_info[0]}
-    Planet 2: {planets_info[1]}
+    {fictional}
     
     Please research real exoplanets that have similar characteristics to these fictional ones.
     For each fictional planet, find a real exoplanet with similar:
@@ -127,7 +136,7 @@ def grounded_planet_research():
     insights_query = f"""
     Based on this comparison between fictional planets and real exoplanets:
     
-    Fictional: {planets_info[0]} and {planets_info[1]}
+    Fictional: {fictional}
     Real Research: {grounded_research}
     
     Provide 2-3 interesting insights about how science fiction representations 
@@ -141,10 +150,93 @@ def grounded_planet_research():
     print(insights)
     print(f"\n{SEPARATOR}")
 
+async def research_planet(index: int, count: int, browser_sessions: asyncio.Semaphore) -> tuple[str, str]:
+    """Extract one planet, then research it with Nova Grounding as soon as it is ready"""
+    async with browser_sessions:
+        info = await asyncio.to_thread(extract_planet, index, EXTRACTION_PROMPT)
+    print(f"🔍 Planet {index + 1}/{count} extracted, researching real exoplanets...")
+    
+    research_query = f"""
+    I found information about this fictional planet from a space travel website:
+    
+    {info}
+    
+    Please research a real exoplanet that has similar characteristics, with similar:
+    - Distance from Earth
+    - Environmental conditions
+    - Habitability factors
+    
+    Start with the fictional planet's name, then give a brief comparison showing how it
+    compares to the real discovery.
+    """
+    research = await call_nova_api_async(research_query, use_grounding=True)
+    print(f"✅ Research for planet {index + 1}/{count} done")
+    return info, research
+
+async def grounded_planet_research_pipelined(count: int = PLANET_COUNT):
+    """
+    Pipelined version of grounded_planet_research: per-planet extraction and
+    grounded research overlap, and insights are drawn from the research only
+    """
+    print_intro()
+    
+    print(f"📊 Extracting and researching {count} planets...")
+    browser_sessions = asyncio.Semaphore(PLANET_MAX_SESSIONS)
+    results = await asyncio.gather(*(research_planet(i, count, browser_sessions) for i in range(count)))
+    
+    # Display results (in planet order, whichever finished first)
+    print(f"\n{SEPARATOR}")
+    print("📋 FICTIONAL VS REAL EXOPLANETS")
+    print(f"{SEPARATOR}\n")
+    
+    print("Fictional Planets from Nova Act Gym:")
+    print(SUB_SEPARATOR)
+    for i, (info, _) in enumerate(results, 1):
+        print(f"\nPlanet {i}:")
+        print(info)
+    
+    print(f"\n{SEPARATOR}\n")
+    print("Real Exoplanet Research (with Nova Grounding):")
+    print(SUB_SEPARATOR)
+    for i, (_, research) in enumerate(results, 1):
+        print(f"\nPlanet {i}:")
+        print(research)
+    print(f"\n{SEPARATOR}")
+    
+    # The research already summarises each planet, so the raw extractions aren't re-sent
+    print("\n🔬 Generating insights...")
+    comparisons = "\n\n".join(f"Planet {i}: {research}" for i, (_, research) in enumerate(results, 1))
+    insights_query = f"""
+    Based on these comparisons between fictional planets and real exoplanets:
+    
+    {comparisons}
+    
+    Provide 2-3 interesting insights about how science fiction representations 
+    compare to actual exoplanet discoveries. Keep it brief and engaging.
+    """
+    
+    insights = await call_nova_api_async(insights_query, max_tokens=512)
+    
+    print("\n💡 KEY INSIGHTS")
+    print(SUB_SEPARATOR)
+    print(insights)
+    print(f"\n{SEPARATOR}")
+
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--refresh", action="store_true", help="Re-run Nova Act instead of using cached planet data")
+    parser.add_argument("--sequential", action="store_true", help="Run the steps one after another")
+    args = parser.parse_args()
+    cache.refresh = args.refresh
+    
     try:
-        grounded_planet_research()
+        start = time.perf_counter()
+        if args.sequential:
+            grounded_planet_research()
+        else:
+            asyncio.run(grounded_planet_research_pipelined())
+        print(f"\n⏱️  Finished in {time.perf_counter() - start:.1f}s")
         print("\n✅ Grounded research completed successfully!")
         print("\n📚 This demo showed how Nova Act (web navigation) and Nova Grounding")
         print("   (real-world research) can work together to compare fictional and real data.")
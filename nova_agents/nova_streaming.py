@@ -0,0 +1,79 @@
+"""
+Token streaming helpers for the Nova chat completions API
+
+Parses the server-sent events of a `"stream": true` request directly, chunk
+by chunk, printing text as it arrives and timing the first token.
+"""
+
+import os
+import json
+import time
+from typing import Iterable, Iterator, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+API_URL = os.getenv("NOVA_BASE_URL", "https://api.nova.amazon.com/v1").rstrip("/") + "/chat/completions"
+
+
+class TokenTimer:
+    """Prints streamed text as it arrives and records time to first token"""
+
+    def __init__(self):
+        self.start()
+
+    def start(self):
+        """Restart the clock, e.g. when a new model turn begins"""
+        self.started = time.perf_counter()
+        self.first_token_s: Optional[float] = None
+        self.chunks = 0
+        self.chars = 0
+
+    def token(self, text: str):
+        if not text:
+            return
+        if self.first_token_s is None:
+            self.first_token_s = time.perf_counter() - self.started
+        self.chunks += 1
+        self.chars += len(text)
+        print(text, end="", flush=True)
+
+    def summary(self) -> str:
+        total = time.perf_counter() - self.started
+        if self.first_token_s is None:
+            return f"⏱️  No tokens received ({total:.2f}s)"
+        return (f"⏱️  First token after {self.first_token_s:.2f}s, "
+                f"{self.chars} chars in {self.chunks} chunks over {total:.2f}s")
+
+
+def sse_data(lines: Iterable[str]) -> Iterator[dict]:
+    """JSON payloads of the `data:` events in an SSE stream, up to [DONE]"""
+    for line in lines:
+        if not line.startswith("data:"):
+            continue  # blank separators, comments and other fields
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return
+        if data:
+            yield json.loads(data)
+
+
+def delta_text(chunk: dict) -> str:
+    """Text carried by one chat.completion.chunk"""
+    if "error" in chunk:
+        raise RuntimeError(f"Nova API stream error: {chunk['error']}")
+    choices = chunk.get("choices") or [{}]
+    return (choices[0].get("delta") or {}).get("content") or ""
+
+
+def stream_chat_completion(payload: dict, api_key: str, url: str = API_URL, timeout: float = 120.0) -> Iterator[str]:
+    """POST a chat completion with stream enabled and yield text deltas as they arrive"""
+    headers = {"Authorization": f"Bearer {api_key}", "Accept": "text/event-stream"}
+    with httpx.stream("POST", url, json={**payload, "stream": True}, headers=headers, timeout=timeout) as response:
+        if response.status_code >= 400:
+            response.read()
+            raise RuntimeError(f"Nova API returned {response.status_code}: {response.text[:500]}")
+        for chunk in sse_data(response.iter_lines()):
+            yield delta_text(chunk)
@@ -0,0 +1,206 @@
+"""
+Planet data extraction with Nova Act, shared by the planet agents
+
+Two modes:
+- sequential: one browser session visits each planet in turn, navigating
+  back to the destinations list between planets
+- parallel: one browser session per planet in a bounded thread pool; results
+  are merged in planet order, whichever session finishes first
+
+Extraction results are cached on disk, keyed on the starting page, the
+instructions given to Nova Act and a hash of the starting page's content, so
+repeat runs skip the browser while the gym is unchanged.
+
+Configure with environment variables:
+    PLANET_COUNT           planets to extract (default 2)
+    PLANET_EXTRACTION      "parallel" or "sequential" (default parallel)
+    PLANET_MAX_SESSIONS    concurrent browser sessions in parallel mode (default 4)
+    NOVA_ACT_GYM_URL       starting page (default https://nova.amazon.com/act/gym)
+    PLANET_CACHE_DIR       cache directory (default .nova_act_cache; empty disables the cache)
+    PLANET_CACHE_TTL       seconds a cached extraction stays valid (default 86400)
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from dotenv import load_dotenv
+from nova_act import NovaAct
+
+# Load environment variables
+load_dotenv()
+
+GYM_URL = os.getenv("NOVA_ACT_GYM_URL", "https://nova.amazon.com/act/gym")
+PLANET_COUNT = int(os.getenv("PLANET_COUNT", "2"))
+PLANET_EXTRACTION = os.getenv("PLANET_EXTRACTION", "parallel")
+PLANET_MAX_SESSIONS = int(os.getenv("PLANET_MAX_SESSIONS", "4"))
+PLANET_CACHE_DIR = os.getenv("PLANET_CACHE_DIR", ".nova_act_cache")
+PLANET_CACHE_TTL = float(os.getenv("PLANET_CACHE_TTL", "86400"))
+
+OPEN_DESTINATIONS = "Click on NextDot, then click on 'Explore possible destinations'"
+ORDINALS = ["first", "second", "third", "fourth", "fifth", "sixth", "seventh", "eighth", "ninth", "tenth"]
+
+
+def ordinal(index: int) -> str:
+    """'first', 'second', ... for a 0-based planet index"""
+    return ORDINALS[index] if index < len(ORDINALS) else f"number {index + 1}"
+
+
+def planet_instructions(index: int, prompt: str) -> List[str]:
+    """The Nova Act instructions that extract one planet from the starting page"""
+    return [OPEN_DESTINATIONS, f"Click on 'Details' for the {ordinal(index)} planet", prompt]
+
+
+class ExtractionCache:
+    """On-disk cache of Nova Act extraction results, one JSON file per key"""
+
+    def __init__(self, directory: str, ttl: float, refresh: bool = False):
+        self.directory = Path(directory) if directory else None
+        self.ttl = ttl
+        self.refresh = refresh  # ignore cached results, but store the new ones
+        self._page_hashes: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()  # parallel sessions share one fetch
+
+    def page_hash(self, url: str) -> Optional[str]:
+        """SHA-256 of the page as served (fetched once per run, without a browser)"""
+        with self._lock:
+            if url not in self._page_hashes:
+                try:
+                    with urllib.request.urlopen(url, timeout=10) as response:
+                        self._page_hashes[url] = hashlib.sha256(response.read()).hexdigest()
+                except Exception as e:
+                    print(f"⚠️  Could not fetch {url} to check for changes ({e}); relying on the cache TTL")
+                    self._page_hashes[url] = None
+            return self._page_hashes[url]
+
+    def key(self, starting_page: str, instructions: Sequence[str]) -> str:
+        # Caching disabled: the key is never looked up, so don't fetch the page for it
+        page_hash = self.page_hash(starting_page) if self.directory is not None else None
+        material = json.dumps([starting_page, list(instructions), page_hash])
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        if self.directory is None or self.refresh:
+            return None
+        path = self.directory / f"{key}.json"
+        try:
+            entry = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry["created_at"] > self.ttl:
+            return None
+        return entry["result"]
+
+    def put(self, key: str, starting_page: str, instructions: Sequence[str], result: str):
+        if self.directory is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "created_at": time.time(),
+            "starting_page": starting_page,
+            "instructions": list(instructions),
+            "result": result
+        }
+        path = self.directory / f"{key}.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(entry, indent=2))
+        os.replace(tmp, path)  # parallel sessions never see a half-written entry
+
+
+# Scripts set cache.refresh from their --refresh flag
+cache = ExtractionCache(PLANET_CACHE_DIR, PLANET_CACHE_TTL)
+
+
+def extract_planets_sequential(
+    prompt: str,
+    count: int = PLANET_COUNT,
+    starting_page: str = GYM_URL,
+    indices: Optional[Sequence[int]] = None
+) -> List[str]:
+    """Visit each planet in one browser session, going back to the list in between"""
+    indices = range(count) if indices is None else indices
+    planets = []
+    with NovaAct(starting_page=starting_page) as nova:
+        print("🪐 Navigating to explore destinations...")
+        nova.act(OPEN_DESTINATIONS)
+
+        for n, i in enumerate(indices):
+            print(f"🪐 Gathering information for planet {i + 1}...")
+            if n > 0:
+                nova.act("Go back to the destinations list")
+            nova.act(f"Click on 'Details' for the {ordinal(i)} planet")
+            planets.append(str(nova.act(prompt)))
+    return planets
+
+
+def _extract_one(index: int, prompt: str, starting_page: str) -> str:
+    with NovaAct(starting_page=starting_page) as nova:
+        *navigation, extraction = planet_instructions(index, prompt)
+        for step in navigation:
+            nova.act(step)
+        result = nova.act(extraction)
+    print(f"🪐 Planet {index + 1} extracted")
+    return str(result)
+
+
+def extract_planets_parallel(
+    prompt: str,
+    count: int = PLANET_COUNT,
+    starting_page: str = GYM_URL,
+    max_sessions: int = PLANET_MAX_SESSIONS,
+    indices: Optional[Sequence[int]] = None
+) -> List[str]:
+    """One browser session per planet, at most max_sessions at a time; results in planet order"""
+    indices = list(range(count) if indices is None else indices)
+    print(f"🪐 Extracting {len(indices)} planets with up to {max_sessions} browser sessions...")
+    with ThreadPoolExecutor(max_workers=max(1, min(max_sessions, len(indices)))) as pool:
+        # map yields in submission order, so the merge never depends on timing
+        return list(pool.map(lambda i: _extract_one(i, prompt, starting_page), indices))
+
+
+def extract_planet(index: int, prompt: str, starting_page: str = GYM_URL) -> str:
+    """One planet in its own browser session, from the cache where possible"""
+    steps = planet_instructions(index, prompt)
+    key = cache.key(starting_page, steps)
+    result = cache.get(key)
+    if result is None:
+        result = _extract_one(index, prompt, starting_page)
+        cache.put(key, starting_page, steps, result)
+    return result
+
+
+def extract_planets(
+    prompt: str,
+    count: int = PLANET_COUNT,
+    mode: Optional[str] = None,
+    starting_page: str = GYM_URL
+) -> List[str]:
+    """Extract count planets, from the cache where possible, and report how long it took"""
+    mode = mode or PLANET_EXTRACTION
+    if mode not in ("parallel", "sequential"):
+        raise ValueError(f"Unknown planet extraction mode: {mode}")
+    start = time.perf_counter()
+
+    instructions = [planet_instructions(i, prompt) for i in range(count)]
+    keys = [cache.key(starting_page, steps) for steps in instructions]
+    planets = [cache.get(key) for key in keys]
+    missing = [i for i, planet in enumerate(planets) if planet is None]
+
+    if missing:
+        if mode == "sequential":
+            extracted = extract_planets_sequential(prompt, starting_page=starting_page, indices=missing)
+        else:
+            extracted = extract_planets_parallel(prompt, starting_page=starting_page, indices=missing)
+        for i, result in zip(missing, extracted):
+            planets[i] = result
+            cache.put(keys[i], starting_page, instructions[i], result)
+
+    print(f"⏱️  Extracted {count} planets in {time.perf_counter() - start:.1f}s "
+          f"({count - len(missing)} cached, {len(missing)} {mode})")
+    return planets
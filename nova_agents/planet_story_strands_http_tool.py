@@ -3,13 +3,20 @@ Planet Adventure Story Agent using Strands Agents
 
 This agent uses the Strands Agents framework to orchestrate between Nova Act for data extraction
 and Nova Lite for story generation.
+
+By default the story is streamed: tokens print as they arrive and the time to
+first token is reported. Pass --no-stream to make one blocking call through the
+Strands HTTP request tool instead.
 """
 
 import os
+import argparse
 import json
 from dotenv import load_dotenv
 from strands import Agent, tool
-from nova_act import NovaAct
+
+from nova_streaming import API_URL, TokenTimer, stream_chat_completion
+from planet_extraction import GYM_URL, cache, extract_planets
 
 # Load environment variables
 load_dotenv()
@@ -21,53 +28,27 @@ if not NOVA_API_KEY:
 
 # Constants
 MODEL_ID = "nova-lite-v1"
-API_URL = "https://api.nova.amazon.com/v1/chat/completions"
 SEPARATOR = "=" * 80
+EXTRACTION_PROMPT = "Extract all information from the planetary profile including planet name, weather conditions, terrain, atmosphere, and environmental characteristics"
 
 @tool
 def gather_planet_data() -> str:
     """
-    Use Nova Act to navigate to nova.amazon.com/act/gym and gather information about 2 planets.
+    Use Nova Act to navigate to nova.amazon.com/act/gym and gather information about the planets.
     Returns detailed information about planet environments and conditions.
     """
     print("🚀 Starting planet data gathering...")
-    print("📍 Navigating to nova.amazon.com/act/gym...")
+    print(f"📍 Navigating to {GYM_URL}...")
     
-    planet_data = ""
+    results = extract_planets(EXTRACTION_PROMPT)
+    planets = [f"Planet {i}:\n{result}" for i, result in enumerate(results, 1)]
+    planet_data = "\n\n".join(planets)
     
-    with NovaAct(starting_page="https://nova.amazon.com/act/gym") as nova:
-        # Navigate to explore destinations
-        print("🪐 Navigating to explore destinations...")
-        nova.act("Click on NextDot, then click on 'Explore possible destinations'")
-        
-        # Gather information for both planets
-        planets = []
-        for i in range(1, 3):
-            print(f"🪐 Gathering information for planet {i}...")
-            planet_selector = "first" if i == 1 else "second"
-            nova.act(f"Click on 'Details' for the {planet_selector} planet")
-            
-            extraction_prompt = "Extract all information from the planetary profile including planet name, weather conditions, terrain, atmosphere, and environmental characteristics"
-            if i == 1:
-                extraction_prompt += ". Then go back to the destinations list."
-            
-            result = nova.act(extraction_prompt)
-            planets.append(f"Planet {i}:\n{result}")
-        
-        planet_data = "\n\n".join(planets)
-    
-    print(f"✅ Gathered data about 2 planets")
+    print(f"✅ Gathered data about {len(planets)} planets")
     return planet_data
 
-def create_story_with_nova(planet_info: str) -> str:
-    """Use Nova Lite API to create an adventure story"""
-    from strands_tools import http_request
-    
-    # Set bypass consent for automated execution
-    os.environ["BYPASS_TOOL_CONSENT"] = "true"
-    
-    agent = Agent(tools=[http_request])
-    
+def story_request(planet_info: str) -> dict:
+    """Chat completion request for the adventure story"""
     story_prompt = f"""
     Based on the following information about planets, create an engaging adventure story 
     about an astronaut named Nova who visits 2 of these planets.
@@ -101,6 +82,25 @@ def create_story_with_nova(planet_info: str) -> str:
         "max_tokens": 4096,
         "temperature": 0.7
     }
+    return message_json
+
+def _http_tool_body(response: dict) -> dict:
+    """JSON body of an http_request tool result, wherever its 'Body:' block is"""
+    for block in response.get("content", []):
+        text = block.get("text", "")
+        if text.startswith("Body:"):
+            return json.loads(text[len("Body:"):])
+    raise ValueError(f"No response body in http_request result (status: {response.get('status')})")
+
+def create_story_with_nova(planet_info: str) -> str:
+    """Use Nova Lite API to create an adventure story"""
+    from strands_tools import http_request
+    
+    # Set bypass consent for automated execution
+    os.environ["BYPASS_TOOL_CONSENT"] = "true"
+    
+    agent = Agent(tools=[http_request])
+    message_json = story_request(planet_info)
     
     # Make API call using Strands HTTP tool
     response = agent.tool.http_request(
@@ -113,15 +113,29 @@ def create_story_with_nova(planet_info: str) -> str:
     )
     
     # Extract story from response
-    raw_response = response['content'][2]['text']
-    raw_response = raw_response.replace('Body: ', '')
-    json_response = json.loads(raw_response)
+    json_response = _http_tool_body(response)
     story = json_response['choices'][0]['message']['content']
     
     return story
 
+def stream_story_with_nova(planet_info: str) -> str:
+    """Stream the adventure story from Nova Lite, printing tokens as they arrive"""
+    timer = TokenTimer()
+    story = []
+    for text in stream_chat_completion(story_request(planet_info), NOVA_API_KEY, API_URL):
+        timer.token(text)
+        story.append(text)
+    print(f"\n\n{timer.summary()}")
+    return "".join(story)
+
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--refresh", action="store_true", help="Re-run Nova Act instead of using cached planet data")
+    parser.add_argument("--no-stream", action="store_true", help="Wait for the whole story instead of streaming tokens")
+    args = parser.parse_args()
+    cache.refresh = args.refresh
+    
     try:
         # Gather planet data using Nova Act
         print("🤖 Strands Agent starting...")
@@ -129,12 +143,13 @@ def main():
         
         # Create adventure story using Nova Lite
         print("\n✍️  Creating adventure story about astronaut Nova...")
-        story = create_story_with_nova(planet_info)
-        
         print(f"\n{SEPARATOR}")
         print("🪐 ASTRONAUT NOVA'S PLANETARY ADVENTURE")
         print(f"{SEPARATOR}\n")
-        print(story)
+        if args.no_stream:
+            print(create_story_with_nova(planet_info))
+        else:
+            stream_story_with_nova(planet_info)
         print(f"\n{SEPARATOR}")
         
     except Exception as e:
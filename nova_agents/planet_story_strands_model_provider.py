@@ -3,14 +3,21 @@ Planet Adventure Story Agent using Strands Agents with Nova Model Provider
 
 This agent uses the Strands Agents framework with Nova as the core reasoning engine
 to orchestrate between Nova Act for data extraction and Nova for story generation.
+
+By default the model streams: story tokens print as they arrive and the time to
+first token is reported. Pass --no-stream to wait for the whole response.
 """
 
 import os
+import argparse
+from typing import Optional
 from dotenv import load_dotenv
-from nova_act import NovaAct
 from strands import Agent, tool
 from strands_amazon_nova import NovaAPIModel
 
+from nova_streaming import TokenTimer
+from planet_extraction import GYM_URL, cache, extract_planets
+
 # Load environment variables
 load_dotenv()
 
@@ -23,77 +30,90 @@ if not NOVA_API_KEY:
 
 # Constants
 SEPARATOR = "=" * 80
-
-# Initialize Nova Model Provider for Strands
-nova_model = NovaAPIModel(
-    api_key=NOVA_API_KEY, 
-    model_id="nova-lite-v2",
-    stream=False
-)
+EXTRACTION_PROMPT = "Extract all information from the planetary profile including planet name, weather conditions, terrain, atmosphere, and environmental characteristics"
 
 
 @tool
 def gather_planet_data() -> str:
     """
-    Use Nova Act to navigate to nova.amazon.com/act/gym and gather information about 2 planets.
+    Use Nova Act to navigate to nova.amazon.com/act/gym and gather information about the planets.
     Returns detailed information about planet environments and conditions.
     """
     print("🚀 Starting planet data gathering...")
-    print("📍 Navigating to nova.amazon.com/act/gym...")
+    print(f"📍 Navigating to {GYM_URL}...")
 
-    planet_data = ""
+    results = extract_planets(EXTRACTION_PROMPT)
+    planets = [f"Planet {i}:\n{result}" for i, result in enumerate(results, 1)]
+    planet_data = "\n\n".join(planets)
 
-    with NovaAct(starting_page="https://nova.amazon.com/act/gym") as nova:
-        # Navigate to explore destinations
-        print("🪐 Navigating to explore destinations...")
-        nova.act("Click on NextDot, then click on 'Explore possible destinations'")
+    print(f"✅ Gathered data about {len(planets)} planets")
+    return planet_data
 
-        # Gather information for both planets
-        planets = []
-        for i in range(1, 3):
-            print(f"🪐 Gathering information for planet {i}...")
-            planet_selector = "first" if i == 1 else "second"
-            nova.act(f"Click on 'Details' for the {planet_selector} planet")
 
-            extraction_prompt = "Extract all information from the planetary profile including planet name, weather conditions, terrain, atmosphere, and environmental characteristics"
-            if i == 1:
-                extraction_prompt += ". Then go back to the destinations list."
+SYSTEM_PROMPT = (
+    "You are a creative storyteller who writes engaging adventure stories.\n\n"
+    "Your expertise includes:\n"
+    "- Creating exciting space adventure stories\n"
+    "- Writing about astronauts facing planetary challenges\n"
+    "- Incorporating specific environmental details into narratives\n"
+    "- Making stories adventurous and engaging\n\n"
+    "When creating stories:\n"
+    "- The protagonist should be an astronaut named Nova\n"
+    "- Nova should visit exactly 2 different planets from the provided data\n"
+    "- On each planet, Nova should face challenges related to the specific weather conditions, terrain, atmosphere, or environmental hazards\n"
+    "- Nova must overcome these challenges using creativity and resourcefulness\n"
+    "- Include specific details about each planet's conditions from the data\n"
+    "- Make the story exciting, adventurous, and around 150-200 words\n"
+)
 
-            result = nova.act(extraction_prompt)
-            planets.append(f"Planet {i}:\n{result}")
 
-        planet_data = "\n\n".join(planets)
+class StoryStreamHandler:
+    """Strands callback handler that prints tokens as they arrive and times each model turn"""
 
-    print(f"✅ Gathered data about 2 planets")
-    return planet_data
+    def __init__(self):
+        self.timer = TokenTimer()
 
+    def __call__(self, **kwargs):
+        if kwargs.get("data"):
+            self.timer.token(kwargs["data"])
+        message = kwargs.get("message")
+        if message and message.get("role") == "user":
+            # Tool results go back to the model: the next tokens start a new turn
+            self.timer.start()
+            print(f"\n{SEPARATOR}")
+            print("🪐 ASTRONAUT NOVA'S PLANETARY ADVENTURE")
+            print(f"{SEPARATOR}\n")
 
-# Create the Strands agent with Nova Model Provider and Nova Act Tool
-agent = Agent(
-    model=nova_model,
-    tools=[gather_planet_data],
-    system_prompt=(
-        "You are a creative storyteller who writes engaging adventure stories.\n\n"
-        "Your expertise includes:\n"
-        "- Creating exciting space adventure stories\n"
-        "- Writing about astronauts facing planetary challenges\n"
-        "- Incorporating specific environmental details into narratives\n"
-        "- Making stories adventurous and engaging\n\n"
-        "When creating stories:\n"
-        "- The protagonist should be an astronaut named Nova\n"
-        "- Nova should visit exactly 2 different planets from the provided data\n"
-        "- On each planet, Nova should face challenges related to the specific weather conditions, terrain, atmosphere, or environmental hazards\n"
-        "- Nova must overcome these challenges using creativity and resourcefulness\n"
-        "- Include specific details about each planet's conditions from the data\n"
-        "- Make the story exciting, adventurous, and around 150-200 words\n"
-    ),
-)
+
+def create_agent(stream_handler: Optional[StoryStreamHandler] = None) -> Agent:
+    """Strands agent with the Nova Model Provider and the Nova Act tool; streams when given a handler"""
+    nova_model = NovaAPIModel(
+        api_key=NOVA_API_KEY,
+        model_id="nova-lite-v2",
+        stream=stream_handler is not None
+    )
+    if stream_handler is None:
+        return Agent(model=nova_model, tools=[gather_planet_data], system_prompt=SYSTEM_PROMPT)
+    return Agent(
+        model=nova_model,
+        tools=[gather_planet_data],
+        system_prompt=SYSTEM_PROMPT,
+        callback_handler=stream_handler
+    )
 
 
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--refresh", action="store_true", help="Re-run Nova Act instead of using cached planet data")
+    parser.add_argument("--no-stream", action="store_true", help="Wait for the whole story instead of streaming tokens")
+    args = parser.parse_args()
+    cache.refresh = args.refresh
+
     try:
         print("🤖 Strands Agent with Nova Model Provider starting...")
+        stream_handler = None if args.no_stream else StoryStreamHandler()
+        agent = create_agent(stream_handler)
 
         # Agent uses Nova as core reasoning engine to orchestrate the workflow
         response = agent(
@@ -102,10 +122,14 @@ def main():
             "Make sure Nova faces specific challenges related to each planet's environmental conditions."
         )
 
-        print(f"\n{SEPARATOR}")
-        print("🪐 ASTRONAUT NOVA'S PLANETARY ADVENTURE")
-        print(f"{SEPARATOR}\n")
-        print(response)
+        if args.no_stream:
+            print(f"\n{SEPARATOR}")
+            print("🪐 ASTRONAUT NOVA'S PLANETARY ADVENTURE")
+            print(f"{SEPARATOR}\n")
+            print(response)
+        else:
+            # The story has already streamed under its heading
+            print(f"\n\n{stream_handler.timer.summary()}")
         print(f"\n{SEPARATOR}")
 
     except Exception as e: